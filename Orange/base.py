@@ -72,6 +72,22 @@ class Learner:
             data = pp(data)
         return data
 
+    def leave_one_out(self, data):
+        """
+        Return predictions for each row of `data` by a model fitted on the
+        remaining rows, or `None` if the learner cannot compute them without
+        fitting a model for each row.
+
+        Learners whose models are fitted from statistics that can be updated
+        exactly (e.g. counts or sums) override this method to speed up
+        leave-one-out testing.
+
+        Returns:
+            tuple of (np.ndarray, Optional[np.ndarray]): predicted values
+            and probabilities (or `None` for regression)
+        """
+        return None
+
     def __repr__(self):
         return self.name
 
@@ -293,15 +309,90 @@ class RandomForest:
 
 class KNNBase:
     """Base class for KNN (classification and regression) learners
+
+    With `approximate=True`, models find approximate neighbours in an
+    index on a random projection of data
+    (see :obj:`Orange.misc.neighbors.NeighborIndex`), which is faster
+    for large data with many attributes.
     """
     def __init__(self, n_neighbors=5, metric="euclidean", weights="uniform",
-                 algorithm='auto', metric_params=None,
+                 algorithm='auto', metric_params=None, approximate=False,
                  preprocessors=None):
         super().__init__(preprocessors=preprocessors)
         self.params = vars()
+        self.approximate = approximate
 
     def fit(self, X, Y, W=None):
         if self.params["metric_params"] is None and \
                         self.params.get("metric") == "mahalanobis":
             self.params["metric_params"] = {"V": np.cov(X.T)}
-        return super().fit(X, Y, W)
+        model = super().fit(X, Y, W)
+        model.approximate = self.approximate
+        if model.uses_neighbor_index:
+            # The index is built with training data, not on first prediction
+            _ = model.neighbor_index
+        return model
+
+
+class KNNModelBase:
+    """Base class for KNN (classification and regression) models
+
+    Models find neighbours in a :obj:`Orange.misc.neighbors.NeighborIndex`
+    of training instances, which is kept with the model, if the index
+    supports the metric and data; otherwise, they use scikit-learn's
+    prediction. Derived classes must define :obj:`predict_neighbors`.
+    """
+    approximate = False
+    _neighbor_index = None
+
+    @property
+    def uses_neighbor_index(self):
+        """`True` if neighbours are found in :obj:`neighbor_index`"""
+        from Orange.misc.neighbors import NeighborIndex
+        skl_model = self.skl_model
+        if self.approximate:
+            return True
+        # The index takes the covariance matrix (V) for Mahalanobis distance
+        # and no other parameters of metrics
+        return skl_model.effective_metric_ in NeighborIndex.METRICS \
+            and not set(skl_model.effective_metric_params_ or ()) - {"V"} \
+            and skl_model.algorithm in ("auto", "kd_tree") \
+            and not scipy.sparse.issparse(skl_model._fit_X)
+
+    @property
+    def neighbor_index(self):
+        """Index of training instances, which is built on first use and
+        kept with the model"""
+        if self._neighbor_index is None:
+            from Orange.misc.neighbors import NeighborIndex
+            skl_model = self.skl_model
+            self._neighbor_index = NeighborIndex(
+                skl_model._fit_X, skl_model.effective_metric_,
+                skl_model.effective_metric_params_, self.approximate)
+        return self._neighbor_index
+
+    def predict(self, X):
+        if type(self).predict_neighbors is KNNModelBase.predict_neighbors:
+            raise TypeError("Descendants of KNNModelBase must overload "
+                            "method predict_neighbors")
+        if not self.uses_neighbor_index:
+            return super().predict(X)
+        dist, ind = self.neighbor_index.query(X, self.skl_model.n_neighbors)
+        weights = self.skl_model.weights
+        if weights == "uniform":
+            weights = np.ones(dist.shape)
+        elif weights == "distance":
+            # Neighbours at zero distance outweigh all others, as in sklearn
+            with np.errstate(divide="ignore"):
+                weights = 1 / dist
+            exact = np.isinf(weights)
+            weights[exact.any(axis=1)] = exact[exact.any(axis=1)]
+        else:
+            weights = weights(dist)
+        return self.predict_neighbors(ind, weights)
+
+    def predict_neighbors(self, neighbors, weights):
+        """Predict from indices and weights of neighbours of instances;
+        descendants must overload this method"""
+        raise TypeError("Descendants of KNNModelBase must overload method "
+                        "predict_neighbors")
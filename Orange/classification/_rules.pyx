@@ -0,0 +1,45 @@
+#cython: embedsignature=True
+#cython: boundscheck=False
+#cython: wraparound=False
+#cython: cdivision=True
+
+import numpy as np
+cimport numpy as np
+
+
+def class_distributions(np.uint8_t[:, :] bitsets, np.intp_t[:] y,
+                        double[:] w, int n_classes):
+    """
+    Compute the class distribution of instances covered by each bitset.
+
+    Bitsets are packed as by numpy.packbits, that is, the first instance
+    corresponds to the most significant bit of the first byte. Weights
+    of covered instances are summed in the order of instances, hence the
+    result is the same as that of numpy.bincount on the covered subset.
+
+    Args:
+        bitsets: a 2-d array of packed bitsets
+        y: class values
+        w: instance weights; if None, instances are counted
+        n_classes: the number of classes
+
+    Returns:
+        a 2-d array with a class distribution for each bitset
+    """
+    cdef:
+        double[:, :] dists = np.zeros((bitsets.shape[0], n_classes))
+        Py_ssize_t n = y.shape[0], i, j, k, bit
+        np.uint8_t byte
+        bint weighted = w is not None
+
+    with nogil:
+        for k in range(bitsets.shape[0]):
+            for j in range(bitsets.shape[1]):
+                byte = bitsets[k, j]
+                if byte == 0:
+                    continue
+                for bit in range(8):
+                    i = 8 * j + bit
+                    if byte & (128 >> bit) and i < n:
+                        dists[k, y[i]] += w[i] if weighted else 1
+    return np.asarray(dists)
@@ -19,12 +19,14 @@ cpdef enum:
 def contingency(double[:] x, int nx, double[:] y, int ny):
     cdef:
         np.ndarray[np.uint32_t, ndim=2] cont = np.zeros((ny, nx), dtype=np.uint32)
+        np.uint32_t[:, :] cont_view = cont
         int n = len(x), yi, xi
 
-    for i in range(n):
-        if not npy_isnan(x[i]) and not npy_isnan(y[i]):
-            yi, xi = int(y[i]), int(x[i])
-            cont[yi, xi] += 1
+    with nogil:
+        for i in range(n):
+            if not npy_isnan(x[i]) and not npy_isnan(y[i]):
+                yi, xi = <int>y[i], <int>x[i]
+                cont_view[yi, xi] += 1
     return cont
 
 def find_threshold_entropy(double[:] x, double[:] y, np.intp_t[:] idx,
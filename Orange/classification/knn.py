@@ -1,10 +1,25 @@
+import numpy as np
 import sklearn.neighbors as skl_neighbors
-from Orange.base import KNNBase
-from Orange.classification import SklLearner
+from Orange.base import KNNBase, KNNModelBase
+from Orange.classification import SklLearner, SklModel
 
 __all__ = ["KNNLearner"]
 
 
+class KNNModel(KNNModelBase, SklModel):
+    def predict_neighbors(self, neighbors, weights):
+        skl_model = self.skl_model
+        probs = np.zeros((len(neighbors), len(skl_model.classes_)))
+        rows = np.repeat(np.arange(len(neighbors)), neighbors.shape[1])
+        np.add.at(probs, (rows, skl_model._y[neighbors].ravel()),
+                  weights.ravel())
+        normalizer = probs.sum(axis=1)[:, None]
+        normalizer[normalizer == 0] = 1
+        probs /= normalizer
+        return skl_model.classes_[np.argmax(probs, axis=1)], probs
+
+
 class KNNLearner(KNNBase, SklLearner):
     __wraps__ = skl_neighbors.KNeighborsClassifier
+    __returns__ = KNNModel
     name = 'knn'
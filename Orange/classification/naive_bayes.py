@@ -1,7 +1,8 @@
 import numpy as np
+import scipy.sparse as sp
 
 from Orange.classification import Learner, Model
-from Orange.data import Instance, Storage
+from Orange.data import Instance, Storage, Table
 from Orange.statistics import contingency
 from Orange.preprocess import Discretize
 
@@ -35,31 +36,84 @@ class NaiveBayesLearner(Learner):
             contingency.get_contingency(table, table.domain.class_var)))
         return NaiveBayesModel(cont, class_freq, table.domain)
 
+    def leave_one_out(self, data):
+        # Discretization does not change discrete data, so the model without
+        # a row differs from the model on all data only in the row's counts
+        if sp.issparse(data.X) or not data.domain.has_discrete_class \
+                or not all(var.is_discrete
+                           for var in data.domain.attributes) \
+                or not all(isinstance(pp, Discretize)
+                           for pp in self.preprocessors):
+            return None
+        model = self(data)
+        n_cls = len(model.class_freq)
+        y = data.Y.ravel()
+        w = data.W.ravel() if data.has_weights() else np.ones(len(data))
+        known_cls = ~np.isnan(y)
+        removed = np.zeros((len(data), n_cls))
+        removed[known_cls, y[known_cls].astype(int)] = w[known_cls]
+        class_freq = model.class_freq - removed
+        log_prob = np.log(
+            (class_freq + 1) / (class_freq.sum(axis=1) + n_cls)[:, None])
+        for col, cont in zip(data.X.T, model.cont):
+            cont = np.array(cont)
+            known = ~np.isnan(col)
+            counts = cont[:, col[known].astype(int)].T - removed[known]
+            log_prob[known] += np.log(
+                (counts + 1) / (class_freq[known] + cont.shape[1]))
+        probs = np.exp(log_prob - log_prob.max(axis=1)[:, None])
+        probs /= probs.sum(axis=1)[:, None]
+        return probs.argmax(axis=1), probs
+
 
 class NaiveBayesModel(Model):
     def __init__(self, cont, class_freq, domain):
         super().__init__(domain)
         self.cont = cont
         self.class_freq = class_freq
+        n_cls = len(class_freq)
+        self.class_prob = (class_freq + 1) / (np.sum(class_freq) + n_cls)
+        self.log_cont_prob = [
+            np.log(np.divide(np.array(c) + 1,
+                             class_freq.reshape((n_cls, 1)) + c.shape[1]))
+            for c in cont]
 
     def predict_storage(self, data):
         if isinstance(data, Instance):
-            data = [data]
-        n_cls = len(self.class_freq)
-        class_prob = (self.class_freq + 1) / (np.sum(self.class_freq) + n_cls)
-        if len(data.domain.attributes) == 0:
-            probs = np.tile(class_prob, (len(data), 1))
-        else:
-            log_cont_prob = [np.log(np.divide(np.array(c) + 1,
-                                              self.class_freq.reshape((n_cls, 1)) +
-                                              c.shape[1])) for c in self.cont]
-            probs = np.exp(np.array([np.sum(attr_prob[:, int(attr_val)]
-                                            for attr_val, attr_prob
-                                            in zip(ins, log_cont_prob)
-                                            if not np.isnan(attr_val))
-                                     for ins in data]) + np.log(class_prob))
+            data = Table(data.domain, [data])
+        return self.predict(data.X)
+
+    def predict(self, X):
+        n_attrs = len(self.log_cont_prob)
+        log_prob = np.tile(np.log(self.class_prob), (X.shape[0], 1))
+        if n_attrs:
+            if sp.issparse(X):
+                self._add_log_prob_sparse(X[:, :n_attrs], log_prob)
+            else:
+                self._add_log_prob_dense(X[:, :n_attrs], log_prob)
+        probs = np.exp(log_prob - log_prob.max(axis=1)[:, None])
         probs /= probs.sum(axis=1)[:, None]
         values = probs.argmax(axis=1)
         return values, probs
 
+    def _add_log_prob_dense(self, X, log_prob):
+        for col, attr_prob in zip(X.T, self.log_cont_prob):
+            known = ~np.isnan(col)
+            if known.all():
+                log_prob += attr_prob[:, col.astype(int)].T
+            else:
+                log_prob[known] += attr_prob[:, col[known].astype(int)].T
+
+    def _add_log_prob_sparse(self, X, log_prob):
+        # Implicit zeros stand for the first value of each attribute;
+        # add its probability to all rows and correct for explicit entries
+        X = sp.csc_matrix(X)
+        log_prob += sum(attr_prob[:, 0] for attr_prob in self.log_cont_prob)
+        for i, attr_prob in enumerate(self.log_cont_prob):
+            start, end = X.indptr[i], X.indptr[i + 1]
+            rows, vals = X.indices[start:end], X.data[start:end]
+            known = ~np.isnan(vals)
+            log_prob[rows] -= attr_prob[:, 0]
+            log_prob[rows[known]] += attr_prob[:, vals[known].astype(int)].T
+
 NaiveBayesLearner.__returns__ = NaiveBayesModel
@@ -16,7 +16,7 @@ import numpy as np
 from scipy.stats import chi2
 
 from Orange.data import Table, _contingency
-from Orange.classification import Learner, Model
+from Orange.classification import Learner, Model, _rules
 from Orange.preprocess.discretize import EntropyMDL
 from Orange.preprocess import RemoveNaNClasses, Impute, Average
 
@@ -471,7 +471,7 @@ class TopDownSearchStrategy(SearchStrategy):
                 rules.append(temp_rule)
 
         # optimisation: store covered examples when a selector is found
-        self.storage = {}
+        self.storage = CoverageCache(X, Y, W, domain)
         return rules
 
     def refine_rule(self, X, Y, W, candidate_rule):
@@ -491,8 +491,20 @@ class TopDownSearchStrategy(SearchStrategy):
             if W is not None else None,
             domain, candidate_rule_selectors)
 
+        if not possible_selectors:
+            return []
+
+        # optimisation: evaluate all candidates at once on the bitsets
+        # of covered examples (only the parent's examples can be covered)
+        bitsets = self.storage.refine(
+            self.storage.pack(candidate_rule_covered_examples),
+            possible_selectors)
+        class_dists = self.storage.class_dists(bitsets)
+
         new_rules = []
-        for curr_selector in possible_selectors:
+        for curr_selector, covered, class_dist in zip(
+                possible_selectors, self.storage.unpack(bitsets),
+                class_dists):
             copied_selectors = copy(candidate_rule_selectors)
             copied_selectors.append(curr_selector)
 
@@ -506,13 +518,11 @@ class TopDownSearchStrategy(SearchStrategy):
                             significance_validator=significance_validator,
                             general_validator=general_validator)
 
-            if curr_selector not in self.storage:
-                self.storage[curr_selector] = curr_selector.filter_data(X)
-            # optimisation: faster calc. of covered examples
-            pdc = candidate_rule_covered_examples & self.storage[curr_selector]
             # to ensure that the covered_examples matrices are of
             # the same size throughout the rule_finder iteration
-            new_rule.filter_and_store(X, Y, W, target_class, predef_covered=pdc)
+            new_rule.filter_and_store(X, Y, W, target_class,
+                                      predef_covered=covered,
+                                      predef_dist=class_dist)
             if new_rule.is_valid():
                 new_rule.do_evaluate()
                 new_rules.append(new_rule)
@@ -606,6 +616,118 @@ class Selector(namedtuple('Selector', 'column, op, value')):
         return Selector.OPERATORS[self[1]](X[:, self[0]], self[2])
 
 
+class CoverageCache:
+    """
+    Store the coverage of selectors on the learning data as bitsets.
+
+    The coverage of each selector is computed only once and kept packed,
+    eight instances to a byte. The coverage of a rule is then the
+    bitwise AND of the bitsets of its selectors, and the class
+    distributions of a batch of candidate rules are counted directly on
+    the bitsets.
+
+    Parameters
+    ----------
+    X, Y, W : ndarray
+        Learning data; Y and W are only needed to count class
+        distributions.
+    domain : Orange.data.domain.Domain
+        Data domain, used to calculate class distributions.
+    """
+    def __init__(self, X, Y=None, W=None, domain=None):
+        if Y is not None:
+            # the kernel that counts class distributions does not check
+            # bounds, hence classes and weights are validated here
+            if len(Y) != X.shape[0] or W is not None and len(W) != len(Y):
+                raise ValueError("X, Y and W must have the same length")
+            if domain is not None:
+                n_classes = len(domain.class_var.values)
+                with np.errstate(invalid="ignore"):
+                    valid = (Y >= 0) & (Y < n_classes) & (Y % 1 == 0)
+                if not np.all(valid):
+                    raise ValueError("classes must be known and "
+                                     "within the range of class values")
+        self.X = X
+        self.Y = Y.astype(np.intp, copy=False) if Y is not None else None
+        self.W = W.astype(float, copy=False) if W is not None else None
+        self.domain = domain
+        self.n_instances = X.shape[0]
+        self.bitsets = {}
+
+    def pack(self, covered):
+        """
+        Return a packed bitset for a boolean array of covered instances.
+        """
+        return np.packbits(covered)
+
+    def unpack(self, bitset):
+        """
+        Return a boolean array of covered instances for a bitset (or
+        a 2-d array for a 2-d array of bitsets).
+        """
+        covered = np.unpackbits(bitset, axis=-1)[..., :self.n_instances]
+        return covered.view(bool)
+
+    def selector_bitset(self, selector):
+        """
+        Return the (cached) bitset of instances covered by a selector.
+        """
+        bitset = self.bitsets.get(selector)
+        if bitset is None:
+            bitset = self.bitsets[selector] = \
+                self.pack(selector.filter_data(self.X))
+        return bitset
+
+    def rule_bitset(self, selectors):
+        """
+        Return the bitset of instances covered by all selectors.
+        """
+        bitset = self.pack(np.ones(self.n_instances, dtype=bool))
+        for selector in selectors:
+            bitset &= self.selector_bitset(selector)
+        return bitset
+
+    def refine(self, bitset, selectors):
+        """
+        Specialise a rule with each of the given selectors in turn.
+
+        Parameters
+        ----------
+        bitset : ndarray
+            Bitset of instances covered by the rule.
+        selectors : list of Selector
+            Candidate conditions.
+
+        Returns
+        -------
+        res : ndarray
+            A 2-d array with a bitset for each candidate.
+        """
+        bitsets = np.array([self.selector_bitset(s) for s in selectors],
+                           dtype=np.uint8)
+        bitsets &= bitset
+        return bitsets
+
+    def class_dists(self, bitsets):
+        """
+        Determine the class distributions of instances covered by each
+        of the given bitsets.
+
+        Parameters
+        ----------
+        bitsets : ndarray
+            A 2-d array of bitsets.
+
+        Returns
+        -------
+        dists : ndarray
+            A 2-d array with a class distribution in each row.
+        """
+        dists = _rules.class_distributions(
+            bitsets, self.Y, self.W, len(self.domain.class_var.values))
+        return dists if self.W is not None else dists.astype(np.intp)
+
+
 class Rule:
     """
     Represent a single rule and keep a reference to its parent. Taking
@@ -663,7 +785,8 @@ class Rule:
         self.probabilities = None
         self.length = len(self.selectors)
 
-    def filter_and_store(self, X, Y, W, target_class, predef_covered=None):
+    def filter_and_store(self, X, Y, W, target_class, predef_covered=None,
+                         predef_dist=None):
         """
         Apply data and target class to a rule.
 
@@ -676,6 +799,9 @@ class Rule:
         predef_covered : ndarray
             Built-in optimisation variable to enable external
             computation of covered examples.
+        predef_dist : ndarray
+            Built-in optimisation variable to enable external
+            computation of the class distribution of covered examples.
         """
         self.target_class = target_class
         if predef_covered is not None:
@@ -685,10 +811,13 @@ class Rule:
             for selector in self.selectors:
                 self.covered_examples &= selector.filter_data(X)
 
-        self.curr_class_dist = get_dist(Y[self.covered_examples],
-                                        W[self.covered_examples]
-                                        if W is not None else None,
-                                        self.domain)
+        if predef_dist is not None:
+            self.curr_class_dist = predef_dist
+        else:
+            self.curr_class_dist = get_dist(Y[self.covered_examples],
+                                            W[self.covered_examples]
+                                            if W is not None else None,
+                                            self.domain)
 
     def is_valid(self):
         """
@@ -1172,15 +1301,18 @@ class _RuleClassifier(Model):
             Probabilistic classification.
         """
         num_classes = len(self.domain.class_var.values)
-        probabilities = np.array([np.zeros(num_classes, dtype=float)
-                                  for _ in range(X.shape[0])])
+        probabilities = np.zeros((X.shape[0], num_classes), dtype=float)
 
-        status = np.ones(X.shape[0], dtype=bool)
+        # selectors shared between rules are evaluated only once
+        coverage = CoverageCache(X)
+        status = coverage.rule_bitset([])
         for rule in self.rule_list:
-            curr_covered = rule.evaluate_data(X)
+            curr_covered = coverage.rule_bitset(rule.selectors)
             curr_covered &= status
             status &= np.bitwise_not(curr_covered)
-            probabilities[curr_covered] = rule.probabilities
+            probabilities[coverage.unpack(curr_covered)] = rule.probabilities
+            if not status.any():
+                break
         return probabilities
 
     def unordered_predict(self, X):
@@ -1207,14 +1339,15 @@ class _RuleClassifier(Model):
             Probabilistic classification.
         """
         num_classes = len(self.domain.class_var.values)
-        probabilities = np.array([np.zeros(num_classes, dtype=float)
-                                  for _ in range(X.shape[0])])
+        probabilities = np.zeros((X.shape[0], num_classes), dtype=float)
 
         num_hits = np.zeros(X.shape[0], dtype=int)
         total_weight = np.vstack(np.zeros(X.shape[0], dtype=float))
+        coverage = CoverageCache(X)
         for rule in self.rule_list[:-1]:
             if rule.length > 0:
-                curr_covered = rule.evaluate_data(X)
+                curr_covered = coverage.unpack(
+                    coverage.rule_bitset(rule.selectors))
                 num_hits += curr_covered
                 temp = rule.curr_class_dist.sum()
                 probabilities[curr_covered] += rule.probabilities * temp
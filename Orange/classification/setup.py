@@ -21,6 +21,10 @@ def configuration(parent_package='', top_path=None):
                          sources=['_tree_scorers.c'],
                          include_dirs=[numpy.get_include()],
                          libraries=libraries)
+    config.add_extension('_rules',
+                         sources=['_rules.c'],
+                         include_dirs=[numpy.get_include()],
+                         libraries=libraries)
     return config
 
 if __name__ == '__main__':
@@ -1,4 +1,7 @@
 """Tree inducers: SKL and Orange's own inducer"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import sklearn.tree as skl_tree
 
@@ -11,6 +14,27 @@ from Orange.tree import Node, DiscreteNode, MappedDiscreteNode, \
 __all__ = ["SklTreeLearner", "TreeLearner"]
 
 
+class _ColumnStore:
+    """
+    Columns of training data, shared by all nodes of a tree under induction.
+
+    Nodes refer to data instances by arrays of indices instead of copying
+    the data.
+    """
+    def __init__(self, data):
+        self.domain = data.domain
+        self.X = np.asfortranarray(data.X, dtype=np.float64)
+        self.Y = np.ascontiguousarray(data.Y, dtype=np.float64)
+        self.W = data.W if data.has_weights() else None
+
+    def class_distribution(self, active_inst):
+        y = self.Y[active_inst].astype(int)
+        w = self.W[active_inst] if self.W is not None else None
+        return distribution.Discrete(
+            np.bincount(y, w, len(self.domain.class_var.values)),
+            self.domain.class_var)
+
+
 class TreeLearner(Learner):
     """
     Tree inducer with proper handling of nominal attributes and binarization.
@@ -45,6 +69,10 @@ class TreeLearner(Learner):
             a majority at which the data is not split
             further
 
+        n_jobs (int):
+            the number of threads used for scoring attributes; if negative,
+            the number of processors is used
+
     Returns:
         instance of OrangeTreeModel
     """
@@ -56,27 +84,33 @@ class TreeLearner(Learner):
     def __init__(
             self, *args, binarize=False, max_depth=None,
             min_samples_leaf=1, min_samples_split=2, sufficient_majority=0.95,
-            **kwargs):
+            n_jobs=1, **kwargs):
         super().__init__(*args, **kwargs)
         self.binarize = binarize
         self.min_samples_leaf = min_samples_leaf
         self.min_samples_split = min_samples_split
         self.sufficient_majority = sufficient_majority
         self.max_depth = max_depth
+        self.n_jobs = n_jobs
 
-    def _select_attr(self, data):
+    def _select_attr(self, store, active_inst, distr, mapper=map):
         """Select the attribute for the next split.
 
+        Args:
+            store (_ColumnStore): training data
+            active_inst (np.ndarray): indices of instances in the node
+            distr (distribution.Discrete): class distribution in the node
+            mapper (callable): a function (like `map`) that scores chunks of
+                attributes
+
         Returns:
             tuple with an instance of Node and a numpy array indicating
             the branch index for each data instance, or -1 if data instance
             is dropped
         """
-        # Prevent false warnings by pylint
-        attr = attr_no = None
         REJECT_ATTRIBUTE = 0, None, None, 0
 
-        def _score_disc():
+        def _score_disc(attr, attr_no):
             """Scoring for discrete attributes, no binarization
 
             The class computes the entropy itself, not by calling other
@@ -87,9 +121,8 @@ class TreeLearner(Learner):
             if n_values < 2:
                 return REJECT_ATTRIBUTE
 
-            x = data.X[:, attr_no].flatten()
-            cont = _tree_scorers.contingency(x, len(data.domain.attributes[attr_no].values),
-                                             data.Y, len(data.domain.class_var.values))
+            x = store.X[active_inst, attr_no]
+            cont = _tree_scorers.contingency(x, n_values, col_y, n_classes)
             attr_distr = np.sum(cont, axis=0)
             null_nodes = attr_distr <= self.min_samples_leaf
             # This is just for speed. If there is only a single non-null-node,
@@ -108,7 +141,7 @@ class TreeLearner(Learner):
             attr_entr = np.sum(attr_distr * np.log(attr_distr))
             cont_entr = np.sum(cont * np.log(cont))
             score = (class_entr - attr_entr + cont_entr) / n / np.log(2)
-            score *= n / len(data)  # punishment for missing values
+            score *= n / len(active_inst)  # punishment for missing values
             branches = x
             branches[np.isnan(branches)] = -1
             if score == 0:
@@ -116,12 +149,18 @@ class TreeLearner(Learner):
             node = DiscreteNode(attr, attr_no, None)
             return score, node, branches, n_values
 
-        def _score_disc_bin():
+        def _score_disc_bin(attr, attr_no):
             """Scoring for discrete attributes, with binarization"""
             n_values = len(attr.values)
             if n_values <= 2:
-                return _score_disc()
-            cont = contingency.Discrete(data, attr)
+                return _score_disc(attr, attr_no)
+            col_x = store.X[active_inst, attr_no]
+            known = ~np.isnan(col_x)
+            cont = np.bincount(
+                col_y[known].astype(int) * n_values + col_x[known].astype(int),
+                col_w[known] if col_w is not None else None,
+                n_classes * n_values).reshape(n_classes, n_values)
+            cont = cont.astype(np.float64)
             attr_distr = np.sum(cont, axis=0)
             # Skip instances with missing value of the attribute
             cls_distr = np.sum(cont, axis=1)
@@ -131,65 +170,102 @@ class TreeLearner(Learner):
                 cont, cls_distr, attr_distr, self.min_samples_leaf)
             if best_score <= 0:
                 return REJECT_ATTRIBUTE
-            best_score *= 1 - np.sum(cont.unknowns) / len(data)
+            unknowns = (len(col_x) - np.sum(known) if col_w is None
+                        else np.sum(col_w[~known]))
+            best_score *= 1 - unknowns / len(active_inst)
             mapping, branches = MappedDiscreteNode.branches_from_mapping(
-                data.X[:, attr_no], best_mapping, n_values)
+                col_x, best_mapping, n_values)
             node = MappedDiscreteNode(attr, attr_no, mapping, None)
             return best_score, node, branches, 2
 
-        def _score_cont():
+        def _score_cont(attr, attr_no):
             """Scoring for numeric attributes"""
-            col_x = data.X[:, attr_no]
+            col_x = store.X[active_inst, attr_no]
             nans = np.sum(np.isnan(col_x))
             non_nans = len(col_x) - nans
-            arginds = np.argsort(col_x)[:non_nans]
+            arginds = active_inst[np.argsort(col_x)[:non_nans]].astype(np.intp)
             best_score, best_cut = _tree_scorers.find_threshold_entropy(
-                col_x, data.Y, arginds,
-                len(class_var.values), self.min_samples_leaf)
+                store.X[:, attr_no], store.Y, arginds,
+                n_classes, self.min_samples_leaf)
             if best_score == 0:
                 return REJECT_ATTRIBUTE
             best_score *= non_nans / len(col_x)
-            branches = col_x > best_cut
-            branches[np.isnan(col_x)] = -1
             node = NumericNode(attr, attr_no, best_cut, None)
-            return best_score, node, branches, 2
+            # branches are computed only for the chosen attribute
+            return best_score, node, None, 2
+
+        def _branches_cont(node):
+            col_x = store.X[active_inst, node.attr_idx]
+            branches = col_x > node.threshold
+            branches[np.isnan(col_x)] = -1
+            return branches
+
+        def _score_attrs(attr_nos):
+            return [disc_scorer(attrs[attr_no], attr_no)
+                    if attrs[attr_no].is_discrete
+                    else _score_cont(attrs[attr_no], attr_no)
+                    for attr_no in attr_nos]
 
         #######################################
         # The real _select_attr starts here
-        domain = data.domain
-        class_var = domain.class_var
+        attrs = store.domain.attributes
+        n_classes = len(store.domain.class_var.values)
+        col_y = store.Y[active_inst]
+        col_w = store.W[active_inst] if store.W is not None else None
         best_score, *best_res = REJECT_ATTRIBUTE
         best_res = [Node(None, None, None)] + best_res[1:]
         disc_scorer = _score_disc_bin if self.binarize else _score_disc
-        for attr_no, attr in enumerate(domain.attributes):
-            sc, *res = disc_scorer() if attr.is_discrete else _score_cont()
-            if res[0] is not None and sc > best_score:
-                best_score, best_res = sc, res
-        best_res[0].value = distribution.Discrete(data, class_var)
+        n_chunks = min(self._n_threads(), len(attrs)) or 1
+        for chunk in mapper(_score_attrs,
+                         np.array_split(np.arange(len(attrs)), n_chunks)):
+            for sc, *res in chunk:
+                if res[0] is not None and sc > best_score:
+                    best_score, best_res = sc, res
+        if isinstance(best_res[0], NumericNode):
+            best_res[1] = _branches_cont(best_res[0])
+        best_res[0].value = distr
         return best_res
 
-    def build_tree(self, data, active_inst, level=1):
-        """Induce a tree from the given data
+    def _n_threads(self):
+        if self.n_jobs < 0:
+            return os.cpu_count() or 1
+        return max(self.n_jobs, 1)
 
-        Returns:
-            root node (Node)"""
-        node_insts = data[active_inst]
-        distr = distribution.Discrete(node_insts, data.domain.class_var)
-        if len(node_insts) < self.min_samples_leaf:
+    def _build_node(self, store, active_inst, level, mapper=map):
+        distr = store.class_distribution(active_inst)
+        if len(active_inst) < self.min_samples_leaf:
             return None
-        if len(node_insts) < self.min_samples_split or \
+        if len(active_inst) < self.min_samples_split or \
                 max(distr) >= sum(distr) * self.sufficient_majority or \
                 self.max_depth is not None and level > self.max_depth:
             node, branches, n_children = Node(None, None, distr), None, 0
         else:
-            node, branches, n_children = self._select_attr(node_insts)
+            node, branches, n_children = self._select_attr(
+                store, active_inst, distr, mapper)
         node.subset = active_inst
         if branches is not None:
             node.children = [
-                self.build_tree(data, active_inst[branches == br], level + 1)
+                self._build_node(store, active_inst[branches == br],
+                                 level + 1, mapper)
                 for br in range(n_children)]
         return node
 
+    def build_tree(self, data, active_inst, level=1):
+        """Induce a tree from the given data
+
+        Instances are referred to by indices into data, which is never
+        copied. If `n_jobs` differs from 1, attributes are scored in a
+        pool of threads.
+
+        Returns:
+            root node (Node)"""
+        store = _ColumnStore(data)
+        n_threads = self._n_threads()
+        if n_threads == 1:
+            return self._build_node(store, active_inst, level)
+        with ThreadPoolExecutor(n_threads) as pool:
+            return self._build_node(store, active_inst, level, pool.map)
+
     def fit_storage(self, data):
         if self.binarize and any(
                 attr.is_discrete and len(attr.values) > self.MAX_BINARIZATION
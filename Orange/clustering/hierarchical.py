@@ -10,6 +10,7 @@ import scipy.cluster.hierarchy
 import scipy.spatial.distance
 
 from Orange.distance import Euclidean, PearsonR
+from Orange.misc import CondensedDistMatrix
 
 __all__ = ['HierarchicalClustering']
 
@@ -32,7 +33,11 @@ _HAS_WARD_LINKAGE_FROM_DIST = \
 
 
 def condensedform(X, mode="upper"):
-    X = numpy.asarray(X)
+    if isinstance(X, CondensedDistMatrix) and mode == "upper":
+        # Condensed matrices store the upper triangle; use it without a copy
+        return X.flat
+    if not isinstance(X, CondensedDistMatrix):
+        X = numpy.asarray(X)
     assert len(X.shape) == 2
     assert X.shape[0] == X.shape[1]
 
@@ -420,14 +425,15 @@ def optimal_leaf_ordering(tree, distances, progress_callback=None):
         Function used to report on progress.
 
     """
-    distances = numpy.asarray(distances)
-    M = numpy.zeros_like(distances)
+    if not isinstance(distances, CondensedDistMatrix):
+        distances = numpy.asarray(distances)
 
     # rearrange distances by order defined by tree's leaves
     indices = numpy.array([leaf.value.index for leaf in leaves(tree)])
     distances = distances[indices[numpy.newaxis, :],
                           indices[:, numpy.newaxis]]
     distances = numpy.ascontiguousarray(distances)
+    M = numpy.zeros_like(distances)
 
     # This is the 'fast' early termination search described in the paper
     # (it is slower in the pure python implementation)
@@ -4,8 +4,9 @@ import numpy
 cimport numpy as np
 import cython
 
-cdef extern from "numpy/npy_math.h":
+cdef extern from "numpy/npy_math.h" nogil:
     bint npy_isnan(double x)
+    double NPY_NAN
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -52,3 +53,178 @@ def contingency_floatarray(np.ndarray[np.float64_t, ndim=1] col_data, np.ndarray
     assert j == N-1
 
     return V,C,unknown
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def contingencies_discrete(np.float64_t[:, :] X,
+                           np.intp_t[:] cols,
+                           np.intp_t[:] classes,
+                           np.float64_t[:] W,
+                           np.float64_t[:, :, :] conts,
+                           np.float64_t[:, :] unknown):
+    """
+    Add counts of values of columns `cols` of `X` for each class to
+    `conts` (indexed by column, class and value) and counts of missing
+    values to `unknown` (indexed by column and class).
+
+    Rows with negative classes are skipped. Rows are weighted by `W`
+    unless it is `None`. The function releases the GIL, so it can be
+    called from multiple threads for disjoint sets of columns.
+    """
+    cdef Py_ssize_t n_values = conts.shape[2]
+    cdef Py_ssize_t i, j, k
+    cdef np.intp_t c
+    cdef np.float64_t v, w = 1.
+    cdef bint weights = W is not None
+    cdef bint out_of_range = False
+    with nogil:
+        for i in range(X.shape[0]):
+            c = classes[i]
+            if c < 0:
+                continue
+            if weights:
+                w = W[i]
+            for j in range(cols.shape[0]):
+                v = X[i, cols[j]]
+                if npy_isnan(v):
+                    unknown[j, c] += w
+                else:
+                    k = <Py_ssize_t>v
+                    if k < 0 or k >= n_values:
+                        out_of_range = True
+                    else:
+                        conts[j, c, k] += w
+    if out_of_range:
+        raise ValueError("discrete value out of range")
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def contingencies_discrete_sparse(np.float64_t[:] data,
+                                  np.intp_t[:] indices,
+                                  np.intp_t[:] indptr,
+                                  bint csr,
+                                  np.intp_t[:] col_map,
+                                  np.intp_t[:] classes,
+                                  np.float64_t[:] W,
+                                  np.float64_t[:, :, :] conts,
+                                  np.float64_t[:, :] unknown,
+                                  np.float64_t[:, :] stored):
+    """
+    Sparse (CSR or CSC) variant of :obj:`contingencies_discrete`. Columns
+    are mapped to the first index of outputs by `col_map`; columns with
+    negative entries are skipped. The weight of stored elements for each
+    column and class is added to `stored`, so the caller can add the
+    remaining weight to counts of zeros.
+    """
+    cdef Py_ssize_t n_values = conts.shape[2]
+    cdef Py_ssize_t p, q, i, j, k
+    cdef np.intp_t c
+    cdef np.float64_t v, w = 1.
+    cdef bint weights = W is not None
+    cdef bint out_of_range = False
+    with nogil:
+        for p in range(indptr.shape[0] - 1):
+            for q in range(indptr[p], indptr[p + 1]):
+                if csr:
+                    i = p
+                    j = col_map[indices[q]]
+                else:
+                    i = indices[q]
+                    j = col_map[p]
+                c = classes[i]
+                if j < 0 or c < 0:
+                    continue
+                if weights:
+                    w = W[i]
+                stored[j, c] += w
+                v = data[q]
+                if npy_isnan(v):
+                    unknown[j, c] += w
+                else:
+                    k = <Py_ssize_t>v
+                    if k < 0 or k >= n_values:
+                        out_of_range = True
+                    else:
+                        conts[j, c, k] += w
+    if out_of_range:
+        raise ValueError("discrete value out of range")
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def count_distinct_sorted(np.float64_t[:, :] X,
+                          np.intp_t[:, :] ranks,
+                          np.intp_t[:] classes,
+                          np.intp_t[:] counts):
+    """
+    Store the number of distinct known values in each row of `X` into
+    `counts`, considering only the elements with non-negative classes.
+    Rows of `X` correspond to columns of data, and rows of `ranks` contain
+    indices that sort them.
+    """
+    cdef Py_ssize_t i, j, r
+    cdef np.float64_t v, last
+    cdef np.intp_t n
+    with nogil:
+        for j in range(X.shape[0]):
+            n = 0
+            last = NPY_NAN
+            for i in range(X.shape[1]):
+                r = ranks[j, i]
+                v = X[j, r]
+                if classes[r] < 0 or npy_isnan(v):
+                    continue
+                if v != last:
+                    n += 1
+                    last = v
+            counts[j] = n
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def contingencies_sorted(np.float64_t[:, :] X,
+                         np.intp_t[:, :] ranks,
+                         np.intp_t[:] classes,
+                         np.float64_t[:] W,
+                         np.intp_t[:] offsets,
+                         np.float64_t[:] values,
+                         np.float64_t[:, :] counts,
+                         np.float64_t[:, :] unknown):
+    """
+    Compute distributions of values in rows of `X` for each class, like
+    :obj:`contingency_floatarray` does for a single column, for all rows
+    at once. Rows of `X` correspond to columns of data, and rows of
+    `ranks` contain indices that sort them.
+
+    The distinct values of row `j` are stored into
+    `values[offsets[j]:offsets[j + 1]]` and their counts for each class
+    into the corresponding columns of `counts` (indexed by class and
+    value). Counts of missing values are added to `unknown` (indexed by
+    row of `X` and class). Elements with negative classes are skipped.
+    """
+    cdef Py_ssize_t i, j, r, pos
+    cdef np.intp_t c
+    cdef np.float64_t v, last, w = 1.
+    cdef bint weights = W is not None
+    with nogil:
+        for j in range(X.shape[0]):
+            pos = offsets[j] - 1
+            last = NPY_NAN
+            for i in range(X.shape[1]):
+                r = ranks[j, i]
+                c = classes[r]
+                if c < 0:
+                    continue
+                if weights:
+                    w = W[r]
+                v = X[j, r]
+                if npy_isnan(v):
+                    unknown[j, c] += w
+                    continue
+                if v != last:
+                    pos += 1
+                    values[pos] = v
+                    last = v
+                counts[c, pos] += w
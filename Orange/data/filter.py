@@ -8,6 +8,7 @@ import numpy as np
 import bottleneck as bn
 
 from Orange.data import Instance, Storage, Variable
+from Orange.misc.cache import LRUCache
 from Orange.misc.enum import Enum
 
 
@@ -235,8 +236,10 @@ class ValueFilter(Filter):
     :obj:`Orange.data.filter.Values`.
 
     The internal implementation of `filter.Values` in data storages, like
-    :obj:`Orange.data.Table`, recognize these filters and retrieve their,
-    attributes, like operators and reference values, but do not call them.
+    :obj:`Orange.data.Table`, recognize these filters and either retrieve
+    their attributes, like operators and reference values, or evaluate them
+    on entire columns with :obj:`column_mask`. Derived classes that do not
+    override :obj:`column_mask` are called with individual data instances.
 
     The fallback implementation of :obj:`Orange.data.filter.Values` calls
     the subfilters with individual data instances, which is very inefficient.
@@ -256,6 +259,16 @@ class ValueFilter(Filter):
         self.pos_cache = domain.index(self.column)
         self.last_domain = domain
 
+    def column_mask(self, values, var):
+        """
+        Return a boolean array that tells which of the `values` (a column of
+        values of variable `var`) pass the filter.
+
+        Derived classes should override this method; filters that do not are
+        evaluated (slowly) by calling them with individual data instances.
+        """
+        raise NotImplementedError
+
 
 class FilterDiscrete(ValueFilter):
     """
@@ -286,6 +299,13 @@ class FilterDiscrete(ValueFilter):
         else:
             return value in self.values
 
+    def column_mask(self, values, var):
+        values = values.astype(float)
+        if self.values is None:
+            return ~np.isnan(values)
+        return np.in1d(values, [val if isinstance(val, Real) else var.to_val(val)
+                                for val in self.values])
+
 
 class FilterContinuous(ValueFilter):
     """
@@ -358,6 +378,12 @@ class FilterContinuous(ValueFilter):
             return True
         raise ValueError("invalid operator")
 
+    def column_mask(self, values, var):
+        values = values.astype(float)
+        if self.oper == self.IsDefined:
+            return ~np.isnan(values)
+        return _compare(values, self.oper, self.ref, self.max, self)
+
     def __str__(self):
         if isinstance(self.column, str):
             column = self.column
@@ -479,6 +505,23 @@ class FilterString(ValueFilter):
             return not refval <= value <= high
         raise ValueError("invalid operator")
 
+    def column_mask(self, values, var):
+        if self.oper == self.IsDefined:
+            return values.astype(bool)
+        values = _string_column(values, self.case_sensitive)
+        ref, high = self.ref, self.max
+        if not self.case_sensitive:
+            ref = ref.lower()
+            if self.oper in (self.Between, self.Outside):
+                high = high.lower()
+        if self.oper == self.Contains:
+            return _string_mask(values, lambda value: ref in value)
+        if self.oper == self.StartsWith:
+            return _string_mask(values, lambda value: value.startswith(ref))
+        if self.oper == self.EndsWith:
+            return _string_mask(values, lambda value: value.endswith(ref))
+        return _compare(values, self.oper, ref, high, self).astype(bool)
+
     # For PyCharm:
     Equal = NotEqual = Less = LessEqual = Greater = GreaterEqual = 0
     Between = Outside = Contains = StartsWith = EndsWith = IsDefined = 0
@@ -531,7 +574,13 @@ class FilterStringList(ValueFilter):
         if self.case_sensitive:
             return value in self._values
         else:
-            return value.lower() in self.values_lower
+            return str(value).lower() in self.values_lower
+
+    def column_mask(self, values, var):
+        values = _string_column(values, self.case_sensitive)
+        accepted = set(self._values if self.case_sensitive
+                       else self.values_lower)
+        return _string_mask(values, accepted.__contains__)
 
 
 class FilterRegex(ValueFilter):
@@ -542,3 +591,322 @@ class FilterRegex(ValueFilter):
 
     def __call__(self, inst):
         return bool(self._re.search(inst or ''))
+
+    def column_mask(self, values, var):
+        search = self._re.search
+        return np.fromiter((bool(search(value or '')) for value in values),
+                           dtype=bool, count=len(values))
+
+
+def _string_column(values, case_sensitive):
+    """Return `values` as an object array of strings, in lower case if
+    comparisons are not case sensitive"""
+    if case_sensitive:
+        convert = str
+    else:
+        convert = lambda value: str(value).lower()
+    return np.frompyfunc(convert, 1, 1)(np.asarray(values, dtype=object))
+
+
+def _string_mask(values, predicate):
+    """Return a boolean array with results of `predicate` for elements of
+    an object array `values`"""
+    return np.frompyfunc(predicate, 1, 1)(values).astype(bool)
+
+
+def _compare(values, oper, ref, high, flt):
+    """Compare `values` to reference values with operator of
+    :obj:`FilterContinuous` or :obj:`FilterString` `flt`"""
+    if oper == flt.Equal:
+        return values == ref
+    if oper == flt.NotEqual:
+        return values != ref
+    if oper == flt.Less:
+        return values < ref
+    if oper == flt.LessEqual:
+        return values <= ref
+    if oper == flt.Greater:
+        return values > ref
+    if oper == flt.GreaterEqual:
+        return values >= ref
+    if oper == flt.Between:
+        return (values >= ref) & (values <= high)
+    if oper == flt.Outside:
+        return (values < ref) | (values > high)
+    raise TypeError("Invalid operator")
+
+
+class _Leaf:
+    """Evaluation of a :obj:`ValueFilter` in a compiled filter"""
+    def __init__(self, index, evaluate, cost):
+        self.index = index
+        self.evaluate = evaluate
+        self.cost = cost
+
+    def __call__(self, data, rows):
+        values = data.get_column_view(self.index)[0]
+        if rows is not None:
+            values = values[rows]
+        return self.evaluate(values)
+
+
+class _RangeLeaf(_Leaf):
+    """Evaluation of :obj:`FilterContinuous` in a compiled filter, which
+    uses the table's sorted index of the column if there is one"""
+    def __init__(self, index, evaluate, cost, oper, ref, high):
+        super().__init__(index, evaluate, cost)
+        self.oper, self.ref, self.high = oper, ref, high
+
+    def __call__(self, data, rows):
+        if rows is None:
+            get_sorted_index = getattr(data, "get_sorted_index", None)
+            sorted_index = get_sorted_index and get_sorted_index(self.index)
+            if sorted_index is not None:
+                return self._from_index(len(data), *sorted_index)
+        return super().__call__(data, rows)
+
+    def _from_index(self, n, order, values):
+        oper, ref, high = self.oper, self.ref, self.high
+        n_defined = len(values)
+        if oper == FilterContinuous.IsDefined:
+            ranges = [(0, n_defined)]
+        elif oper in (FilterContinuous.Equal, FilterContinuous.NotEqual):
+            first = values.searchsorted(ref, "left")
+            last = values.searchsorted(ref, "right")
+            if oper == FilterContinuous.Equal:
+                ranges = [(first, last)]
+            else:
+                # Rows with missing values are not equal either
+                ranges = [(0, first), (last, n)]
+        elif oper == FilterContinuous.Less:
+            ranges = [(0, values.searchsorted(ref, "left"))]
+        elif oper == FilterContinuous.LessEqual:
+            ranges = [(0, values.searchsorted(ref, "right"))]
+        elif oper == FilterContinuous.Greater:
+            ranges = [(values.searchsorted(ref, "right"), n_defined)]
+        elif oper == FilterContinuous.GreaterEqual:
+            ranges = [(values.searchsorted(ref, "left"), n_defined)]
+        elif oper == FilterContinuous.Between:
+            ranges = [(values.searchsorted(ref, "left"),
+                       values.searchsorted(high, "right"))]
+        else:  # Outside
+            ranges = [(0, values.searchsorted(ref, "left")),
+                      (values.searchsorted(high, "right"), n_defined)]
+        sel = np.zeros(n, dtype=bool)
+        for first, last in ranges:
+            sel[order[first:last]] = True
+        return sel
+
+
+class _InstanceLeaf(_Leaf):
+    """Evaluation of a :obj:`ValueFilter` without :obj:`column_mask`, which
+    calls the filter with individual data instances"""
+    def __init__(self, flt, cost):
+        super().__init__(None, None, cost)
+        self.flt = flt
+
+    def __call__(self, data, rows):
+        if rows is None:
+            rows = range(len(data))
+        return np.fromiter((self.flt(data[row]) for row in rows),
+                           dtype=bool, count=len(rows))
+
+
+def _subset(rows, positions):
+    if positions is None:
+        return rows
+    if rows is None:
+        return positions
+    return rows[positions]
+
+
+class _Conjunction:
+    """Evaluation of a conjunction of compiled filters; each filter is
+    evaluated only on the rows that passed the preceding filters"""
+    def __init__(self, conditions, negate):
+        self.conditions = sorted(conditions, key=lambda cond: cond.cost)
+        self.negate = negate
+        self.cost = max(cond.cost for cond in self.conditions)
+
+    def __call__(self, data, rows):
+        n = len(data) if rows is None else len(rows)
+        positions = None
+        for cond in self.conditions:
+            mask = cond(data, _subset(rows, positions))
+            positions = np.flatnonzero(mask) if positions is None \
+                else positions[mask]
+            if not len(positions):
+                break
+        sel = np.zeros(n, dtype=bool)
+        sel[positions] = True
+        if self.negate:
+            sel = ~sel
+        return sel
+
+
+class _Disjunction(_Conjunction):
+    """Evaluation of a disjunction of compiled filters; each filter is
+    evaluated only on the rows that did not pass the preceding filters"""
+    def __call__(self, data, rows):
+        n = len(data) if rows is None else len(rows)
+        positions = None
+        sel = np.zeros(n, dtype=bool)
+        for cond in self.conditions:
+            mask = cond(data, _subset(rows, positions))
+            if positions is None:
+                sel[mask] = True
+                positions = np.flatnonzero(~mask)
+            else:
+                sel[positions[mask]] = True
+                positions = positions[~mask]
+            if not len(positions):
+                break
+        if self.negate:
+            sel = ~sel
+        return sel
+
+
+def _discrete_evaluator(flt, var):
+    if flt.values is None:
+        return lambda values: ~np.isnan(values.astype(float, copy=False))
+    codes = [val if isinstance(val, Real) else var.to_val(val)
+             for val in flt.values]
+    n_values = len(var.values) if var.is_discrete else 0
+    # np.in1d compares values to each code for small sets and sorts them for
+    # larger; a lookup table is faster for the latter
+    if len(codes) <= 16 or \
+            not all(isinstance(code, Real) and 0 <= code < n_values
+                    and code == int(code) for code in codes):
+        codes = np.array(codes, dtype=float)
+        return lambda values: np.in1d(values.astype(float, copy=False), codes)
+
+    # Unknown values are mapped to the last (False) entry of the lookup table
+    lookup = np.zeros(n_values + 1, dtype=bool)
+    lookup[np.array(codes, dtype=int)] = True
+
+    def evaluate(values):
+        values = values.astype(float)
+        with np.errstate(invalid="ignore"):
+            values[~(values < n_values)] = n_values
+        return lookup[values.astype(np.intp)]
+    return evaluate
+
+
+def _compile_leaf(flt, domain):
+    """Return :obj:`_Leaf` for `flt`; parameters of the filter are copied,
+    so later changes of the filter do not affect the compiled filter"""
+    if not isinstance(flt, ValueFilter):
+        raise TypeError("Invalid filter")
+    index = domain.index(flt.column)
+    var = domain[index]
+    if isinstance(flt, FilterDiscrete):
+        return _Leaf(index, _discrete_evaluator(flt, var), 0)
+
+    if isinstance(flt, FilterContinuous):
+        if flt.oper not in range(FilterContinuous.IsDefined + 1):
+            raise TypeError("Invalid operator")
+        copy = FilterContinuous(flt.column, flt.oper, flt.ref, flt.max)
+        evaluate = lambda values: copy.column_mask(values, var)
+        if flt.oper == FilterContinuous.IsDefined:
+            limits = ()
+        elif flt.oper in (FilterContinuous.Between, FilterContinuous.Outside):
+            limits = (flt.ref, flt.max)
+        else:
+            limits = (flt.ref, )
+        # Comparisons with nan (and non-numbers) are left to numpy
+        if all(isinstance(x, Real) and not isnan(x) for x in limits):
+            return _RangeLeaf(index, evaluate, 1, flt.oper, flt.ref, flt.max)
+        return _Leaf(index, evaluate, 1)
+
+    if isinstance(flt, FilterString):
+        if flt.oper not in range(FilterString.IsDefined + 1):
+            raise TypeError("Invalid operator")
+        copy = FilterString(flt.column, flt.oper, flt.ref, flt.max,
+                            flt.case_sensitive)
+        cost = 2
+    elif isinstance(flt, FilterStringList):
+        copy = FilterStringList(flt.column, list(flt.values),
+                                flt.case_sensitive)
+        cost = 2
+    elif isinstance(flt, FilterRegex):
+        copy = FilterRegex(flt.column, flt._re.pattern, flt._re.flags)
+        cost = 3
+    elif type(flt).column_mask is ValueFilter.column_mask:
+        return _InstanceLeaf(flt, 4)
+    else:
+        copy, cost = flt, 3
+    return _Leaf(index, lambda values: copy.column_mask(values, var), cost)
+
+
+def _compile(flt, domain):
+    if isinstance(flt, Values):
+        conditions = [_compile(cond, domain) for cond in flt.conditions]
+        if flt.conjunction:
+            return _Conjunction(conditions, flt.negate)
+        else:
+            return _Disjunction(conditions, flt.negate)
+    return _compile_leaf(flt, domain)
+
+
+def _filter_key(flt):
+    """Return a key that describes the filter's parameters or `None` for
+    filters of unknown types"""
+    if isinstance(flt, Values):
+        keys = tuple(_filter_key(cond) for cond in flt.conditions)
+        if None in keys:
+            return None
+        return Values, flt.conjunction, flt.negate, keys
+    if isinstance(flt, FilterDiscrete):
+        params = None if flt.values is None else tuple(flt.values),
+    elif isinstance(flt, FilterString):
+        params = flt.oper, flt.ref, flt.max, flt.case_sensitive
+    elif isinstance(flt, FilterContinuous):
+        params = flt.oper, flt.ref, flt.max
+    elif isinstance(flt, FilterStringList):
+        params = tuple(flt.values), flt.case_sensitive
+    elif isinstance(flt, FilterRegex):
+        params = flt._re.pattern, flt._re.flags
+    else:
+        return None
+    return (type(flt), flt.column, flt.negate) + params
+
+
+_compiled_filters = LRUCache(100)
+
+
+def compile_filter(flt, domain):
+    """
+    Compile a filter, :obj:`Values` or :obj:`ValueFilter`, for data with the
+    given domain.
+
+    The compiled filter is a function that takes a table and returns a
+    boolean array that tells which rows pass the filter. Column indices,
+    values of discrete variables (mapped to lookup tables) and other
+    parameters are resolved in advance. Conditions in conjunctions and
+    disjunctions are reordered so that cheaper are evaluated first, and
+    each is only evaluated on rows that are not yet decided by the preceding
+    ones.
+
+    Compiled filters are cached, so applying equal filters to data with the
+    same domain, as in repeated filtering in widgets, compiles them once.
+    """
+    key = _filter_key(flt)
+    if key is not None:
+        key = (domain, key)
+        try:
+            compiled = _compiled_filters.get(key)
+        except TypeError:  # unhashable parameters
+            key = None
+        else:
+            if compiled is not None:
+                return compiled
+    plan = _compile(flt, domain)
+    if not isinstance(flt, Values):
+        plan = _Conjunction([plan], flt.negate)
+
+    def compiled(data):
+        return plan(data, None)
+
+    if key is not None:
+        _compiled_filters.put(key, compiled)
+    return compiled
@@ -1,31 +1,38 @@
+import codecs
 import contextlib
 import csv
+import json
 import locale
+import mmap
 import pickle
 import re
+import struct
 import subprocess
 import sys
 import warnings
 
 from ast import literal_eval
-from collections import OrderedDict, Counter
+from collections import OrderedDict, Counter, namedtuple
 from functools import lru_cache
-from itertools import chain, repeat
+from io import StringIO
+from itertools import chain, islice, repeat
 from math import isnan
 from numbers import Number
-from os import path, unlink
+from os import cpu_count, path, stat, unlink
 from tempfile import NamedTemporaryFile
 from urllib.parse import urlparse, urlsplit, urlunsplit, unquote as urlunquote
 from urllib.request import urlopen, Request
 
 import bottleneck as bn
 import numpy as np
+import scipy.sparse as sp
 from chardet.universaldetector import UniversalDetector
 
 from Orange.data import (
     _io, is_discrete_values, MISSING_VALUES, Table, Domain, Variable,
     DiscreteVariable, StringVariable, ContinuousVariable, TimeVariable,
 )
+from Orange.data.variable import DISCRETE_MAX_VALUES
 from Orange.util import Registry, flatten, namegen
 
 
@@ -153,6 +160,196 @@ _RE_TYPES = re.compile(r'^\s*({}|{}|)\s*$'.format(_RE_DISCRETE_LIST.pattern,
 _RE_FLAGS = re.compile(r'^\s*( |{}|)*\s*$'.format('|'.join(flatten(filter(None, i) for i in Flags.ALL.items()))))
 
 
+class _ColumnPlan:
+    """
+    Columns of a table that :obj:`_parse_rows` parses as numbers
+    (`numeric`), whose numbers are checked for being discrete (`heuristic`)
+    and which are kept as strings (`raw`), for rows of length `rowlen`.
+    """
+    def __init__(self, rowlen):
+        self.rowlen = rowlen
+        self.numeric = []
+        self.heuristic = []
+        self.raw = []
+
+
+class _ParsedChunk(namedtuple('_ParsedChunk',
+                              'n_rows floats strings distinct')):
+    # Missing values are marked by `np.nan`, which must remain the same object
+    # when chunks are passed between processes
+
+    def __reduce__(self):
+        missing = {col: [i for i, value in enumerate(values)
+                         if value is np.nan]
+                   for col, values in self.strings.items()}
+        distinct = {col: values and (values - {np.nan}, np.nan in values)
+                    for col, values in self.distinct.items()}
+        return _unpickle_chunk, (self.n_rows, self.floats, self.strings,
+                                 missing, distinct)
+
+
+def _unpickle_chunk(n_rows, floats, strings, missing, distinct):
+    for col, indices in missing.items():
+        values = strings[col]
+        for i in indices:
+            values[i] = np.nan
+    distinct = {col: values and values[0] | ({np.nan} if values[1] else set())
+                for col, values in distinct.items()}
+    return _ParsedChunk(n_rows, floats, strings, distinct)
+
+
+def _parse_rows(rows, plan):
+    """
+    Parse a chunk of rows as described by the :obj:`_ColumnPlan`.
+
+    Return :obj:`_ParsedChunk` with arrays of floats and lists of strings
+    for columns, and sets of distinct values (or `None` if there are more
+    than DISCRETE_MAX_VALUES) for heuristically numeric columns, or `None`
+    if the rows contradict the plan.
+    """
+    rowlen = plan.rowlen
+    if any(len(row) > rowlen for row in rows):
+        # Rows are longer than the first ones
+        return None
+    columns = list(zip(*(row + [''] * (rowlen - len(row)) for row in rows)))
+    if not columns:
+        columns = [()] * rowlen
+    floats, strings, distinct = {}, {}, {}
+    for col in plan.raw:
+        strings[col] = [np.nan if i in MISSING_VALUES else i
+                        for i in (i.strip() for i in columns[col])]
+    for col in plan.numeric:
+        values = [np.nan if i in MISSING_VALUES else i
+                  for i in (i.strip() for i in columns[col])]
+        try:
+            floats[col] = np.array(values, dtype=float)
+        except ValueError:
+            return None
+    for col in plan.heuristic:
+        values = set(np.nan if i in MISSING_VALUES else i
+                     for i in (i.strip() for i in columns[col]))
+        distinct[col] = values if len(values) <= DISCRETE_MAX_VALUES else None
+    return _ParsedChunk(len(rows), floats, strings, distinct)
+
+
+_DIALECT_PARAMS = ('delimiter', 'doublequote', 'escapechar', 'lineterminator',
+                   'quotechar', 'quoting', 'skipinitialspace')
+
+# The number of bytes at the beginning of the file from which the encoding
+# is determined
+_SNIFF_SIZE = 2 ** 20
+
+
+@lru_cache(maxsize=32)
+def _sniff_csv(filename, size, mtime, delimiters):
+    """
+    Return the encoding and parameters of CSV dialect of an uncompressed
+    file, or `None` if the file cannot be decoded.
+
+    Only the first `_SNIFF_SIZE` bytes of the file must be decodable with
+    the returned encoding; the rest is decoded by the workers that parse
+    it, which fail if it is not. The result is cached for the file's size
+    and modification time (`size` and `mtime` are only used as a part of
+    the key).
+    """
+    with open(filename, 'rb') as file:
+        prefix = file.read(_SNIFF_SIZE)
+
+    def decode(encoding):
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)()
+            # The prefix may end within a multibyte character
+            return decoder.decode(prefix, final=len(prefix) < _SNIFF_SIZE)
+        except (LookupError, UnicodeDecodeError):
+            return None
+
+    for encoding in (lambda: 'us-ascii',
+                     lambda: detect_encoding(filename),
+                     lambda: locale.getpreferredencoding(False),
+                     lambda: sys.getdefaultencoding(),
+                     lambda: 'utf-8'):
+        encoding = encoding()
+        text = encoding and decode(encoding)
+        if text is not None:
+            break
+    else:
+        return None
+
+    try:
+        dialect = csv.Sniffer().sniff(text[:1024], delimiters)
+    except csv.Error:
+        dialect = csv.excel()
+        dialect.delimiter = delimiters[0]
+    dialect.skipinitialspace = True
+    return encoding, tuple((name, getattr(dialect, name))
+                           for name in _DIALECT_PARAMS)
+
+
+def _csv_chunk_bounds(filename, n_chunks, quotechar):
+    """
+    Return a list of byte offsets that split the file into (at most)
+    `n_chunks` ranges of complete rows.
+
+    Ranges end with newlines that are not within quoted values, which is
+    determined from the parity of the count of preceding quote characters.
+    Return `None` if quotes are not balanced, that is, if any appear
+    within unquoted values.
+    """
+    def count(mm, start, end=None):
+        # Count quotes in blocks; mmap has no count and slices are copies
+        end = len(mm) if end is None else end
+        return sum(mm[i:min(i + 2 ** 22, end)].count(quote)
+                   for i in range(start, end, 2 ** 22))
+
+    with open(filename, 'rb') as file:
+        size = path.getsize(filename)
+        if not size:
+            return [0, 0]
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            quote = quotechar.encode('ascii') if quotechar else None
+            bounds = [0]
+            counted, n_quotes = 0, 0
+            for i in range(1, n_chunks):
+                pos = max(bounds[-1], size * i // n_chunks)
+                while True:
+                    pos = mm.find(b'\n', pos)
+                    if pos == -1:
+                        break
+                    pos += 1
+                    if quote is not None:
+                        n_quotes += count(mm, counted, pos)
+                        counted = pos
+                    if not n_quotes % 2:
+                        break
+                if pos == -1 or pos >= size:
+                    break
+                if pos > bounds[-1]:
+                    bounds.append(pos)
+            if quote is not None and (n_quotes + count(mm, counted)) % 2:
+                return None
+            bounds.append(size)
+    return bounds
+
+
+def _parse_csv_range(filename, start, end, encoding, dialect, plan,
+                     chunk_size):
+    """
+    Parse rows in the byte range [`start`, `end`) of a CSV file into a
+    list of :obj:`_ParsedChunk` (or `None`, see :obj:`_parse_rows`).
+
+    This function is run in worker processes of
+    :obj:`CSVReader._read_parallel`.
+    """
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode(encoding)
+    rows = csv.reader(StringIO(text, newline=''), **dict(dialect))
+    rows = (row for row in rows if any(row))
+    return [_parse_rows(chunk, plan)
+            for chunk in iter(lambda: list(islice(rows, chunk_size)), [])] \
+        or [_parse_rows([], plan)]
+
+
 class FileFormatMeta(Registry):
 
     def __new__(cls, name, bases, attrs):
@@ -402,22 +599,9 @@ class FileFormat(metaclass=FileFormatMeta):
 
         return header_rows, data
 
-    @classmethod
-    def data_table(self, data, headers=None):
-        """
-        Return Orange.data.Table given rows of `headers` (iterable of iterable)
-        and rows of `data` (iterable of iterable; if ``numpy.ndarray``, might
-        as well **have it sorted column-major**, e.g. ``order='F'``).
-
-        Basically, the idea of subclasses is to produce those two iterables,
-        however they might.
-
-        If `headers` is not provided, the header rows are extracted from `data`,
-        assuming they precede it.
-        """
-        if not headers:
-            headers, data = self.parse_headers(data)
-
+    @staticmethod
+    def _header_lists(headers):
+        """Return lists of names, types and flags given the header rows"""
         # Consider various header types (single-row, two-row, three-row, none)
         if 3 == len(headers):
             names, types, flags = map(list, headers)
@@ -438,6 +622,25 @@ class FileFormat(metaclass=FileFormatMeta):
                 names, _flags = [], []
             types = [''.join(filter(str.isupper, flag)).lower() for flag in _flags]
             flags = [Flags.join(filter(str.islower, flag)) for flag in _flags]
+        return names, types, flags
+
+    @classmethod
+    def data_table(self, data, headers=None):
+        """
+        Return Orange.data.Table given rows of `headers` (iterable of iterable)
+        and rows of `data` (iterable of iterable; if ``numpy.ndarray``, might
+        as well **have it sorted column-major**, e.g. ``order='F'``).
+
+        Basically, the idea of subclasses is to produce those two iterables,
+        however they might.
+
+        If `headers` is not provided, the header rows are extracted from `data`,
+        assuming they precede it.
+        """
+        if not headers:
+            headers, data = self.parse_headers(data)
+
+        names, types, flags = self._header_lists(headers)
 
         # Determine maximum row length
         rowlen = max(map(len, (names, types, flags)))
@@ -455,15 +658,162 @@ class FileFormat(metaclass=FileFormatMeta):
             rowlen = data.shape[1]
         except IndexError:
             pass
-        else:
-            for lst in (names, types, flags):
-                _equal_length(lst)
+        for lst in (names, types, flags):
+            _equal_length(lst)
+
+        def column_values(col):
+            try:
+                return [np.nan if i in MISSING_VALUES else i
+                        for i in (i.strip() for i in data[:, col])]
+            except IndexError:
+                # No data instances leads here
+                return []
+
+        return self._table_from_columns(names, types, flags, column_values,
+                                        len(data) if data.size else 0,
+                                        len(headers))
+
+    @classmethod
+    def data_table_chunked(cls, data, headers=None,
+                           chunk_size=10000, sample_size=1000):
+        """
+        Return Orange.data.Table like :obj:`data_table`, but without first
+        collecting all values into an array of Python objects.
+
+        The types of columns are inferred from the first `sample_size` rows.
+        Values of columns that appear continuous are then parsed into
+        arrays of floats, `chunk_size` rows at a time, and the remaining
+        columns are kept as lists of strings. The resulting table is the same
+        as the one returned by `data_table`.
+
+        If later rows contradict the inferred types (e.g. a column that seemed
+        continuous contains a non-numeric value), the function returns `None`
+        and the data must be read with `data_table`.
+        """
+        if not headers:
+            headers, data = cls.parse_headers(data)
+
+        names, types, flags = cls._header_lists(headers)
+        rows = (list(row) for row in data if any(row))
+        sample = list(islice(rows, sample_size))
+        plan = cls._column_plan(names, types, flags, sample)
+        chunks = (_parse_rows(chunk, plan)
+                  for chunk in chain([sample], iter(
+                      lambda: list(islice(rows, chunk_size)), [])))
+        return cls._table_from_chunks(names, types, flags, len(headers),
+                                      chunks)
+
+    @staticmethod
+    def _column_plan(names, types, flags, sample):
+        """
+        Decide which columns are parsed as numbers by :obj:`_parse_rows`,
+        given the header lists and a sample of rows.
+
+        The lists of names, types and flags, and the rows in the sample are
+        padded to equal lengths.
+        """
+        rowlen = max(chain(map(len, (names, types, flags)),
+                           map(len, sample)))
+        for lst in chain((names, types, flags), sample):
+            lst.extend([''] * (rowlen - len(lst)))
+
+        # Columns whose type is decided by values are continuous if the
+        # sample looks continuous and all remaining values are numbers that
+        # are not (by `is_discrete_values`) discrete. For the latter check,
+        # chunks keep the sets of (at most DISCRETE_MAX_VALUES) distinct values.
+        nonheuristic_types = set(chain(
+            StringVariable.TYPE_HEADERS, ContinuousVariable.TYPE_HEADERS,
+            TimeVariable.TYPE_HEADERS, DiscreteVariable.TYPE_HEADERS))
+        plan = _ColumnPlan(rowlen)
+        for col in range(rowlen):
+            if Flags(Flags.split(flags[col])).i:
+                continue
+            type_flag = types[col].strip()
+            if type_flag in ContinuousVariable.TYPE_HEADERS:
+                plan.numeric.append(col)
+            elif type_flag not in nonheuristic_types and \
+                    not _RE_DISCRETE_LIST.match(type_flag):
+                values = [np.nan if i in MISSING_VALUES else i
+                          for i in (row[col].strip() for row in sample)]
+                try:
+                    [float(i) for i in values]
+                except ValueError:
+                    plan.raw.append(col)
+                else:
+                    if not values or is_discrete_values(values):
+                        plan.raw.append(col)
+                    else:
+                        plan.numeric.append(col)
+                        plan.heuristic.append(col)
+            else:
+                plan.raw.append(col)
+        return plan
+
+    @classmethod
+    def _table_from_chunks(cls, names, types, flags, n_headers, chunks):
+        """
+        Return Orange.data.Table from chunks parsed by :obj:`_parse_rows`, or
+        `None` if any chunk contradicts the inferred types.
+        """
+        n_rows = 0
+        parsed, raw, distinct = {}, {}, {}
+        for chunk in chunks:
+            if chunk is None:
+                return None
+            n_rows += chunk.n_rows
+            for col, values in chunk.floats.items():
+                parsed.setdefault(col, []).append(values)
+            for col, values in chunk.strings.items():
+                raw.setdefault(col, []).extend(values)
+            for col, values in chunk.distinct.items():
+                if col not in distinct:
+                    distinct[col] = values
+                elif distinct[col] is not None:
+                    if values is None:
+                        distinct[col] = None
+                    else:
+                        distinct[col] |= values
+                        if len(distinct[col]) > DISCRETE_MAX_VALUES:
+                            distinct[col] = None
+
+        for col in list(parsed):
+            values = np.concatenate(parsed.pop(col))
+            col_distinct = distinct.get(col)
+            if col_distinct is not None and \
+                    is_discrete_values(list(col_distinct)):
+                # Few distinct numbers: a discrete column after all;
+                # restore the original strings from the parsed numbers
+                col_distinct -= {np.nan}
+                to_str = {float(i): i for i in col_distinct}
+                if len(to_str) != len(col_distinct):
+                    return None
+                raw[col] = [to_str[i] if i == i else np.nan for i in values]
+            else:
+                parsed[col] = values
+
+        def column_values(col):
+            if col in parsed:
+                return parsed.pop(col)
+            return raw.pop(col, [])
 
+        return cls._table_from_columns(names, types, flags, column_values,
+                                       n_rows, n_headers)
+
+    @classmethod
+    def _table_from_columns(cls, names, types, flags, column_values, n_rows,
+                            n_headers):
+        """
+        Return Orange.data.Table given lists of names, types and flags and
+        function `column_values`, which returns values of the given column
+        as a list of strings, with missing values replaced with `np.nan`,
+        or as an array of floats for columns that are known to be continuous.
+        """
         NAMEGEN = namegen('Feature ', 1)
         Xcols, attrs = [], []
         Mcols, metas = [], []
         Ycols, clses = [], []
         Wcols = []
+        columns = {}
 
         # Rename variables if necessary
         # Reusing across files still works if both files have same duplicates
@@ -477,27 +827,22 @@ class FileFormat(metaclass=FileFormatMeta):
                     names[i] = "{}_{}".format(name, uses[name])
 
         # Iterate through the columns
-        for col in range(rowlen):
+        for col in range(len(names)):
             flag = Flags(Flags.split(flags[col]))
             if flag.i:
                 continue
 
             type_flag = types and types[col].strip()
-            try:
-                orig_values = [np.nan if i in MISSING_VALUES else i
-                               for i in (i.strip() for i in data[:, col])]
-            except IndexError:
-                # No data instances leads here
-                orig_values = []
-                # In this case, coltype could be anything. It's set as-is
-                # only to satisfy test_table.TableTestCase.test_append
-                coltype = DiscreteVariable
-
+            orig_values = column_values(col)
+            coltype = DiscreteVariable
             coltype_kwargs = {}
             valuemap = []
             values = orig_values
 
-            if type_flag in StringVariable.TYPE_HEADERS:
+            if isinstance(orig_values, np.ndarray):
+                coltype = ContinuousVariable
+
+            elif type_flag in StringVariable.TYPE_HEADERS:
                 coltype = StringVariable
             elif type_flag in ContinuousVariable.TYPE_HEADERS:
                 coltype = ContinuousVariable
@@ -510,7 +855,7 @@ class FileFormat(metaclass=FileFormatMeta):
                         except ValueError:
                             break
                     raise ValueError('Non-continuous value in (1-based) '
-                                     'line {}, column {}'.format(row + len(headers) + 1,
+                                     'line {}, column {}'.format(row + n_headers + 1,
                                                                  col + 1))
 
             elif type_flag in TimeVariable.TYPE_HEADERS:
@@ -585,7 +930,7 @@ class FileFormat(metaclass=FileFormatMeta):
                     new_order, old_order = var.values, coltype_kwargs.get('values', var.values)
                     if new_order != old_order:
                         offset = len(new_order)
-                        column = values if data.ndim > 1 else data
+                        column = values
                         column += offset
                         for i, val in enumerate(var.values):
                             try:
@@ -599,23 +944,25 @@ class FileFormat(metaclass=FileFormatMeta):
                 # above, variable var is the correct one
                 values = [var.parse(i) for i in orig_values]
 
-            # Write back the changed data. This is needeed to pass the
-            # correct, converted values into Table.from_numpy below
-            try:
-                data[:, col] = values
-            except IndexError:
-                pass
+            columns[col] = values
 
         domain = Domain(attrs, clses, metas)
 
-        if not data.size:
+        if not n_rows:
             return Table.from_domain(domain, 0)
 
+        def _column_block(cols, dtype):
+            block = np.empty((n_rows, len(cols)), dtype=dtype)
+            for i, col in enumerate(cols):
+                # Release the column as soon as it is copied
+                block[:, i] = columns.pop(col)
+            return block
+
         table = Table.from_numpy(domain,
-                                 data[:, Xcols].astype(float, order='C'),
-                                 data[:, Ycols].astype(float, order='C'),
-                                 data[:, Mcols].astype(object, order='C'),
-                                 data[:, Wcols].astype(float, order='C'))
+                                 _column_block(Xcols, float),
+                                 _column_block(Ycols, float),
+                                 _column_block(Mcols, object),
+                                 _column_block(Wcols, float))
         return table
 
     @staticmethod
@@ -681,13 +1028,50 @@ class CSVReader(FileFormat):
     SUPPORT_COMPRESSED = True
     PRIORITY = 20
 
+    # Smaller files are not worth starting worker processes for
+    PARALLEL_MIN_SIZE = 2 ** 22
+
+    def __init__(self, filename, chunk_size=None, n_jobs=1):
+        """
+        Parameters
+        ----------
+        filename : str
+            name of the file to open
+        chunk_size : int, optional
+            if set, values are parsed in chunks of this many rows, which
+            needs much less memory for large files
+            (see :obj:`FileFormat.data_table_chunked`)
+        n_jobs : int, optional
+            the number of processes for parsing large uncompressed files;
+            -1 uses all processors (see :obj:`_read_parallel`)
+        """
+        super().__init__(filename)
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+
     def read(self):
-        for encoding in (lambda: ('us-ascii', None),                 # fast
-                         lambda: (detect_encoding(self.filename), None),  # precise
-                         lambda: (locale.getpreferredencoding(False), None),
-                         lambda: (sys.getdefaultencoding(), None),   # desperate
-                         lambda: ('utf-8', None),                    # ...
-                         lambda: ('utf-8', 'ignore')):               # fallback
+        n_jobs = cpu_count() if self.n_jobs < 0 else self.n_jobs
+        parallel = n_jobs > 1 and isinstance(self.filename, str) and \
+            not self.filename.endswith(Compression.all) and \
+            path.getsize(self.filename) >= self.PARALLEL_MIN_SIZE
+        if parallel:
+            data = self._read_parallel(n_jobs)
+            if data is not None:
+                data.name = path.splitext(path.split(self.filename)[-1])[0]
+                self.set_table_metadata(self.filename, data)
+                return data
+
+        encodings = (lambda: ('us-ascii', None),                 # fast
+                     lambda: (detect_encoding(self.filename), None),  # precise
+                     lambda: (locale.getpreferredencoding(False), None),
+                     lambda: (sys.getdefaultencoding(), None),   # desperate
+                     lambda: ('utf-8', None),                    # ...
+                     lambda: ('utf-8', 'ignore'))                # fallback
+        sniffed = parallel and self._sniff()
+        if sniffed:
+            # Start with the encoding detected for parallel reading
+            encodings = (lambda: (sniffed[0], None),) + encodings
+        for encoding in encodings:
             encoding, errors = encoding()
             # Clear the error flag for all except the last check, because
             # the error of second-to-last check is stored and shown as warning in owfile
@@ -710,7 +1094,16 @@ class CSVReader(FileFormat):
 
                 try:
                     reader = csv.reader(file, dialect=dialect)
-                    data = self.data_table(reader)
+                    data = None
+                    if self.chunk_size:
+                        data = self.data_table_chunked(
+                            reader, chunk_size=self.chunk_size)
+                        if data is None:
+                            # Types inferred from the first rows were wrong
+                            file.seek(0)
+                            reader = csv.reader(file, dialect=dialect)
+                    if data is None:
+                        data = self.data_table(reader)
 
                     # TODO: Name can be set unconditionally when/if
                     # self.filename will always be a string with the file name.
@@ -732,6 +1125,88 @@ class CSVReader(FileFormat):
                     continue
         raise ValueError('Cannot parse dataset {}: {}'.format(self.filename, error)) from error
 
+    def _read_parallel(self, n_jobs):
+        """
+        Return Orange.data.Table read by `n_jobs` processes, or `None` if the
+        file cannot be read in parallel.
+
+        The file is split into ranges of rows at newlines outside quoted
+        values; the ranges are parsed in a process pool, as planned from the
+        header and the first rows (see :obj:`data_table_chunked`), and the
+        parsed columns are then concatenated. The file's encoding and dialect
+        are detected only once and cached.
+
+        When rows contradict the plan, or the file's quotes or its encoding
+        prevent splitting it, the caller reads the file sequentially, which
+        also provides the proper error messages.
+        """
+        filename = self.filename
+        sniffed = self._sniff()
+        if sniffed is None:
+            return None
+        encoding, dialect = sniffed
+        dialect_params = dict(dialect)
+        if dialect_params['escapechar'] or \
+                '\n"'.encode(encoding) != b'\n"':
+            return None
+
+        class Lines:
+            # Decoded lines of the file that count the bytes read
+            def __init__(self, file):
+                self.file, self.read = file, 0
+
+            def __iter__(self):
+                for line in self.file:
+                    self.read += len(line)
+                    yield line.decode(encoding)
+
+        sample_size = 1000
+        with open(filename, 'rb') as file:
+            try:
+                headers, _ = self.parse_headers(
+                    csv.reader(Lines(file), **dialect_params))
+                file.seek(0)
+                lines = Lines(file)
+                rows = csv.reader(lines, **dialect_params)
+                for _ in islice(rows, len(headers)):
+                    pass
+                header_end = lines.read
+                sample = list(islice((list(row) for row in rows if any(row)),
+                                     sample_size))
+            except (csv.Error, UnicodeDecodeError):
+                return None
+
+        names, types, flags = self._header_lists(headers)
+        plan = self._column_plan(names, types, flags, sample)
+        bounds = _csv_chunk_bounds(filename, 2 * n_jobs,
+                                   dialect_params['quotechar']
+                                   if dialect_params['quoting'] != csv.QUOTE_NONE
+                                   else None)
+        if bounds is None:
+            return None
+        bounds = [header_end] + [b for b in bounds if b > header_end]
+        chunk_size = self.chunk_size or 10000
+
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [executor.submit(_parse_csv_range, filename, start, end,
+                                       encoding, dialect, plan, chunk_size)
+                       for start, end in zip(bounds, bounds[1:])]
+            try:
+                chunks = [chunk for future in futures
+                          for chunk in future.result()]
+            except (csv.Error, UnicodeDecodeError):
+                return None
+        return self._table_from_chunks(names, types, flags, len(headers),
+                                       chunks)
+
+    def _sniff(self):
+        """Return the (cached) encoding and dialect of the file, as
+        detected by :obj:`_sniff_csv`"""
+        file_stat = stat(self.filename)
+        return _sniff_csv(self.filename, file_stat.st_size, file_stat.st_mtime,
+                          self.DELIMITERS)
+
     @classmethod
     def write_file(cls, filename, data):
         with cls.open(filename, mode='wt', newline='', encoding='utf-8') as file:
@@ -764,6 +1239,235 @@ class PickleReader(FileFormat):
             pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
 
 
+class BinaryReader(FileFormat):
+    """Reader for Orange's binary columnar format.
+
+    The file starts with a signature and the offset of the header. The
+    header is a utf-8 encoded JSON object, preceded by its size as an 8-byte
+    little-endian integer; it describes the domain and the layout of the
+    arrays. Dense arrays are stored column by column at aligned offsets, so
+    the reader can map them into memory with `np.memmap` and the data is
+    paged in only when columns are accessed. The loaded arrays are thus in
+    Fortran (column-major) order; use `np.ascontiguousarray` where rows
+    need to be contiguous. String columns are stored as offsets into a blob
+    of utf-8 encoded values, with codes of missing values; since metas are
+    arrays of Python objects, strings are decoded when the file is read.
+    """
+    EXTENSIONS = ('.orb',)
+    DESCRIPTION = 'Orange binary columnar file'
+
+    SIGNATURE = b'ORANGEB2'
+    ALIGNMENT = 64
+
+    VARIABLE_TYPES = {cls.__name__: cls for cls in (
+        ContinuousVariable, DiscreteVariable, StringVariable, TimeVariable)}
+
+    # Codes of missing values in string columns
+    STRING_PRESENT, STRING_NONE, STRING_NAN = 0, 1, 2
+
+    def read(self):
+        with open(self.filename, 'rb') as f:
+            if f.read(len(self.SIGNATURE)) != self.SIGNATURE:
+                raise ValueError('{} is not an Orange binary file'
+                                 .format(self.filename))
+            header_offset, = struct.unpack('<Q', f.read(8))
+            f.seek(header_offset)
+            header_size, = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_size).decode('utf-8'))
+
+        # Copy-on-write mapping: tables can be modified in memory without
+        # changing the file
+        buffer = np.memmap(self.filename, dtype=np.uint8, mode='c')
+        table = Table()
+        parts = [self._variables_from_descs(descs)
+                 for descs in header['domain']]
+        table.domain = Domain(*(variables for variables, _ in parts))
+        table.X = self._load_block(buffer, header['X'])
+        table._Y = self._load_block(buffer, header['Y'])
+        table.metas = self._load_block(buffer, header['metas'])
+        table.W = self._load_block(buffer, header['W'])
+        for arr, (_, recodings) in zip((table.X, table._Y, table.metas),
+                                       parts):
+            for col, lookup in recodings:
+                self._recode(arr, col, lookup)
+        Table._init_ids(table)
+        table.attributes = header['attributes']
+        table.name = path.splitext(path.split(self.filename)[-1])[0]
+        return table
+
+    @classmethod
+    def _variables_from_descs(cls, descs):
+        """
+        Return a list of variables described by `descs` and a list of
+        tuples (column, lookup) for discrete columns whose values have to
+        be recoded to match the order of values in existing variables.
+        """
+        variables, recodings = [], []
+        for col, desc in enumerate(descs):
+            var_type = cls.VARIABLE_TYPES.get(desc['type'])
+            if var_type is None:
+                raise ValueError('Invalid variable type {}'
+                                 .format(desc['type']))
+            if var_type is DiscreteVariable:
+                values = desc['values']
+                var = var_type.make(desc['name'], values, desc['ordered'],
+                                    desc['base_value'])
+                if var.values != values:
+                    recodings.append(
+                        (col, np.array([var.values.index(value)
+                                        for value in values], dtype=float)))
+            else:
+                var = var_type.make(desc['name'])
+                if var_type is not StringVariable:
+                    var.number_of_decimals = desc['number_of_decimals']
+                if var_type is TimeVariable:
+                    var.have_date = desc['have_date']
+                    var.have_time = desc['have_time']
+            var.attributes.update(desc['attributes'])
+            variables.append(var)
+        return variables, recodings
+
+    @classmethod
+    def _recode(cls, arr, col, lookup):
+        if sp.issparse(arr) and lookup[0] != 0:
+            # Implicit zeros change as well, so the column is set anew
+            column = arr[:, col].toarray().ravel()
+            cls._recode(column, 0, lookup)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', sp.SparseEfficiencyWarning)
+                arr[:, col] = column[:, None]
+            return
+        if sp.issparse(arr):
+            values = arr.data
+            positions = np.flatnonzero(arr.indices == col)
+        else:
+            values = arr[:, col] if arr.ndim == 2 else arr
+            positions = np.arange(len(values))
+        codes = values[positions]
+        known = ~np.isnan(codes)
+        positions, codes = positions[known], codes[known]
+        recoded = lookup[codes.astype(int)]
+        # Only values that change are written, so pages of the copy-on-write
+        # mapping that need no recoding are not copied
+        changed = recoded != codes
+        values[positions[changed]] = recoded[changed]
+
+    @classmethod
+    def _load_block(cls, buffer, desc):
+        kind = desc['kind']
+        if kind == 'dense':
+            dtype = np.dtype(desc['dtype'])
+            shape = tuple(desc['shape'])
+            size = int(np.prod(shape)) * dtype.itemsize
+            if not size:
+                return np.empty(shape, dtype)
+            offset = desc['offset']
+            return np.asarray(buffer[offset:offset + size]).view(dtype) \
+                .reshape(shape, order='F')
+        if kind == 'csr':
+            return sp.csr_matrix(
+                tuple(cls._load_block(buffer, desc[part])
+                      for part in ('data', 'indices', 'indptr')),
+                shape=tuple(desc['shape']), copy=False)
+        if kind == 'strings':
+            offsets = cls._load_block(buffer, desc['offsets'])
+            missing = cls._load_block(buffer, desc['missing'])
+            blob = cls._load_block(buffer, desc['blob']).tobytes()
+            col = np.array([blob[start:end].decode('utf-8')
+                            for start, end in zip(offsets, offsets[1:])],
+                           dtype=object)
+            col[missing == cls.STRING_NONE] = None
+            col[missing == cls.STRING_NAN] = np.nan
+            return col
+        if kind == 'columns':
+            arr = np.empty(tuple(desc['shape']), dtype=object)
+            for i, column in enumerate(desc['columns']):
+                arr[:, i] = cls._load_block(buffer, column)
+            return arr
+        raise ValueError('Invalid block type {}'.format(kind))
+
+    @classmethod
+    def write_file(cls, filename, data):
+        domain = data.domain
+        with open(filename, 'wb') as f:
+            f.write(cls.SIGNATURE)
+            f.write(struct.pack('<Q', 0))
+            header = dict(
+                domain=[[cls._variable_desc(var) for var in part]
+                        for part in (domain.attributes, domain.class_vars,
+                                     domain.metas)],
+                attributes=getattr(data, 'attributes', {}),
+                X=cls._write_block(f, data.X),
+                Y=cls._write_block(f, data._Y),
+                metas=cls._write_metas(f, data.metas, domain.metas),
+                W=cls._write_block(f, data.W))
+            # Values that JSON cannot represent are stored as strings, like
+            # in text formats
+            header = json.dumps(header, default=str).encode('utf-8')
+            header_offset = f.tell()
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            f.seek(len(cls.SIGNATURE))
+            f.write(struct.pack('<Q', header_offset))
+
+    @staticmethod
+    def _variable_desc(var):
+        desc = dict(type=type(var).__name__, name=var.name,
+                    attributes=var.attributes)
+        if var.is_discrete:
+            desc.update(values=list(var.values), ordered=var.ordered,
+                        base_value=var.base_value)
+        elif var.is_continuous:
+            desc.update(number_of_decimals=var.number_of_decimals)
+            if isinstance(var, TimeVariable):
+                desc.update(have_date=var.have_date, have_time=var.have_time)
+        return desc
+
+    @classmethod
+    def _write_block(cls, f, arr):
+        if sp.issparse(arr):
+            arr = arr.tocsr()
+            desc = dict(kind='csr', shape=arr.shape)
+            for part in ('data', 'indices', 'indptr'):
+                desc[part] = cls._write_block(f, getattr(arr, part))
+            return desc
+        pos = f.tell()
+        offset = pos + -pos % cls.ALIGNMENT
+        f.seek(offset)
+        # Write column by column to avoid copying the entire array
+        for col in (arr.T if arr.ndim == 2 else [arr]):
+            f.write(np.ascontiguousarray(col).tobytes())
+        return dict(kind='dense', dtype=arr.dtype.str, shape=arr.shape,
+                    offset=offset)
+
+    @classmethod
+    def _write_metas(cls, f, metas, variables):
+        if sp.issparse(metas) or metas.dtype != object:
+            return cls._write_block(f, metas)
+        return dict(kind='columns', shape=metas.shape,
+                    columns=[cls._write_strings(f, col) if var.is_string
+                             else cls._write_block(f, col.astype(float))
+                             for col, var in zip(metas.T, variables)])
+
+    @classmethod
+    def _write_strings(cls, f, col):
+        missing = np.array(
+            [cls.STRING_NONE if val is None else
+             cls.STRING_NAN if isinstance(val, float) and isnan(val) else
+             cls.STRING_PRESENT
+             for val in col], dtype=np.uint8)
+        encoded = [b'' if code else str(val).encode('utf-8')
+                   for val, code in zip(col, missing)]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(val) for val in encoded], out=offsets[1:])
+        return dict(
+            kind='strings',
+            offsets=cls._write_block(f, offsets),
+            missing=cls._write_block(f, missing),
+            blob=cls._write_block(
+                f, np.frombuffer(b''.join(encoded), dtype=np.uint8)))
+
+
 class BasketReader(FileFormat):
     """Reader for basket (sparse) files"""
     EXTENSIONS = ('.basket', '.bsk')
@@ -1,10 +1,15 @@
 import logging
+import sys
+from collections import deque, namedtuple, defaultdict
 from contextlib import contextmanager
 
+from Orange.misc.cache import LRUCache
 from Orange.util import Registry
 
 log = logging.getLogger(__name__)
 
+QueryRecord = namedtuple("QueryRecord", "query time cached caller")
+
 
 class BackendError(Exception):
     pass
@@ -18,12 +23,77 @@ class Backend(metaclass=Registry):
     ----------
     connection_params: dict
         connection params
+
+    Attributes
+    ----------
+    query_cache: LRUCache or None
+        results of queries executed through `fetch_cached`, if caching
+        is enabled (see `enable_query_cache`)
+    query_log: deque
+        `QueryRecord`s of the most recently executed queries
     """
 
     display_name = ""
 
+    # Defaults for the cache of query results (see enable_query_cache): it
+    # is bounded by the total number of rows and results expire after the
+    # given number of seconds
+    query_cache_size = 100000
+    query_cache_ttl = 300
+    query_log_size = 1000
+
+    # Templates of aggregates that compute basic statistics of a field;
+    # see SqlTable._get_stats
+    DISCRETE_STATS = "SUM(CASE TRUE WHEN %(field_name)s IS NULL THEN 1 " \
+                     "ELSE 0 END), " \
+                     "SUM(CASE TRUE WHEN %(field_name)s IS NULL THEN 0 " \
+                     "ELSE 1 END)"
+    CONTINUOUS_STATS = "MIN(%(field_name)s)::double precision, " \
+                       "MAX(%(field_name)s)::double precision, " \
+                       "AVG(%(field_name)s)::double precision, " \
+                       "STDDEV(%(field_name)s)::double precision, " \
+                       + DISCRETE_STATS
+    # Numbers rows from 1 on, in the order in which they are returned by a
+    # query without ORDER BY
+    ROW_NUMBER = "ROW_NUMBER() OVER ()"
+
     def __init__(self, connection_params):
         self.connection_params = connection_params
+        self.query_cache = None
+        self.query_log = deque(maxlen=self.query_log_size)
+
+    def enable_query_cache(self, max_rows=None, ttl=None):
+        """Cache the results of queries executed through `fetch_cached`.
+
+        Cached results are not refreshed when the data in the database
+        changes; call `clear_query_cache` when it does.
+
+        Parameters
+        ----------
+        max_rows : Optional[int]
+            the maximal total number of cached rows
+            (default: `query_cache_size`)
+        ttl : Optional[float]
+            the number of seconds after which results expire
+            (default: `query_cache_ttl`)
+
+        Returns
+        -------
+        the cache (LRUCache)
+        """
+        self.query_cache = LRUCache(
+            max_rows or self.query_cache_size, size_of=len,
+            ttl=self.query_cache_ttl if ttl is None else ttl)
+        return self.query_cache
+
+    def disable_query_cache(self):
+        """Stop caching query results and free the cache."""
+        self.query_cache = None
+
+    def clear_query_cache(self):
+        """Discard cached query results, if caching is enabled."""
+        if self.query_cache is not None:
+            self.query_cache.clear()
 
     @classmethod
     def available_backends(cls):
@@ -143,6 +213,28 @@ class Backend(metaclass=Registry):
         """
         raise NotImplementedError
 
+    def sample_table_query(self, table_name, method, parameter):
+        """Return a query that selects a sample of rows from table.
+
+        Parameters
+        ----------
+        table_name : str
+        method : str
+            'system' to sample the given percentage of rows or
+            'system_time' to sample rows for the given number of
+            milliseconds
+        parameter : str
+            percentage or time limit, depending on the method
+
+        Returns
+        -------
+        string containing sql query
+
+        Raises NotImplementedError if the backend cannot sample with the
+        given method.
+        """
+        raise NotImplementedError
+
     # query related methods
 
     def create_sql_query(
@@ -191,6 +283,71 @@ class Backend(metaclass=Registry):
         """
         raise NotImplementedError
 
+    def fetch_cached(self, query):
+        """Return all rows returned by the query.
+
+        If caching is enabled (see `enable_query_cache`), rows are stored
+        in `query_cache`, so repeated queries with the same text (up to
+        whitespace) do not reach the database until the result expires.
+        Use for aggregates, which are small and costly.
+
+        Parameters
+        ----------
+        query : string
+            query to be executed
+
+        Returns
+        -------
+        list of rows
+        """
+        if self.query_cache is None:
+            with self.execute_sql_query(query) as cur:
+                return cur.fetchall()
+        key = " ".join(query.split())
+        rows = self.query_cache.get(key)
+        if rows is None:
+            with self.execute_sql_query(query) as cur:
+                rows = cur.fetchall()
+            self.query_cache.put(key, rows)
+        else:
+            self.record_query(query, 0, cached=True)
+        return rows
+
+    def record_query(self, query, elapsed, cached=False):
+        """Add the query to `query_log`. Backends call this from
+        `execute_sql_query`.
+
+        Parameters
+        ----------
+        query : string
+            executed query
+        elapsed : float
+            time in seconds needed to execute the query and fetch results
+        cached : bool
+            True if the result was taken from the cache
+        """
+        self.query_log.append(
+            QueryRecord(query, elapsed, cached, _query_caller()))
+
+    def query_stats(self):
+        """Return the number of executions, the number of cache hits and
+        the total time of queries in `query_log`, summed by the module
+        that issued them and the query.
+
+        Returns
+        -------
+        list of tuples (caller, query, count, cached, time), sorted by
+        decreasing time
+        """
+        stats = defaultdict(lambda: [0, 0, 0.])
+        for record in list(self.query_log):
+            entry = stats[(record.caller, " ".join(record.query.split()))]
+            entry[0] += 1
+            entry[1] += record.cached
+            entry[2] += record.time
+        return sorted((key + tuple(value) for key, value in stats.items()),
+                      key=lambda stat: -stat[4])
+
     def quote_identifier(self, name):
         """Quote identifier name so it can be safely used in queries
 
@@ -220,6 +377,29 @@ class Backend(metaclass=Registry):
         """
         raise NotImplementedError
 
+    def __getstate__(self):
+        # Drop the cache and the log; the lock in the cache cannot be pickled.
+        # Unpickled backends do not cache query results.
+        state = dict(self.__dict__)
+        state.pop('query_cache', None)
+        state.pop('query_log', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.query_cache = None
+        self.query_log = deque(maxlen=self.query_log_size)
+
+
+def _query_caller():
+    """Return the name of the module that issued the query, skipping the
+    modules that compute statistics on behalf of others."""
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_globals.get("__name__", "").startswith(
+            ("Orange.data", "Orange.statistics", "contextlib")):
+        frame = frame.f_back
+    return frame.f_globals.get("__name__") if frame is not None else None
+
 
 class TableDesc:
     def __init__(self, name, schema, sql):
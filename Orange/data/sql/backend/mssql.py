@@ -1,4 +1,5 @@
 from contextlib import contextmanager
+from time import time
 
 import pymssql
 
@@ -10,6 +11,8 @@ from Orange.data.sql.backend.base import ToSql, BackendError
 class PymssqlBackend(Backend):
     display_name = "SQL Server"
 
+    ROW_NUMBER = "ROW_NUMBER() OVER (ORDER BY (SELECT NULL))"
+
     def __init__(self, connection_params):
         connection_params["server"] = connection_params.pop("host", None)
 
@@ -69,8 +72,10 @@ class PymssqlBackend(Backend):
         print(query)
         try:
             with self.connection.cursor() as cur:
+                t = time()
                 cur.execute(query, *params)
                 yield cur
+                self.record_query(query, time() - t)
         finally:
             self.connection.commit()
 
@@ -68,6 +68,10 @@ class Psycopg2Backend(Backend):
             sql.extend(["LIMIT", str(limit)])
         return " ".join(sql)
 
+    def sample_table_query(self, table_name, method, parameter):
+        return "SELECT * FROM {} TABLESAMPLE {}({})".format(
+            table_name, method, parameter)
+
     @contextmanager
     def execute_sql_query(self, query, params=None):
         connection = self.connection_pool.getconn()
@@ -78,7 +82,9 @@ class Psycopg2Backend(Backend):
             t = time()
             cur.execute(query, params)
             yield cur
-            log.info("%.2f ms: %s", 1000 * (time() - t), utfquery)
+            elapsed = time() - t
+            log.info("%.2f ms: %s", 1000 * elapsed, utfquery)
+            self.record_query(utfquery, elapsed)
         finally:
             connection.commit()
             self.connection_pool.putconn(connection)
@@ -176,12 +182,12 @@ class Psycopg2Backend(Backend):
 
     def __getstate__(self):
         # Drop connection_pool from state as it cannot be pickled
-        state = dict(self.__dict__)
+        state = super().__getstate__()
         state.pop('connection_pool', None)
         return state
 
     def __setstate__(self, state):
         # Create a new connection pool if none exists
-        self.__dict__.update(state)
+        super().__setstate__(state)
         if self.connection_pool is None:
             self._create_connection_pool()
@@ -0,0 +1,251 @@
+import logging
+import math
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from time import time
+from urllib.request import pathname2url
+
+from Orange.data import ContinuousVariable, DiscreteVariable, StringVariable, TimeVariable
+from Orange.data.sql.backend.base import Backend, ToSql, BackendError
+
+log = logging.getLogger(__name__)
+
+
+def _sqrt(value):
+    # Variances computed from sums of squares can be slightly negative
+    return None if value is None else math.sqrt(max(value, 0))
+
+
+class SqliteBackend(Backend):
+    """Backend for accessing data stored in a SQLite database file
+
+    The name of the file is given as the `database` connection parameter;
+    the file must exist. Each thread uses its own connection to the file.
+    """
+
+    display_name = "SQLite"
+
+    DISCRETE_STATS = "SUM(%(field_name)s IS NULL), " \
+                     "COUNT(%(field_name)s)"
+    # SQLite has no STDDEV; compute the sample standard deviation from sums
+    CONTINUOUS_STATS = "MIN(%(field_name)s), " \
+                       "MAX(%(field_name)s), " \
+                       "AVG(%(field_name)s), " \
+                       "SQRT((SUM((%(field_name)s) * (%(field_name)s)) - " \
+                       "SUM(%(field_name)s) * AVG(%(field_name)s)) / " \
+                       "(COUNT(%(field_name)s) - 1)), " \
+                       + DISCRETE_STATS
+
+    def __init__(self, connection_params):
+        super().__init__(connection_params)
+        if connection_params.get("host"):
+            raise BackendError("SQLite databases are local files")
+        if not connection_params.get("database"):
+            raise BackendError("Database file is not given")
+        self.local = threading.local()
+        self._connection()
+
+    def _connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            uri = "file:{}?mode=rw".format(
+                pathname2url(self.connection_params["database"]))
+            try:
+                connection = sqlite3.connect(uri, uri=True)
+            except sqlite3.Error as ex:
+                raise BackendError(str(ex)) from ex
+            connection.create_function("SQRT", 1, _sqrt)
+            # filters lower the operands when matching case-insensitively,
+            # so LIKE must match case as it does in other databases
+            connection.execute("PRAGMA case_sensitive_like = ON")
+            self.local.connection = connection
+        return connection
+
+    def list_tables_query(self, schema=None):
+        return """SELECT NULL, name
+                    FROM sqlite_master
+                   WHERE type IN ('table', 'view')
+                     AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'
+                     AND name NOT LIKE '\\_\\_%' ESCAPE '\\'
+                ORDER BY name"""
+
+    def create_sql_query(self, table_name, fields, filters=(),
+                         group_by=None, order_by=None,
+                         offset=None, limit=None,
+                         use_time_sample=None):
+        # SQLite cannot sample; use_time_sample is ignored and queries run
+        # on the whole table
+        sql = ["SELECT", ', '.join(fields),
+               "FROM", table_name]
+        if filters:
+            sql.extend(["WHERE", " AND ".join(filters)])
+        if group_by is not None:
+            sql.extend(["GROUP BY", ", ".join(group_by)])
+        if order_by is not None:
+            sql.extend(["ORDER BY", ",".join(order_by)])
+        if limit is not None:
+            sql.extend(["LIMIT", str(limit)])
+        elif offset is not None:
+            sql.extend(["LIMIT", "-1"])
+        if offset is not None:
+            sql.extend(["OFFSET", str(offset)])
+        return " ".join(sql)
+
+    def sample_table_query(self, table_name, method, parameter):
+        if method != "system":
+            raise NotImplementedError(
+                "SQLite supports only sampling of a percentage of rows")
+        # random() is uniform over 64-bit integers
+        return "SELECT * FROM {} " \
+               "WHERE random() / 18446744073709551616.0 + 0.5 < {} / 100.0" \
+               .format(table_name, float(parameter))
+
+    @contextmanager
+    def execute_sql_query(self, query, params=None):
+        connection = self._connection()
+        cur = connection.cursor()
+        try:
+            log.debug("Executing: %s", query)
+            t = time()
+            cur.execute(query, params or ())
+            yield cur
+            elapsed = time() - t
+            log.info("%.2f ms: %s", 1000 * elapsed, query)
+            self.record_query(query, elapsed)
+        except sqlite3.Error as ex:
+            raise BackendError(str(ex)) from ex
+        finally:
+            cur.close()
+            connection.commit()
+
+    def quote_identifier(self, name):
+        return '"%s"' % name.replace('"', '""')
+
+    def unquote_identifier(self, quoted_name):
+        if quoted_name.startswith('"'):
+            return quoted_name[1:len(quoted_name) - 1].replace('""', '"')
+        else:
+            return quoted_name
+
+    def get_fields(self, table_name):
+        query = self.create_sql_query(table_name, ["*"], limit=0)
+        with self.execute_sql_query(query) as cur:
+            names = [d[0] for d in cur.description]
+
+        # Declared types are known for tables and views; for columns of
+        # queries, the storage class of the first defined value is used
+        declared = {}
+        if table_name.startswith('"') and table_name.endswith('"'):
+            query = "PRAGMA table_info({})".format(table_name)
+            with self.execute_sql_query(query) as cur:
+                declared = {row[1]: row[2].upper() for row in cur.fetchall()}
+
+        fields = []
+        for name in names:
+            type_name = declared.get(name)
+            if not type_name:
+                field_name_q = self.quote_identifier(name)
+                query = self.create_sql_query(
+                    table_name, ["typeof(%s)" % field_name_q],
+                    filters=["%s IS NOT NULL" % field_name_q], limit=1)
+                with self.execute_sql_query(query) as cur:
+                    row = cur.fetchone()
+                type_name = row[0].upper() if row is not None else ""
+            fields.append((name, type_name))
+        return fields
+
+    def get_distinct_values(self, field_name, table_name):
+        field_name_q = self.quote_identifier(field_name)
+        query = self.create_sql_query(
+            table_name, ["CAST(%s AS TEXT)" % field_name_q],
+            filters=["%s IS NOT NULL" % field_name_q],
+            group_by=[field_name_q], order_by=[field_name_q], limit=21)
+        with self.execute_sql_query(query) as cur:
+            values = cur.fetchall()
+        if len(values) > 20:
+            return ()
+        else:
+            return tuple(x[0] for x in values)
+
+    def create_variable(self, field_name, field_metadata,
+                        type_hints, inspect_table=None):
+        if field_name in type_hints:
+            var = type_hints[field_name]
+        else:
+            var = self._guess_variable(field_name, field_metadata,
+                                       inspect_table)
+
+        field_name_q = self.quote_identifier(field_name)
+        if var.is_continuous:
+            if isinstance(var, TimeVariable):
+                var.to_sql = ToSql("((julianday({}) - 2440587.5) * 86400.0)"
+                                   .format(field_name_q))
+            else:
+                var.to_sql = ToSql("CAST({} AS REAL)".format(field_name_q))
+        else:  # discrete or string
+            var.to_sql = ToSql("CAST({} AS TEXT)".format(field_name_q))
+        return var
+
+    def _guess_variable(self, field_name, field_metadata, inspect_table):
+        # Type affinities, as determined by SQLite from declared types
+        type_name = field_metadata[0]
+
+        if "INT" in type_name:
+            if inspect_table:
+                values = self.get_distinct_values(field_name, inspect_table)
+                if values:
+                    return DiscreteVariable(field_name, values)
+            return ContinuousVariable(field_name)
+
+        if any(t in type_name for t in ("CHAR", "CLOB", "TEXT")):
+            if inspect_table:
+                values = self.get_distinct_values(field_name, inspect_table)
+                if values:
+                    return DiscreteVariable(field_name, values)
+            return StringVariable(field_name)
+
+        if "DATE" in type_name or "TIME" in type_name:
+            tv = TimeVariable(field_name)
+            tv.have_date |= "DATE" in type_name or "TIMESTAMP" in type_name
+            tv.have_time |= "TIME" in type_name
+            return tv
+
+        if type_name and "BLOB" not in type_name:  # real or numeric
+            return ContinuousVariable(field_name)
+
+        return StringVariable(field_name)
+
+    def count_approx(self, query):
+        # Row counts are known only for whole tables: from the statistics
+        # gathered by ANALYZE or, if there are none, from the largest rowid
+        match = re.fullmatch(r'SELECT \* FROM ("(?:[^"]|"")+")', query)
+        if match is None:
+            raise NotImplementedError
+        table_name = match.group(1)
+        try:
+            with self.execute_sql_query(
+                    "SELECT stat FROM sqlite_stat1 WHERE tbl = ?",
+                    (self.unquote_identifier(table_name),)) as cur:
+                row = cur.fetchone()
+            if row is not None:
+                return int(row[0].split()[0])
+        except BackendError:  # there are no statistics
+            pass
+        try:
+            with self.execute_sql_query(
+                    "SELECT MAX(_rowid_) FROM " + table_name) as cur:
+                return cur.fetchone()[0] or 0
+        except BackendError:  # not a rowid table
+            raise NotImplementedError
+
+    def __getstate__(self):
+        # Drop connections from state as they cannot be pickled
+        state = super().__getstate__()
+        state.pop('local', None)
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.local = threading.local()
@@ -6,7 +6,6 @@ import logging
 import threading
 import warnings
 from contextlib import contextmanager
-from itertools import islice
 from time import strftime
 
 import numpy as np
@@ -20,6 +19,10 @@ from Orange.misc import import_late_warning
 LARGE_TABLE = 100000
 AUTO_DL_LIMIT = 10000
 DEFAULT_SAMPLE_TIME = 1
+FETCH_BATCH_SIZE = 10000
+# Rows with requested indices are picked from the range they span if they
+# make at least 1/DENSE_ROWS_FACTOR of it
+DENSE_ROWS_FACTOR = 2
 sql_log = logging.getLogger('sql_log')
 sql_log.debug("Logging started: {}".format(strftime("%Y-%m-%d %H:%M:%S")))
 
@@ -129,6 +132,9 @@ class SqlTable(Table):
         If a single row is requested, it is fetched from the database and
         returned as a SqlRowInstance.
 
+        If rows are given by a slice, a sequence of indices or a boolean
+        mask, only these rows are fetched and returned as a Table.
+
         A new SqlTable with appropriate filters is constructed and returned
         otherwise.
         """
@@ -155,14 +161,10 @@ class SqlTable(Table):
             except TypeError:
                 pass
 
-        elif not (row_idx is Ellipsis or row_idx == slice(None)):
-            # TODO if row_idx specify multiple rows, one of the following must
-            # happen
-            #  - the new table remembers which rows are selected (implement
-            #     table.limit_rows and whatever else is necessary)
-            #  - return an ordinary (non-SQL) Table
-            #  - raise an exception
-            raise NotImplementedError("Row indices must be integers.")
+        elif not (row_idx is Ellipsis or
+                  isinstance(row_idx, slice) and row_idx == slice(None)):
+            return self._fetch_rows(self.domain.select_columns(col_idx),
+                                    row_idx)
 
         # multiple rows OR single row but multiple columns:
         # construct a new table
@@ -181,6 +183,43 @@ class SqlTable(Table):
                 row_index, self.name))
         return SqlRowInstance(self.domain, values[0])
 
+    def _fetch_rows(self, domain, row_indices):
+        """Fetch the rows with the given indices and return them as a
+        Table with the given domain."""
+        if isinstance(row_indices, slice):
+            row_indices = range(*row_indices.indices(len(self)))
+        row_indices = np.asarray(row_indices)
+        if row_indices.dtype == bool:
+            row_indices = np.flatnonzero(row_indices)
+        elif row_indices.size == 0:
+            row_indices = row_indices.astype(int)
+        elif row_indices.dtype.kind not in "iu":
+            raise IndexError("Row indices must be integers.")
+        row_indices = row_indices.ravel()
+        if row_indices.size:
+            n_rows = len(self)
+            if row_indices.min() < -n_rows or row_indices.max() >= n_rows:
+                raise IndexError("Row index out of range")
+            row_indices = np.where(row_indices < 0,
+                                   row_indices + n_rows, row_indices)
+
+        attributes = domain.variables + domain.metas
+        rows = [row for batch in self._query_batches(attributes,
+                                                     rows=row_indices)
+                for row in batch]
+        if len(rows) < len(row_indices):
+            raise IndexError("Row index out of range")
+
+        columns = list(zip(*rows)) or [()] * len(attributes)
+        n_attrs, n_vars = len(domain.attributes), len(domain.variables)
+        values = np.empty((len(rows), n_vars))
+        for i, (var, column) in enumerate(zip(domain.variables, columns)):
+            values[:, i] = _column_decoder(var)(column)
+        metas = np.array(columns[n_vars:], dtype=object).T \
+            .reshape(len(rows), len(domain.metas))
+        return Table.from_numpy(domain, values[:, :n_attrs],
+                                values[:, n_attrs:], metas)
+
     def __iter__(self):
         """ Iterating through the rows executes the query using a cursor and
         then yields resulting rows as SqlRowInstances as they are requested.
@@ -191,6 +230,13 @@ class SqlTable(Table):
             yield SqlRowInstance(self.domain, row)
 
     def _query(self, attributes=None, filters=(), rows=None):
+        for batch in self._query_batches(attributes, filters, rows):
+            yield from batch
+
+    def _query_batches(self, attributes=None, filters=(), rows=None,
+                       batch_size=None):
+        """Execute the query and yield lists of (at most `batch_size`,
+        by default `FETCH_BATCH_SIZE`) resulting rows."""
         if attributes is not None:
             fields = []
             for attr in attributes:
@@ -204,6 +250,7 @@ class SqlTable(Table):
             fields = ["*"]
 
         filters = [f.to_sql() for f in filters]
+        batch_size = batch_size or FETCH_BATCH_SIZE
 
         offset = limit = None
         if rows is not None:
@@ -212,18 +259,70 @@ class SqlTable(Table):
                 if rows.stop is not None:
                     limit = rows.stop - offset
             else:
-                rows = list(rows)
-                offset, stop = min(rows), max(rows)
-                limit = stop - offset + 1
+                yield from self._query_rows(fields, filters, rows, batch_size)
+                return
 
-        # TODO: this returns all rows between min(rows) and max(rows): fix!
         query = self._sql_query(fields, filters, offset=offset, limit=limit)
         with self.backend.execute_sql_query(query) as cur:
             while True:
-                row = cur.fetchone()
-                if row is None:
+                batch = cur.fetchmany(batch_size)
+                if not batch:
                     break
-                yield row
+                yield batch
+
+    def _query_rows(self, fields, filters, rows, batch_size):
+        """Yield lists of rows with the given indices, in the given order.
+        Indices that are out of range are skipped.
+
+        If the requested rows are dense within the range they span, the
+        range is fetched and the other rows are dropped. Otherwise the rows
+        are numbered on the server and only the requested are fetched."""
+        rows = np.asarray(rows, dtype=int).ravel()
+        if not len(rows):
+            return
+        unique = np.unique(rows)
+        start, stop = unique[0], unique[-1] + 1
+        fetched = {}
+        if len(unique) * DENSE_ROWS_FACTOR >= stop - start:
+            requested = np.zeros(stop - start, dtype=bool)
+            requested[unique - start] = True
+            query = self._sql_query(fields, filters,
+                                    offset=start, limit=stop - start)
+            with self.backend.execute_sql_query(query) as cur:
+                index = start
+                for batch in iter(lambda: cur.fetchmany(batch_size), []):
+                    for row in batch:
+                        if requested[index - start]:
+                            fetched[index] = row
+                        index += 1
+        else:
+            # All requested rows are selected in a single query: rows are
+            # numbered in the order of a (single) scan, which may differ
+            # between queries, and each query would scan the table again
+            row_index = self.backend.quote_identifier("__row_index")
+            numbered = self._sql_query(
+                fields + ["{} - 1 AS {}".format(self.backend.ROW_NUMBER,
+                                                row_index)],
+                filters)
+            numbered = "({}) AS {}".format(
+                numbered, self.backend.quote_identifier("__rows"))
+            query = self.backend.create_sql_query(
+                numbered, ["*"],
+                ["{} IN ({})".format(row_index, ", ".join(map(str, unique)))])
+            with self.backend.execute_sql_query(query) as cur:
+                for batch in iter(lambda: cur.fetchmany(batch_size), []):
+                    for *row, index in batch:
+                        fetched[index] = row
+
+        batch = []
+        for index in rows:
+            if index in fetched:
+                batch.append(fetched[index])
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
 
     def copy(self):
         """Return a copy of the SqlTable"""
@@ -282,24 +381,57 @@ class SqlTable(Table):
     _W = None
     _ids = None
 
-    def download_data(self, limit=None, partial=False):
-        """Download SQL data and store it in memory as numpy matrices."""
+    def download_data(self, limit=None, partial=False, callback=None):
+        """Download SQL data and store it in memory as numpy matrices.
+
+        Rows are fetched in batches and decoded column by column into
+        arrays that are allocated for the (approximate) number of rows.
+        If given, `callback` is called with the proportion of downloaded
+        rows after each batch.
+        """
         if limit and not partial and self.approx_len() > limit:
             raise ValueError("Too many rows to download the data into memory.")
-        X = [np.empty((0, len(self.domain.attributes)))]
-        Y = [np.empty((0, len(self.domain.class_vars)))]
-        metas = [np.empty((0, len(self.domain.metas)))]
-        for row in islice(self, limit):
-            X.append(row._x)
-            Y.append(row._y)
-            metas.append(row._metas)
-        self._X = np.vstack(X).astype(np.float64)
-        self._Y = np.vstack(Y).astype(np.float64)
-        self._metas = np.vstack(metas).astype(object)
-        self._W = np.empty((self._X.shape[0], 0))
+        domain = self.domain
+        n_attrs, n_vars = len(domain.attributes), len(domain.variables)
+        decoders = [_column_decoder(var) for var in domain.variables]
+
+        expected = self.approx_len()
+        if limit:
+            expected = min(expected, limit)
+        capacity = max(expected, 1)
+        X = np.empty((capacity, n_attrs))
+        Y = np.empty((capacity, len(domain.class_vars)))
+        metas = np.empty((capacity, len(domain.metas)), dtype=object)
+
+        n_rows = 0
+        attributes = domain.variables + domain.metas
+        for batch in self._query_batches(attributes, rows=slice(0, limit)):
+            end = n_rows + len(batch)
+            if end > capacity:
+                capacity = max(2 * capacity, end)
+                for arr in (X, Y, metas):
+                    arr.resize((capacity, arr.shape[1]), refcheck=False)
+            columns = list(zip(*batch))
+            for i, (decoder, column) in enumerate(zip(decoders, columns)):
+                if i < n_attrs:
+                    X[n_rows:end, i] = decoder(column)
+                else:
+                    Y[n_rows:end, i - n_attrs] = decoder(column)
+            for i, column in enumerate(columns[n_vars:]):
+                metas[n_rows:end, i] = column
+            n_rows = end
+            if callback is not None:
+                callback(min(n_rows / max(expected, 1), 1))
+        if callback is not None:
+            callback(1)
+
+        for arr in (X, Y, metas):
+            arr.resize((n_rows, arr.shape[1]), refcheck=False)
+        self._X, self._Y, self._metas = X, Y, metas
+        self._W = np.empty((n_rows, 0))
         self._init_ids(self)
-        if not partial or limit and self._X.shape[0] < limit:
-            self._cached__len__ = self._X.shape[0]
+        if not partial or limit and n_rows < limit:
+            self._cached__len__ = n_rows
 
     @property
     def X(self):
@@ -349,8 +481,7 @@ class SqlTable(Table):
 
     def _compute_basic_stats(self, columns=None,
                              include_metas=False, compute_var=False):
-        if self.approx_len() > LARGE_TABLE:
-            self = self.sample_time(DEFAULT_SAMPLE_TIME)
+        self = self._sample_if_large()
 
         if columns is not None:
             columns = [self.domain[col] for col in columns]
@@ -364,11 +495,11 @@ class SqlTable(Table):
         columns = [(c.to_sql(), c.is_continuous) for c in columns]
         sql_fields = []
         for field_name, continuous in columns:
-            stats = self.CONTINUOUS_STATS if continuous else self.DISCRETE_STATS
+            stats = self.backend.CONTINUOUS_STATS if continuous \
+                else self.backend.DISCRETE_STATS
             sql_fields.append(stats % dict(field_name=field_name))
         query = self._sql_query(sql_fields)
-        with self.backend.execute_sql_query(query) as cur:
-            results = cur.fetchone()
+        results = self.backend.fetch_cached(query)[0]
         stats = []
         i = 0
         for ci, (field_name, continuous) in enumerate(columns):
@@ -381,8 +512,7 @@ class SqlTable(Table):
         return stats
 
     def _compute_distributions(self, columns=None):
-        if self.approx_len() > LARGE_TABLE:
-            self = self.sample_time(DEFAULT_SAMPLE_TIME)
+        self = self._sample_if_large()
 
         if columns is not None:
             columns = [self.domain[col] for col in columns]
@@ -399,8 +529,7 @@ class SqlTable(Table):
                                     filters=['%s IS NOT NULL' % field_name],
                                     group_by=[field_name],
                                     order_by=[field_name])
-            with self.backend.execute_sql_query(query) as cur:
-                dist = np.array(cur.fetchall())
+            dist = np.array(self.backend.fetch_cached(query))
             if col.is_continuous:
                 dists.append((dist.T, []))
             else:
@@ -408,8 +537,7 @@ class SqlTable(Table):
         return dists
 
     def _compute_contingency(self, col_vars=None, row_var=None):
-        if self.approx_len() > LARGE_TABLE:
-            self = self.sample_time(DEFAULT_SAMPLE_TIME)
+        self = self._sample_if_large()
 
         if col_vars is None:
             col_vars = range(len(self.domain.variables))
@@ -442,14 +570,13 @@ class SqlTable(Table):
                        for f in (row_field, column_field)]
             query = self._sql_query(fields, filters=filters,
                                     group_by=group_by, order_by=order_by)
-            with self.backend.execute_sql_query(query) as cur:
-                data = list(cur.fetchall())
-                if column.is_continuous:
-                    all_contingencies[i] = \
-                        (self._continuous_contingencies(data, row), [])
-                else:
-                    all_contingencies[i] =\
-                        (self._discrete_contingencies(data, row, column), [])
+            data = self.backend.fetch_cached(query)
+            if column.is_continuous:
+                all_contingencies[i] = \
+                    (self._continuous_contingencies(data, row), [])
+            else:
+                all_contingencies[i] =\
+                    (self._discrete_contingencies(data, row, column), [])
         return all_contingencies, None
 
     def _continuous_contingencies(self, data, row):
@@ -465,7 +592,7 @@ class SqlTable(Table):
                 last = column_value
                 values[i] = column_value
                 counts[row.to_val(row_value), i] += count
-        return (values, counts)
+        return (values[:i + 1], counts[:, :i + 1])
 
     def _discrete_contingencies(self, data, row, column):
         conts = np.zeros((len(row.values), len(column.values)))
@@ -575,16 +702,6 @@ class SqlTable(Table):
             offset, limit, use_time_sample)
 
 
-    DISCRETE_STATS = "SUM(CASE TRUE WHEN %(field_name)s IS NULL THEN 1 " \
-                     "ELSE 0 END), " \
-                     "SUM(CASE TRUE WHEN %(field_name)s IS NULL THEN 0 " \
-                     "ELSE 1 END)"
-    CONTINUOUS_STATS = "MIN(%(field_name)s)::double precision, " \
-                       "MAX(%(field_name)s)::double precision, " \
-                       "AVG(%(field_name)s)::double precision, " \
-                       "STDDEV(%(field_name)s)::double precision, " \
-                       + DISCRETE_STATS
-
     def sample_percentage(self, percentage, no_cache=False):
         if percentage >= 100:
             return self
@@ -596,11 +713,12 @@ class SqlTable(Table):
                             no_cache=no_cache)
 
     def _sample(self, method, parameter, no_cache=False):
-        import psycopg2
         if "," in self.table_name:
             raise NotImplementedError("Sampling of complex queries is not supported")
 
         parameter = str(parameter)
+        sample_query = self.backend.sample_table_query(
+            self.table_name, method, parameter)
         if "." in self.table_name:
             schema, name = self.table_name.split(".")
             sample_name = '__%s_%s_%s' % (
@@ -614,33 +732,34 @@ class SqlTable(Table):
                 method,
                 parameter.replace('.', '_').replace('-', '_'))
             sample_table_q = self.backend.quote_identifier(sample_table)
-        create = False
-        try:
-            query = "SELECT * FROM " + sample_table_q + " LIMIT 0;"
-            with self.backend.execute_sql_query(query): pass
 
-            if no_cache:
-                query = "DROP TABLE " + sample_table_q
-                with self.backend.execute_sql_query(query): pass
-                create = True
-
-        except psycopg2.ProgrammingError:
-            create = True
-
-        if create:
-            with self.backend.execute_sql_query(" ".join([
-                    "CREATE TABLE", sample_table_q, "AS",
-                    "SELECT * FROM", self.table_name,
-                    "TABLESAMPLE", method, "(", parameter, ")"])):
-                pass
+        if no_cache:
+            query = "DROP TABLE IF EXISTS " + sample_table_q
+            with self.backend.execute_sql_query(query): pass
+            # Results of queries on the old sample are no longer valid
+            self.backend.clear_query_cache()
+        with self.backend.execute_sql_query(" ".join([
+                "CREATE TABLE IF NOT EXISTS", sample_table_q, "AS",
+                sample_query])):
+            pass
 
         sampled_table = self.copy()
         sampled_table.table_name = sample_table_q
         with sampled_table.backend.execute_sql_query(
-                'ANALYZE' + sample_table_q):
+                'ANALYZE ' + sample_table_q):
             pass
         return sampled_table
 
+    def _sample_if_large(self):
+        """Return a time-limited sample of a large table. Small tables, and
+        tables that the backend cannot sample, are returned as they are."""
+        if self.approx_len() > LARGE_TABLE:
+            try:
+                return self.sample_time(DEFAULT_SAMPLE_TIME)
+            except NotImplementedError:
+                pass
+        return self
+
     @contextmanager
     def _execute_sql_query(self, query, param=None):
         warnings.warn("Use backend.execute_sql_query", DeprecationWarning)
@@ -651,6 +770,32 @@ class SqlTable(Table):
         return np.nan
 
 
+def _column_decoder(var):
+    """Return a function that converts a column of values of `var`, as
+    fetched from the database, to an array of floats. The result is the
+    same as if `var.to_val` were applied to each value."""
+    if var.is_continuous:
+        def decode(column):
+            try:
+                # the values are numbers (cast in `to_sql`) or None
+                return np.array(column, dtype=np.float64)
+            except (TypeError, ValueError):
+                return np.fromiter(map(var.to_val, column), np.float64,
+                                   len(column))
+    elif var.is_discrete:
+        def decode(column):
+            indices = {value: float(i) for i, value in enumerate(var.values)}
+            return np.fromiter(
+                (indices[value] if value in indices else var.to_val(value)
+                 for value in column),
+                np.float64, len(column))
+    else:
+        def decode(column):
+            return np.fromiter(map(var.to_val, column), np.float64,
+                               len(column))
+    return decode
+
+
 class SqlRowInstance(Instance):
     """
     Extends :obj:`Orange.data.Instance` to correctly handle values of meta
@@ -8,6 +8,7 @@ from numbers import Real, Integral
 from functools import reduce
 from warnings import warn
 from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import bottleneck as bn
@@ -18,10 +19,12 @@ from Orange.data import (
     Domain, Variable, Storage, StringVariable, Unknown, Value, Instance
 )
 from Orange.data.util import SharedComputeValue
-from Orange.statistics.util import bincount, countnans, contingency, stats as fast_stats
+from Orange.statistics.util import bincount, countnans, stats as fast_stats
 from Orange.util import flatten
 
-__all__ = ["dataset_dirs", "get_sample_datasets_dir", "RowInstance", "Table"]
+__all__ = ["dataset_dirs", "get_sample_datasets_dir", "RowInstance", "Table",
+           "enable_conversion_cache", "disable_conversion_cache",
+           "get_conversion_cache"]
 
 
 def get_sample_datasets_dir():
@@ -38,6 +41,73 @@ chaining of domain conversions also works with caching even with descendants
 of Table."""
 _conversion_cache = None
 
+"""Optional cache of domain conversions that persists across calls of
+Table.from_table; see `enable_conversion_cache`."""
+_persistent_conversion_cache = None
+
+
+def enable_conversion_cache(max_bytes=256 * 2 ** 20):
+    """
+    Keep the results of domain conversions across calls of `Table.from_table`.
+
+    Converting the same (unchanged) table into the same domain again, as
+    happens when a model is repeatedly applied to the same data, then returns
+    a copy of the stored result instead of recomputing the variables. Tables
+    are matched by a checksum of their content, so a table that was modified
+    in the meantime is converted anew.
+
+    :param max_bytes: the maximal total size of stored tables
+    :type max_bytes: int
+    :return: the cache, whose `stats` report hits and misses
+    :rtype: Orange.misc.cache.LRUCache
+    """
+    # Orange.misc imports Orange.data, hence the late import
+    from Orange.misc.cache import LRUCache
+
+    global _persistent_conversion_cache
+    _persistent_conversion_cache = LRUCache(max_bytes, _conversion_entry_nbytes)
+    return _persistent_conversion_cache
+
+
+def disable_conversion_cache():
+    """Stop caching domain conversions across calls and free the cache."""
+    global _persistent_conversion_cache
+    _persistent_conversion_cache = None
+
+
+def get_conversion_cache():
+    """Return the cache of domain conversions or `None` if it is disabled."""
+    return _persistent_conversion_cache
+
+
+def _array_nbytes(arr):
+    if sp.issparse(arr):
+        arr = arr.tocsr()
+        return arr.data.nbytes + arr.indices.nbytes + arr.indptr.nbytes
+    return arr.nbytes
+
+
+def _conversion_entry_nbytes(entry):
+    table = entry[-1]
+    return sum(_array_nbytes(arr)
+               for arr in (table.X, table._Y, table.metas, table.W))
+
+
+def _conversion_fingerprint(table):
+    """Return a checksum of the table's content and ids, or `None` if the
+    table's content cannot be checksummed (e.g. for SQL tables)."""
+    if type(table).checksum is not Table.checksum:
+        return None
+    cs = 1
+    for arr in (table.X, table._Y, table.metas, table.W, table.ids):
+        if sp.issparse(arr):
+            arr = arr.tocsr()
+            for part in (arr.data, arr.indices, arr.indptr):
+                cs = zlib.adler32(np.ascontiguousarray(part), cs)
+        else:
+            cs = zlib.adler32(np.ascontiguousarray(arr), cs)
+    return cs
+
 
 class RowInstance(Instance):
     sparse_x = None
@@ -82,6 +152,7 @@ class RowInstance(Instance):
         self._check_single_class()
         if not isinstance(value, Real):
             value = self.table.domain.class_var.to_val(value)
+        self.table._invalidate_sorted_index()
         self._y[0] = value
         if self.sparse_y:
             self.table._Y[self.row_index, 0] = value
@@ -92,6 +163,7 @@ class RowInstance(Instance):
         if isinstance(value, str):
             var = self._domain[key]
             value = var.to_val(value)
+        self.table._invalidate_sorted_index()
         if key >= 0:
             if not isinstance(value, Real):
                 raise TypeError("Expected primitive value, got '%s'" %
@@ -166,6 +238,11 @@ class Table(MutableSequence, Storage):
     _next_instance_id = 0
     _next_instance_lock = Lock()
 
+    # Sorted indices of columns (see `build_sorted_index`): a dictionary
+    # with column indices as keys and tuples (array, order, sorted values)
+    # or None (for indices that are not built yet) as values
+    _sorted_index = None
+
     @property
     def Y(self):
         if self._Y.shape[1] == 1:
@@ -302,8 +379,19 @@ class Table(MutableSequence, Storage):
                 else:
                     return np.ravel(x.toarray())
 
+            batched = set()
+            if not is_sparse:
+                for columns, transformations, src_indices in \
+                        _batch_transformations(source, src_cols):
+                    a[:, columns] = type(transformations[0]).transform_columns(
+                        transformations,
+                        get_columns(row_indices, src_indices, n_rows))
+                    batched.update(columns)
+
             shared_cache = _conversion_cache
             for i, col in enumerate(src_cols):
+                if i in batched:
+                    continue
                 if col is None:
                     a[:, i] = Unknown
                 elif not isinstance(col, Integral):
@@ -336,6 +424,7 @@ class Table(MutableSequence, Storage):
             return a
 
         new_cache = _conversion_cache is None
+        persistent_key = None
         try:
             if new_cache:
                 _conversion_cache = {}
@@ -346,6 +435,22 @@ class Table(MutableSequence, Storage):
             if domain == source.domain:
                 return cls.from_table_rows(source, row_indices)
 
+            persistent_cache = _persistent_conversion_cache
+            if persistent_cache is not None and new_cache \
+                    and row_indices is ...:
+                fingerprint = _conversion_fingerprint(source)
+                if fingerprint is not None:
+                    # Entries hold references to both domains, so their ids
+                    # cannot be reused while the entry is in the cache
+                    persistent_key = \
+                        (cls, id(domain), id(source.domain), fingerprint)
+                    entry = persistent_cache.get(persistent_key)
+                    if entry is not None:
+                        self = entry[-1].copy()
+                        self.name = getattr(source, 'name', '')
+                        self.attributes = getattr(source, 'attributes', {})
+                        return self
+
             if isinstance(row_indices, slice):
                 start, stop, stride = row_indices.indices(source.X.shape[0])
                 n_rows = (stop - start) // stride
@@ -385,6 +490,9 @@ class Table(MutableSequence, Storage):
                 cls._init_ids(self)
             self.attributes = getattr(source, 'attributes', {})
             _conversion_cache[(id(domain), id(source))] = self
+            if persistent_key is not None:
+                persistent_cache.put(
+                    persistent_key, (domain, source.domain, self.copy()))
             return self
         finally:
             if new_cache:
@@ -512,7 +620,7 @@ class Table(MutableSequence, Storage):
     @classmethod
     def _init_ids(cls, obj):
         with cls._next_instance_lock:
-            obj.ids = np.array(range(cls._next_instance_id, cls._next_instance_id + obj.X.shape[0]))
+            obj.ids = np.arange(cls._next_instance_id, cls._next_instance_id + obj.X.shape[0])
             cls._next_instance_id += obj.X.shape[0]
 
     @classmethod
@@ -699,6 +807,7 @@ class Table(MutableSequence, Storage):
         if not self._check_all_dense():
             raise ValueError(
                 "Assignment to rows of sparse data is not supported")
+        self._invalidate_sorted_index()
         if not isinstance(key, tuple):
             if isinstance(value, Real):
                 self.X[key, :] = value
@@ -788,6 +897,7 @@ class Table(MutableSequence, Storage):
             raise ValueError("Rows of sparse data cannot be deleted")
         if key is ...:
             key = range(len(self))
+        self._invalidate_sorted_index()
         self.X = np.delete(self.X, key, axis=0)
         self.Y = np.delete(self._Y, key, axis=0)
         self.metas = np.delete(self.metas, key, axis=0)
@@ -796,6 +906,24 @@ class Table(MutableSequence, Storage):
     def __len__(self):
         return self.X.shape[0]
 
+    def iter_batches(self, size=1000):
+        """
+        Iterate over consecutive blocks of (at most) `size` rows.
+
+        Blocks are tables whose dense parts are views into this table, so
+        they are cheap to construct, and columns (e.g. from
+        :obj:`get_column_view`) can be processed block by block instead of
+        row by row through :obj:`RowInstance`.
+
+        :param size: the number of rows in a block
+        :type size: int
+        :return: iterator over tables
+        """
+        if size < 1:
+            raise ValueError("Batch size must be positive")
+        for start in range(0, len(self), size):
+            yield self.from_table_rows(self, slice(start, start + size))
+
     def __str__(self):
         return "[" + ",\n ".join(str(ex) for ex in self)
 
@@ -835,6 +963,7 @@ class Table(MutableSequence, Storage):
         if row < 0 or row > len(self):
             raise IndexError("Index out of range")
         self.ensure_copy()  # ensure that numpy arrays are single-segment for resize
+        self._invalidate_sorted_index()
         self._resize_all(len(self) + 1)
         if row < len(self):
             self.X[row + 1:] = self.X[row:-1]
@@ -867,6 +996,7 @@ class Table(MutableSequence, Storage):
         :type instances: Orange.data.Table or a sequence of instances
         """
         old_length = len(self)
+        self._invalidate_sorted_index()
         self._resize_all(old_length + len(instances))
         try:
             # shortcut
@@ -1040,6 +1170,7 @@ class Table(MutableSequence, Storage):
         """Randomly shuffle the rows of the table."""
         if not self._check_all_dense():
             raise ValueError("Rows of sparse data cannot be shuffled")
+        self._invalidate_sorted_index()
         ind = np.arange(self.X.shape[0])
         np.random.shuffle(ind)
         self.X = self.X[ind]
@@ -1047,6 +1178,97 @@ class Table(MutableSequence, Storage):
         self.metas = self.metas[ind]
         self.W = self.W[ind]
 
+    def build_sorted_index(self, columns=None, lazy=False):
+        """
+        Build sorted indices of continuous columns for faster range filters.
+
+        The index of a column consists of the order of rows by the column's
+        values and of the sorted values, so that
+        :obj:`~Orange.data.filter.FilterContinuous` finds the selected rows
+        by binary search instead of comparing all values. Indices are
+        invalidated when the table is modified through its methods (or
+        through its instances) and rebuilt when needed. After modifying
+        arrays (e.g. `X`) directly, call :obj:`drop_sorted_index`.
+
+        :param columns: columns to index; all continuous variables by default
+        :type columns: list of int, str or Orange.data.Variable
+        :param lazy: if `True`, indices are built when first used
+        :type lazy: bool
+        """
+        if columns is None:
+            columns = [var for var in chain(self.domain.variables,
+                                            self.domain.metas)
+                       if var.is_continuous]
+        if self._sorted_index is None:
+            self._sorted_index = {}
+        for column in columns:
+            column = self.domain.index(column)
+            self._sorted_index.setdefault(column, None)
+            if not lazy:
+                self.get_sorted_index(column)
+
+    def drop_sorted_index(self, columns=None):
+        """
+        Remove sorted indices of the given columns (default: all columns).
+
+        :param columns: columns whose indices are removed
+        :type columns: list of int, str or Orange.data.Variable
+        """
+        if self._sorted_index is None:
+            return
+        if columns is None:
+            self._sorted_index = None
+        else:
+            for column in columns:
+                self._sorted_index.pop(self.domain.index(column), None)
+
+    def get_sorted_index(self, column):
+        """
+        Return the sorted index of the column or `None` if the column is not
+        indexed (see :obj:`build_sorted_index`).
+
+        The index is a tuple with an array of row indices, sorted by the
+        column's values and with missing values at the end, and an array of
+        sorted values without missing values.
+
+        :param column: the column
+        :type column: int, str or Orange.data.Variable
+        :return: (order of rows, sorted values) or None
+        """
+        if self._sorted_index is None:
+            return None
+        if not isinstance(column, Integral):
+            column = self.domain.index(column)
+        if column not in self._sorted_index:
+            return None
+        if column < 0:
+            array = self.metas
+        elif column < self.X.shape[1]:
+            array = self.X
+        else:
+            array = self._Y
+        index = self._sorted_index[column]
+        if index is None or index[0] is not array \
+                or len(index[1]) != len(self):
+            values = self.get_column_view(column)[0].astype(float)
+            order = np.argsort(values, kind="mergesort")
+            values = values[order]
+            values = values[:len(values) - countnans(values)]
+            index = self._sorted_index[column] = (array, order, values)
+        return index[1:]
+
+    def _invalidate_sorted_index(self):
+        if self._sorted_index:
+            self._sorted_index = dict.fromkeys(self._sorted_index)
+
+    def __getstate__(self):
+        # Sorted indices are not pickled (or copied); the indexed columns
+        # are kept and their indices are rebuilt when needed
+        state = self.__dict__.copy()
+        if state.get("_sorted_index"):
+            state["_sorted_index"] = dict.fromkeys(state["_sorted_index"])
+        return state
+
     def get_column_view(self, index):
         """
         Return a vector - as a view, not a copy - with a column of the table,
@@ -1122,117 +1344,7 @@ class Table(MutableSequence, Storage):
     def _filter_values_indicators(self, filter):
         from Orange.data import filter as data_filter
 
-        if isinstance(filter, data_filter.Values):
-            conditions = filter.conditions
-            conjunction = filter.conjunction
-        else:
-            conditions = [filter]
-            conjunction = True
-        if conjunction:
-            sel = np.ones(len(self), dtype=bool)
-        else:
-            sel = np.zeros(len(self), dtype=bool)
-
-        for f in conditions:
-            if isinstance(f, data_filter.Values):
-                if conjunction:
-                    sel *= self._filter_values_indicators(f)
-                else:
-                    sel += self._filter_values_indicators(f)
-                continue
-            col = self.get_column_view(f.column)[0]
-            if isinstance(f, data_filter.FilterDiscrete) and f.values is None \
-                    or isinstance(f, data_filter.FilterContinuous) and \
-                                    f.oper == f.IsDefined:
-                col = col.astype(float)
-                if conjunction:
-                    sel *= ~np.isnan(col)
-                else:
-                    sel += ~np.isnan(col)
-            elif isinstance(f, data_filter.FilterString) and \
-                            f.oper == f.IsDefined:
-                if conjunction:
-                    sel *= col.astype(bool)
-                else:
-                    sel += col.astype(bool)
-            elif isinstance(f, data_filter.FilterDiscrete):
-                if conjunction:
-                    s2 = np.zeros(len(self), dtype=bool)
-                    for val in f.values:
-                        if not isinstance(val, Real):
-                            val = self.domain[f.column].to_val(val)
-                        s2 += (col == val)
-                    sel *= s2
-                else:
-                    for val in f.values:
-                        if not isinstance(val, Real):
-                            val = self.domain[f.column].to_val(val)
-                        sel += (col == val)
-            elif isinstance(f, data_filter.FilterStringList):
-                if not f.case_sensitive:
-                    # noinspection PyTypeChecker
-                    col = np.char.lower(np.array(col, dtype=str))
-                    vals = [val.lower() for val in f.values]
-                else:
-                    vals = f.values
-                if conjunction:
-                    sel *= reduce(operator.add,
-                                  (col == val for val in vals))
-                else:
-                    sel = reduce(operator.add,
-                                 (col == val for val in vals), sel)
-            elif isinstance(f, data_filter.FilterRegex):
-                sel = np.vectorize(f)(col)
-            elif isinstance(f, (data_filter.FilterContinuous,
-                                data_filter.FilterString)):
-                if (isinstance(f, data_filter.FilterString) and
-                        not f.case_sensitive):
-                    # noinspection PyTypeChecker
-                    col = np.char.lower(np.array(col, dtype=str))
-                    fmin = f.min.lower()
-                    if f.oper in [f.Between, f.Outside]:
-                        fmax = f.max.lower()
-                else:
-                    fmin, fmax = f.min, f.max
-                if f.oper == f.Equal:
-                    col = (col == fmin)
-                elif f.oper == f.NotEqual:
-                    col = (col != fmin)
-                elif f.oper == f.Less:
-                    col = (col < fmin)
-                elif f.oper == f.LessEqual:
-                    col = (col <= fmin)
-                elif f.oper == f.Greater:
-                    col = (col > fmin)
-                elif f.oper == f.GreaterEqual:
-                    col = (col >= fmin)
-                elif f.oper == f.Between:
-                    col = (col >= fmin) * (col <= fmax)
-                elif f.oper == f.Outside:
-                    col = (col < fmin) + (col > fmax)
-                elif not isinstance(f, data_filter.FilterString):
-                    raise TypeError("Invalid operator")
-                elif f.oper == f.Contains:
-                    col = np.fromiter((fmin in e for e in col),
-                                      dtype=bool)
-                elif f.oper == f.StartsWith:
-                    col = np.fromiter((e.startswith(fmin) for e in col),
-                                      dtype=bool)
-                elif f.oper == f.EndsWith:
-                    col = np.fromiter((e.endswith(fmin) for e in col),
-                                      dtype=bool)
-                else:
-                    raise TypeError("Invalid operator")
-                if conjunction:
-                    sel *= col
-                else:
-                    sel += col
-            else:
-                raise TypeError("Invalid filter")
-
-        if filter.negate:
-            sel = ~sel
-        return sel
+        return data_filter.compile_filter(filter, self.domain)(self)
 
     def _filter_values(self, filter):
         sel = self._filter_values_indicators(filter)
@@ -1352,7 +1464,8 @@ class Table(MutableSequence, Storage):
             row_data = self._Y[:, row_indi - n_atts]
 
         W = self.W if self.has_weights() else None
-        nan_inds = None
+        if W is not None:
+            W = W.astype(np.float64).ravel()
 
         col_desc = [self.domain[var] for var in col_vars]
         col_indi = [self.domain.index(var) for var in col_vars]
@@ -1365,13 +1478,12 @@ class Table(MutableSequence, Storage):
         if row_data.dtype.kind != "f": #meta attributes can be stored as type object
             row_data = row_data.astype(float)
 
-        unknown_rows = countnans(row_data)
-        if unknown_rows:
-            nan_inds = np.isnan(row_data)
-            row_data = row_data[~nan_inds]
-            if W:
-                W = W[~nan_inds]
-                unknown_rows = np.sum(W[nan_inds])
+        # Rows with unknown row values are skipped by kernels, which use
+        # negative classes to mark them
+        unknown_rows = countnans(row_data, W)
+        classes = np.where(np.isnan(row_data), -1, row_data).astype(np.intp)
+        if len(classes) and classes.max() >= n_rows:
+            raise ValueError("row value out of range")
 
         contingencies = [None] * len(col_desc)
         for arr, f_cond, f_ind in (
@@ -1379,56 +1491,133 @@ class Table(MutableSequence, Storage):
                 (self._Y, lambda i: i >= n_atts, lambda i: i - n_atts),
                 (self.metas, lambda i: i < 0, lambda i: -1 - i)):
 
-            if nan_inds is not None:
-                arr = arr[~nan_inds]
-
             arr_indi = [e for e, ind in enumerate(col_indi) if f_cond(ind)]
 
             vars = [(e, f_ind(col_indi[e]), col_desc[e]) for e in arr_indi]
             disc_vars = [v for v in vars if v[2].is_discrete]
             if disc_vars:
-                if sp.issparse(arr):
-                    max_vals = max(len(v[2].values) for v in disc_vars)
-                    disc_indi = {i for _, i, _ in disc_vars}
-                    mask = [i in disc_indi for i in range(arr.shape[1])]
-                    conts, nans = contingency(arr, row_data, max_vals - 1,
-                                              n_rows - 1, W, mask)
-                    for col_i, arr_i, var in disc_vars:
-                        n_vals = len(var.values)
-                        contingencies[col_i] = (conts[arr_i][:, :n_vals],
-                                                nans[arr_i])
-                else:
-                    for col_i, arr_i, var in disc_vars:
-                        contingencies[col_i] = contingency(
-                            arr[:, arr_i].astype(float),
-                            row_data, len(var.values) - 1, n_rows - 1, W)
+                conts = _discrete_contingencies(
+                    arr, [arr_i for _, arr_i, _ in disc_vars],
+                    max(len(var.values) for _, _, var in disc_vars),
+                    classes, n_rows, W)
+                for (col_i, _, var), (cont, nans) in zip(disc_vars, conts):
+                    contingencies[col_i] = (cont[:, :len(var.values)], nans)
 
             cont_vars = [v for v in vars if v[2].is_continuous]
             if cont_vars:
+                conts = _continuous_contingencies(
+                    arr, [arr_i for _, arr_i, _ in cont_vars],
+                    classes, n_rows, W)
+                for (col_i, _, _), cont in zip(cont_vars, conts):
+                    contingencies[col_i] = cont
 
-                classes = row_data.astype(dtype=np.int8)
-                if W is not None:
-                    W = W.astype(dtype=np.float64)
-                if sp.issparse(arr):
-                    arr = sp.csc_matrix(arr)
-
-                for col_i, arr_i, _ in cont_vars:
-                    if sp.issparse(arr):
-                        col_data = arr.data[arr.indptr[arr_i]:
-                        arr.indptr[arr_i + 1]]
-                        rows = arr.indices[arr.indptr[arr_i]:
-                        arr.indptr[arr_i + 1]]
-                        W_ = None if W is None else W[rows]
-                        classes_ = classes[rows]
-                    else:
-                        col_data, W_, classes_ = arr[:, arr_i], W, classes
+        return contingencies, unknown_rows
 
-                    col_data = col_data.astype(dtype=np.float64)
-                    U, C, unknown = _contingency.contingency_floatarray(
-                        col_data, classes_, n_rows, W_)
-                    contingencies[col_i] = ([U, C], unknown)
 
-        return contingencies, unknown_rows
+#: The minimal number of values that a thread processes when computing
+#: contingencies; smaller jobs are not split between threads
+MIN_THREAD_VALUES = 10 ** 6
+
+
+def _in_threads(func, n, n_values):
+    """
+    Call `func(start, stop)` for consecutive blocks of `range(n)` and return
+    the concatenated results. Blocks are processed in threads if `n_values`
+    (the total number of processed values) is large enough.
+    """
+    n_threads = int(min(os.cpu_count() or 1, n, n_values // MIN_THREAD_VALUES))
+    if n_threads <= 1:
+        return func(0, n)
+    bounds = np.linspace(0, n, n_threads + 1).astype(int)
+    with ThreadPoolExecutor(n_threads) as executor:
+        return list(chain.from_iterable(
+            executor.map(func, bounds[:-1], bounds[1:])))
+
+
+def _discrete_contingencies(arr, cols, n_values, classes, n_classes, W):
+    """
+    Return a list of tuples (contingency, unknowns) for discrete columns
+    `cols` of `arr`. Contingencies are indexed by class and value.
+    """
+    cols = np.asarray(cols, dtype=np.intp)
+    conts = np.zeros((len(cols), n_classes, max(n_values, 1)))
+    unknowns = np.zeros((len(cols), n_classes))
+    if sp.issparse(arr):
+        csr = not sp.isspmatrix_csc(arr)
+        if csr:
+            arr = sp.csr_matrix(arr)
+        col_map = np.full(arr.shape[1], -1, dtype=np.intp)
+        col_map[cols] = np.arange(len(cols))
+        stored = np.zeros((len(cols), n_classes))
+        _contingency.contingencies_discrete_sparse(
+            arr.data.astype(np.float64, copy=False),
+            arr.indices.astype(np.intp), arr.indptr.astype(np.intp), csr,
+            col_map, classes, W, conts, unknowns, stored)
+        # Elements that are not stored are zeros
+        known = classes >= 0
+        conts[:, :, 0] += np.bincount(
+            classes[known], None if W is None else W[known],
+            minlength=n_classes) - stored
+    else:
+        if arr.dtype != np.float64 or not arr.flags.writeable:
+            arr = arr[:, cols].astype(np.float64)
+            cols = np.arange(len(cols))
+
+        def count(start, stop):
+            _contingency.contingencies_discrete(
+                arr, cols[start:stop], classes, W,
+                conts[start:stop], unknowns[start:stop])
+            return []
+
+        _in_threads(count, len(cols), len(cols) * arr.shape[0])
+    return list(zip(conts, unknowns))
+
+
+def _continuous_contingencies(arr, cols, classes, n_classes, W):
+    """
+    Return a list of tuples ([values, counts], unknowns) for continuous
+    columns `cols` of `arr`, where `values` are distinct values and
+    `counts` are indexed by class and value.
+    """
+    if sp.issparse(arr):
+        arr = sp.csc_matrix(arr)
+        contingencies = []
+        for col in cols:
+            col_data = arr.data[arr.indptr[col]:arr.indptr[col + 1]]
+            rows = arr.indices[arr.indptr[col]:arr.indptr[col + 1]]
+            known = classes[rows] >= 0
+            rows, col_data = rows[known], col_data[known]
+            U, C, unknown = _contingency.contingency_floatarray(
+                col_data.astype(np.float64), classes[rows].astype(np.int8),
+                n_classes, None if W is None else W[rows])
+            contingencies.append(([U, C], unknown))
+        return contingencies
+
+    def compute_block(start, stop):
+        # Columns are transposed into rows, which are faster to sort
+        X = np.array(arr[:, cols[start:stop]].T, dtype=np.float64, order="C")
+        ranks = np.argsort(X, axis=1)
+        counts = np.zeros(X.shape[0], dtype=np.intp)
+        _contingency.count_distinct_sorted(X, ranks, classes, counts)
+        offsets = np.hstack(([0], np.cumsum(counts)))
+        values = np.empty(offsets[-1])
+        dists = np.zeros((n_classes, offsets[-1]))
+        unknowns = np.zeros((X.shape[0], n_classes))
+        _contingency.contingencies_sorted(
+            X, ranks, classes, W, offsets, values, dists, unknowns)
+        return [([values[low:high], dists[:, low:high]], unknown)
+                for low, high, unknown
+                in zip(offsets[:-1], offsets[1:], unknowns)]
+
+    def compute(start, stop):
+        # Blocks of columns are small enough for their copies and ranks
+        # to stay in cache
+        block = max(1, MIN_THREAD_VALUES // 16 // max(arr.shape[0], 1))
+        return list(chain.from_iterable(
+            compute_block(low, min(low + block, stop))
+            for low in range(start, stop, block)))
+
+    return _in_threads(compute, len(cols), len(cols) * arr.shape[0])
 
 
 def _check_arrays(*arrays, dtype=None):
@@ -1475,6 +1664,43 @@ def _check_inf(array):
            np.isinf(array.data).any()
 
 
+def _batch_transformations(source, src_cols):
+    """
+    Group compute values that can be computed together by the class method
+    `transform_columns` (see :obj:`Orange.preprocess.transformation`): they
+    must be of the same type and transform primitive variables that are
+    stored in dense arrays of the `source` table.
+
+    Return a list of tuples with indices into `src_cols`, the compute values
+    and indices of the transformed variables in the source domain.
+    """
+    from Orange.preprocess.transformation import Transformation
+
+    domain = source.domain
+    n_attrs = len(domain.attributes)
+    groups = {}
+    for i, col in enumerate(src_cols):
+        # Subclasses that override __call__ must be called individually
+        if not isinstance(col, Transformation) or \
+                type(col).__call__ is not Transformation.__call__:
+            continue
+        variable = getattr(col, "variable", None)
+        if variable is None or variable not in domain:
+            continue
+        index = domain.index(variable)
+        if not domain[index].is_primitive():
+            continue
+        arr = source.X if 0 <= index < n_attrs \
+            else source._Y if index >= n_attrs \
+            else source.metas
+        if sp.issparse(arr):
+            continue
+        group = groups.setdefault(type(col), ([], [], []))
+        for lst, value in zip(group, (i, col, index)):
+            lst.append(value)
+    return list(groups.values())
+
+
 def _subarray(arr, rows, cols):
     return arr[_rxc_ix(rows, cols)]
 
@@ -1,14 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 import numpy as np
 from scipy import stats
 import sklearn.metrics as skl_metrics
 
 from Orange import data
-from Orange.misc import DistMatrix
+from Orange.misc import DistMatrix, CondensedDistMatrix
 from Orange.preprocess import SklImpute
 
 __all__ = ['Euclidean', 'Manhattan', 'Cosine', 'Jaccard', 'SpearmanR', 'SpearmanRAbsolute',
            'PearsonR', 'PearsonRAbsolute', 'Mahalanobis', 'MahalanobisDistance']
 
+# Distances are computed in blocks of rows; this is the default memory
+# (in bytes) for the blocks that are computed at the same time
+MAX_BLOCK_MEMORY = 2 ** 24
+
 def _preprocess(table):
     """Remove categorical attributes and impute missing values."""
     if not len(table):
@@ -33,8 +40,80 @@ def _orange_to_numpy(x):
         return x    # e.g. None
 
 
+def _compute_blocks(block_distances, x1, x2=None, dtype=np.float64, out=None,
+                    n_jobs=1, max_memory=None, condensed=False):
+    """
+    Compute distances between rows of `x1` and `x2` block by block, so that
+    the memory for intermediate results is bounded.
+
+    Args:
+        block_distances (callable): A function that returns distances
+            between rows of its two arguments.
+        x1 (np.ndarray or scipy.sparse matrix): Data.
+        x2 (np.ndarray or scipy.sparse matrix): Data; if None, distances
+            between rows of `x1` are symmetric and only blocks on and above
+            the diagonal are computed.
+        dtype (np.dtype): The type of the resulting matrix.
+        out (np.ndarray or str): A preallocated matrix for the result, or
+            the name of a file for a memory-mapped matrix.
+        n_jobs (int): The number of threads that compute blocks.
+        max_memory (int): The memory (in bytes) for blocks that are computed
+            at the same time; defaults to `MAX_BLOCK_MEMORY`.
+        condensed (bool): If True, only distances above the diagonal are
+            stored, row by row, in a 1-d array; `x2` must be None.
+
+    Returns:
+        np.ndarray: distances
+    """
+    n1 = x1.shape[0]
+    n2 = n1 if x2 is None else x2.shape[0]
+    if condensed:
+        if x2 is not None:
+            raise ValueError("Only distances between rows of the same data "
+                             "can be condensed.")
+        shape = (n1 * (n1 - 1) // 2, )
+    else:
+        shape = (n1, n2)
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif isinstance(out, str):
+        out = np.memmap(out, dtype=dtype, mode="w+", shape=shape)
+    elif out.shape != shape:
+        raise ValueError("Matrix for the result has a wrong shape.")
+
+    # Computation of a block needs a few temporary arrays of its size
+    max_memory = max_memory or MAX_BLOCK_MEMORY
+    block_rows = max(1, max_memory // (3 * 8 * max(n2, 1) * n_jobs))
+
+    def compute(start):
+        stop = min(start + block_rows, n1)
+        if condensed:
+            block = block_distances(x1[start:stop], x1[start:])
+            for i in range(start, stop):
+                # distances from the i-th row to the rows that follow it
+                offset = n1 * i - i * (i + 1) // 2
+                out[offset:offset + n1 - i - 1] = block[i - start, i - start + 1:]
+        elif x2 is None:
+            block = block_distances(x1[start:stop], x1[start:])
+            out[start:stop, start:] = block
+            out[start:, start:stop] = block.T
+        else:
+            out[start:stop] = block_distances(x1[start:stop], x2)
+
+    starts = range(0, n1, block_rows)
+    if n_jobs == 1:
+        for start in starts:
+            compute(start)
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(compute, starts))
+    return out
+
+
 class Distance:
-    def __call__(self, e1, e2=None, axis=1, impute=False):
+    def __call__(self, e1, e2=None, axis=1, impute=False,
+                 dtype=np.float64, out=None, n_jobs=1, max_memory=None,
+                 condensed=False):
         """
         :param e1: input data instances, we calculate distances between all pairs
         :type e1: :class:`Orange.data.Table` or :class:`Orange.data.RowInstance` or :class:`numpy.ndarray`
@@ -46,8 +125,23 @@ class Distance:
         :type axis: int
         :param impute: if impute=True all NaN values in matrix are replaced with 0
         :type impute: bool
+        :param dtype: the type of distances
+        :type dtype: :class:`numpy.dtype`
+        :param out: a preallocated matrix for distances, or the name of a
+           file for a memory-mapped matrix
+        :type out: :class:`numpy.ndarray` or str
+        :param n_jobs: the number of threads that compute blocks of distances
+        :type n_jobs: int
+        :param max_memory: the memory (in bytes) for blocks of distances
+           that are computed at the same time
+        :type max_memory: int
+        :param condensed: if condensed=True, distances between examples in e1
+           are returned as a condensed matrix, which stores only distances
+           above the diagonal; e2 must not be given
+        :type condensed: bool
         :return: the matrix with distances between given examples
-        :rtype: :class:`Orange.misc.distmatrix.DistMatrix`
+        :rtype: :class:`Orange.misc.distmatrix.DistMatrix` or
+           :class:`Orange.misc.distmatrix.CondensedDistMatrix`
         """
         raise NotImplementedError('Distance is an abstract class and should not be used directly.')
 
@@ -65,18 +159,25 @@ class SklDistance(Distance):
         self.name = name
         self.supports_sparse = supports_sparse
 
-    def __call__(self, e1, e2=None, axis=1, impute=False):
+    def __call__(self, e1, e2=None, axis=1, impute=False,
+                 dtype=np.float64, out=None, n_jobs=1, max_memory=None,
+                 condensed=False):
         x1 = _orange_to_numpy(e1)
         x2 = _orange_to_numpy(e2)
         if axis == 0:
             x1 = x1.T
             if x2 is not None:
                 x2 = x2.T
-        dist = skl_metrics.pairwise.pairwise_distances(x1, x2, metric=self.metric)
+        dist = _compute_blocks(
+            partial(skl_metrics.pairwise.pairwise_distances, metric=self.metric),
+            x1, x2, dtype, out, n_jobs, max_memory, condensed)
+        if x2 is None and not condensed:
+            np.fill_diagonal(dist, 0)
+        matrix_type = CondensedDistMatrix if condensed else DistMatrix
         if isinstance(e1, data.Table) or isinstance(e1, data.RowInstance):
-            dist = DistMatrix(dist, e1, e2, axis)
+            dist = matrix_type(dist, e1, e2, axis)
         else:
-            dist = DistMatrix(dist)
+            dist = matrix_type(dist)
         return dist
 
 Euclidean = SklDistance('euclidean', 'Euclidean', True)
@@ -85,6 +186,35 @@ Cosine = SklDistance('cosine', 'Cosine', True)
 Jaccard = SklDistance('jaccard', 'Jaccard', False)
 
 
+def _rank(x):
+    """Rank the values in each row; rows with missing values are unknown."""
+    x = np.asarray(x, dtype=float)
+    if not x.size:
+        return x
+    ranks = np.apply_along_axis(stats.rankdata, 1, x)
+    ranks[np.isnan(x).any(axis=1)] = np.nan
+    return ranks
+
+
+def _standardize(x):
+    """Center the rows and scale them to unit length, so that dot products of
+    rows are Pearson's correlation coefficients. Constant rows are unknown."""
+    x = np.asarray(x, dtype=float)
+    x = x - x.mean(axis=1)[:, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return x / np.sqrt((x ** 2).sum(axis=1))[:, None]
+
+
+def _correlation_distances(z1, z2, absolute, impute):
+    rho = np.clip(z1.dot(z2.T), -1, 1)
+    if impute:
+        rho = np.nan_to_num(rho)
+    if absolute:
+        return (1. - np.abs(rho)) / 2.
+    else:
+        return (1. - rho) / 2.
+
+
 class SpearmanDistance(Distance):
     """ Generic Spearman's rank correlation coefficient. """
     def __init__(self, absolute, name):
@@ -102,27 +232,27 @@ class SpearmanDistance(Distance):
         self.name = name
         self.supports_sparse = False
 
-    def __call__(self, e1, e2=None, axis=1, impute=False):
+    def __call__(self, e1, e2=None, axis=1, impute=False,
+                 dtype=np.float64, out=None, n_jobs=1, max_memory=None,
+                 condensed=False):
         x1 = _orange_to_numpy(e1)
         x2 = _orange_to_numpy(e2)
-        if x2 is None:
-            x2 = x1
-        slc = len(x1) if axis == 1 else x1.shape[1]
-        rho, _ = stats.spearmanr(x1, x2, axis=axis)
-        if np.isnan(rho).any() and impute:
-            rho = np.nan_to_num(rho)
-        if self.absolute:
-            dist = (1. - np.abs(rho)) / 2.
-        else:
-            dist = (1. - rho) / 2.
-        if isinstance(dist, np.float):
-            dist = np.array([[dist]])
-        elif isinstance(dist, np.ndarray):
-            dist = dist[:slc, slc:]
+        if axis == 0:
+            x1 = x1.T
+            if x2 is not None:
+                x2 = x2.T
+        # Spearman's coefficient is Pearson's coefficient of ranks
+        z1 = _standardize(_rank(x1))
+        z2 = None if x2 is None else _standardize(_rank(x2))
+        dist = _compute_blocks(
+            partial(_correlation_distances, absolute=self.absolute,
+                    impute=impute),
+            z1, z2, dtype, out, n_jobs, max_memory, condensed)
+        matrix_type = CondensedDistMatrix if condensed else DistMatrix
         if isinstance(e1, data.Table) or isinstance(e1, data.RowInstance):
-            dist = DistMatrix(dist, e1, e2, axis)
+            dist = matrix_type(dist, e1, e2, axis)
         else:
-            dist = DistMatrix(dist)
+            dist = matrix_type(dist)
         return dist
 
 SpearmanR = SpearmanDistance(absolute=False, name='Spearman')
@@ -146,25 +276,26 @@ class PearsonDistance(Distance):
         self.name = name
         self.supports_sparse = False
 
-    def __call__(self, e1, e2=None, axis=1, impute=False):
+    def __call__(self, e1, e2=None, axis=1, impute=False,
+                 dtype=np.float64, out=None, n_jobs=1, max_memory=None,
+                 condensed=False):
         x1 = _orange_to_numpy(e1)
         x2 = _orange_to_numpy(e2)
-        if x2 is None:
-            x2 = x1
         if axis == 0:
             x1 = x1.T
-            x2 = x2.T
-        rho = np.array([[stats.pearsonr(i, j)[0] for j in x2] for i in x1])
-        if np.isnan(rho).any() and impute:
-            rho = np.nan_to_num(rho)
-        if self.absolute:
-            dist = (1. - np.abs(rho)) / 2.
-        else:
-            dist = (1. - rho) / 2.
+            if x2 is not None:
+                x2 = x2.T
+        z1 = _standardize(x1)
+        z2 = None if x2 is None else _standardize(x2)
+        dist = _compute_blocks(
+            partial(_correlation_distances, absolute=self.absolute,
+                    impute=impute),
+            z1, z2, dtype, out, n_jobs, max_memory, condensed)
+        matrix_type = CondensedDistMatrix if condensed else DistMatrix
         if isinstance(e1, data.Table) or isinstance(e1, data.RowInstance):
-            dist = DistMatrix(dist, e1, e2, axis)
+            dist = matrix_type(dist, e1, e2, axis)
         else:
-            dist = DistMatrix(dist)
+            dist = matrix_type(dist)
         return dist
 
 PearsonR = PearsonDistance(absolute=False, name='Pearson')
@@ -198,7 +329,9 @@ class MahalanobisDistance(Distance):
         self.axis = axis
         self.VI = np.linalg.inv(np.cov(x.T))
 
-    def __call__(self, e1, e2=None, axis=None, impute=False):
+    def __call__(self, e1, e2=None, axis=None, impute=False,
+                 dtype=np.float64, out=None, n_jobs=1, max_memory=None,
+                 condensed=False):
         assert self.VI is not None, "Mahalanobis distance must be initialized with the fit() method."
 
         x1 = _orange_to_numpy(e1)
@@ -213,13 +346,17 @@ class MahalanobisDistance(Distance):
         if x1.shape[1] != self.VI.shape[0] or x2 is not None and x2.shape[1] != self.VI.shape[0]:
             raise ValueError('Incorrect number of features.')
 
-        dist = skl_metrics.pairwise.pairwise_distances(x1, x2, metric='mahalanobis', VI=self.VI)
-        if np.isnan(dist).any() and impute:
-            dist = np.nan_to_num(dist)
+        dist = _compute_blocks(
+            partial(skl_metrics.pairwise.pairwise_distances,
+                    metric='mahalanobis', VI=self.VI),
+            x1, x2, dtype, out, n_jobs, max_memory, condensed)
+        if impute:
+            dist[np.isnan(dist)] = 0
+        matrix_type = CondensedDistMatrix if condensed else DistMatrix
         if isinstance(e1, data.Table) or isinstance(e1, data.RowInstance):
-            dist = DistMatrix(dist, e1, e2, self.axis)
+            dist = matrix_type(dist, e1, e2, self.axis)
         else:
-            dist = DistMatrix(dist)
+            dist = matrix_type(dist)
         return dist
 
 Mahalanobis = MahalanobisDistance()
@@ -1,15 +1,21 @@
+import os
 import sys
+import copy
+import atexit
+import shutil
 import multiprocessing as mp
-from threading import Thread
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 import pickle
+import tempfile
 import warnings
 
 import numpy as np
+import scipy.sparse as sp
 
 import joblib
 import sklearn.cross_validation as skl_cross_validation
 
+from Orange.base import Learner
 from Orange.util import OrangeWarning
 from Orange.data import Table, Domain, ContinuousVariable, DiscreteVariable
 
@@ -24,9 +30,136 @@ def _identity(x):
     return x
 
 
+class _SharedTable:
+    """
+    Reference to a table that is dumped to a file once and memory-mapped by
+    worker processes, instead of being pickled for each task.
+    """
+    def __init__(self, table, folder):
+        fd, self.filename = tempfile.mkstemp(suffix=".pkl", dir=folder)
+        os.close(fd)
+        joblib.dump(table, self.filename)
+
+    def load(self):
+        folder = os.path.dirname(self.filename)
+        if any(os.path.dirname(name) != folder for name in _shared_tables):
+            # Tables from previous evaluations are no longer needed; release
+            # them, since the pool's processes outlive the evaluation
+            _shared_tables.clear()
+        if self.filename not in _shared_tables:
+            # Tasks come by folds, so older tables are seldom needed again
+            if len(_shared_tables) >= SHARED_TABLE_CACHE_SIZE:
+                _shared_tables.popitem(last=False)
+            # Pages are shared between processes until a learner writes
+            _shared_tables[self.filename] = \
+                joblib.load(self.filename, mmap_mode="c")
+        return _shared_tables[self.filename]
+
+
+# Tables loaded by the current (worker) process, by file names
+_shared_tables = OrderedDict()
+SHARED_TABLE_CACHE_SIZE = 8
+
+# Smaller tables are cheaper to pickle than to dump and memory-map
+SHARED_TABLE_MIN_BYTES = 2 ** 20
+
+
+def _table_nbytes(table):
+    arrays = (table.X, table.Y, table.metas, table.W)
+    return sum(getattr(a, "nbytes", 0) if not sp.issparse(a)
+               else a.data.nbytes for a in arrays)
+
+
+def _mp_worker_args(args):
+    return _mp_worker(*args)
+
+
+class _WorkerPool:
+    """
+    A pool of worker processes that is kept alive between evaluations, so
+    that starting the processes (and importing Orange in them) is paid once.
+
+    Tables are published to workers through files in a folder in shared
+    memory (if the system has one), which workers memory-map.
+    """
+    pool = None
+    n_processes = 0
+    start_method = None
+    folder = None
+
+    @classmethod
+    def get(cls, mp_ctx, n_processes):
+        """
+        Return a pool with at least `n_processes` processes started with the
+        method of `mp_ctx`, reusing the existing pool if possible.
+        """
+        if cls.pool is not None and \
+                (cls.n_processes < n_processes or
+                 cls.start_method != mp_ctx.get_start_method()):
+            cls.shutdown()
+        if cls.pool is None:
+            cls.pool = mp_ctx.Pool(n_processes)
+            cls.n_processes = n_processes
+            cls.start_method = mp_ctx.get_start_method()
+            shm = "/dev/shm"
+            cls.folder = tempfile.mkdtemp(
+                prefix="orange-", dir=shm if os.path.isdir(shm) else None)
+        return cls.pool
+
+    @classmethod
+    def is_running(cls, mp_ctx, n_processes):
+        return cls.pool is not None and cls.n_processes >= n_processes \
+            and cls.start_method == mp_ctx.get_start_method()
+
+    @classmethod
+    def shutdown(cls):
+        """Terminate the worker processes and remove published tables."""
+        if cls.pool is not None:
+            cls.pool.terminate()
+            cls.pool.join()
+            shutil.rmtree(cls.folder, ignore_errors=True)
+        cls.pool, cls.n_processes, cls.start_method, cls.folder = \
+            None, 0, None, None
+
+
+atexit.register(_WorkerPool.shutdown)
+
+
+def _preprocessing_key(learner):
+    """
+    Return a key that is equal for learners that preprocess data in the
+    same way, or `None` if preprocessing cannot be separated from fitting.
+    """
+    if not isinstance(learner, Learner) or not learner.preprocessors:
+        return None
+    return type(learner).preprocess, tuple(map(id, learner.preprocessors))
+
+
+class _PreprocessedLearner:
+    """
+    Learner that fits data that has already been preprocessed with the
+    preprocessors of the wrapped `learner`.
+    """
+    def __init__(self, learner, original_domain):
+        self.learner = copy.copy(learner)
+        self.learner.preprocessors = []
+        self.original_domain = original_domain
+
+    def __call__(self, data):
+        if not self.learner.check_learner_adequacy(self.original_domain):
+            raise ValueError(self.learner.learner_adequacy_err_msg)
+        model = self.learner(data)
+        model.original_domain = self.original_domain
+        return model
+
+
 def _mp_worker(fold_i, train_data, test_data, learner_i, learner,
-               store_models, mp_queue):
+               store_models):
     predicted, probs, model, failed = None, None, None, False
+    if isinstance(train_data, _SharedTable):
+        train_data = train_data.load()
+    if isinstance(test_data, _SharedTable):
+        test_data = test_data.load()
     try:
         if len(train_data) == 0 or len(test_data) == 0:
             raise RuntimeError('Test fold is empty')
@@ -38,7 +171,6 @@ def _mp_worker(fold_i, train_data, test_data, learner_i, learner,
     # Different models can fail at any time raising any exception
     except Exception as ex:  # pylint: disable=broad-except
         failed = ex
-    mp_queue.put("dummy text; use for printing when debugging")
     return _MpResults(fold_i, learner_i, store_models and model,
                       failed, len(test_data), predicted, probs)
 
@@ -122,7 +254,8 @@ class Results:
         :type callback: callable
         :param n_jobs: The number of processes to parallelize the evaluation
             on. -1 to parallelize on all but one CPUs. 1 for no
-            parallelization.
+            parallelization. Worker processes are kept alive and reused
+            by subsequent evaluations.
         :type n_jobs: int
         """
         self.store_data = store_data
@@ -317,7 +450,16 @@ class Results:
         self.prepare_arrays(test_data)
         self._prepare_arrays(test_data)
 
-        n_callbacks = len(self.learners) * len(self.indices)
+        fast = self._fast_predictions(train_data, test_data)
+        for learner_i, (values, probs) in fast.items():
+            self.predicted[learner_i] = values
+            if probs is not None:
+                self.probabilities[learner_i] = probs
+        learners = [(learner_i, learner)
+                    for learner_i, learner in enumerate(self.learners)
+                    if learner_i not in fast]
+
+        n_callbacks = len(learners) * len(self.indices)
         n_jobs = max(1, min(self.n_jobs, n_callbacks))
 
         def _is_picklable(obj):
@@ -326,7 +468,7 @@ class Results:
             except (AttributeError, TypeError, pickle.PicklingError):
                 return False
 
-        if n_jobs > 1 and not all(_is_picklable(learner) for learner in self.learners):
+        if n_jobs > 1 and not all(_is_picklable(learner) for _, learner in learners):
             n_jobs = 1
             warnings.warn("Not all arguments (learners) are picklable. "
                           "Setting n_jobs=1", OrangeWarning)
@@ -343,20 +485,23 @@ class Results:
         mp_ctx = mp.get_context(
             'forkserver' if sys.platform.startswith(('darwin', 'linux')) and n_jobs > 1 else None)
 
-        if n_jobs > 1 and mp_ctx.get_start_method() != 'fork' and train_data.X.size < 20e3:
+        # Starting processes is expensive; once the pool is running, though,
+        # it pays off to use it for small data as well
+        if n_jobs > 1 and mp_ctx.get_start_method() != 'fork' \
+                and train_data.X.size < 20e3 \
+                and not _WorkerPool.is_running(mp_ctx, n_jobs):
             n_jobs = 1
             warnings.warn("Working with small-enough data; single-threaded "
                           "sequential excecution will (probably) be faster. "
                           "Setting n_jobs=1", OrangeWarning)
 
-        try:
-            # Use context-adapted Queue or just the regular Queue if no
-            # multiprocessing (otherwise it shits itself at least on Windos)
-            mp_queue = mp_ctx.Manager().Queue() if n_jobs > 1 else mp.Queue()
-        except (EOFError, RuntimeError):
-            mp_queue = mp.Queue()
-            n_jobs = 1
-            warnings.warn('''
+        pool = None
+        if n_jobs > 1:
+            try:
+                pool = _WorkerPool.get(mp_ctx, n_jobs)
+            except (EOFError, RuntimeError):
+                n_jobs = 1
+                warnings.warn('''
 
         Can't run multiprocessing code without a __main__ guard.
 
@@ -377,42 +522,78 @@ class Results:
         to evaluation methods, i.e. {}(..., n_jobs=1). Setting n_jobs to 1.
             '''.format(self.__class__.__name__), OrangeWarning)
 
-        data_splits = (
-            (fold_i, self.preprocessor(train_data[train_i]), test_data[test_i])
-            for fold_i, (train_i, test_i) in enumerate(self.indices))
-
-        args_iter = (
-            (fold_i, train_data, test_data, learner_i, learner,
-             self.store_models, mp_queue)
-            # NOTE: If this nested for loop doesn't work, try
-            # itertools.product
-            for (fold_i, train_data, test_data) in data_splits
-            for (learner_i, learner) in enumerate(self.learners))
-
-        def _callback_percent(n_steps, queue):
-            """Block until one of the subprocesses completes, before
-            signalling callback with percent"""
-            for percent in np.linspace(.0, .99, n_steps + 1)[1:]:
-                queue.get()
+        # Learners that share preprocessors get the same preprocessed fold
+        keys = [_preprocessing_key(learner) for _, learner in learners]
+        shared_keys = {key for key in keys
+                       if key is not None and keys.count(key) > 1}
+
+        def _fold_tasks(fold_i, train, test, share):
+            preprocessed = {}
+            for key in shared_keys:
+                learner = learners[keys.index(key)][1]
                 try:
-                    self._callback(percent)
-                except Exception:
-                    # Callback may error for whatever reason (e.g. PEBKAC)
-                    # In that case, rather gracefully continue computation
-                    # instead of failing
+                    preprocessed[key] = learner.preprocess(train)
+                except Exception:  # pylint: disable=broad-except
+                    # Let the learners fail (and report it) by themselves
                     pass
+            n_raw = sum(key not in preprocessed for key in keys)
+            train_ref = share(train, n_raw)
+            test_ref = share(test, len(keys))
+            preprocessed_refs = {key: share(table, keys.count(key))
+                                 for key, table in preprocessed.items()}
+            for (learner_i, learner), key in zip(learners, keys):
+                if key in preprocessed:
+                    yield (fold_i, preprocessed_refs[key], test_ref,
+                           learner_i, _PreprocessedLearner(learner,
+                                                           train.domain),
+                           self.store_models)
+                else:
+                    yield (fold_i, train_ref, test_ref, learner_i, learner,
+                           self.store_models)
+
+        def _share(folder):
+            def share(table, n_tasks):
+                if folder is None or n_tasks < 2 \
+                        or _table_nbytes(table) < SHARED_TABLE_MIN_BYTES:
+                    return table
+                return _SharedTable(table, folder)
+            return share
+
+        def _args_iter(folder):
+            share = _share(folder)
+            if not learners:
+                return
+            for fold_i, (train_i, test_i) in enumerate(self.indices):
+                # Each fold is materialized (and preprocessed) only once
+                yield from _fold_tasks(
+                    fold_i, self.preprocessor(train_data[train_i]),
+                    test_data[test_i], share)
+
+        def _callback_percent(percent):
+            try:
+                self._callback(percent)
+            except Exception:
+                # Callback may error for whatever reason (e.g. PEBKAC)
+                # In that case, rather gracefully continue computation
+                # instead of failing
+                pass
 
         results = []
-        with joblib.Parallel(n_jobs=n_jobs, backend=mp_ctx) as parallel:
-            tasks = (joblib.delayed(_mp_worker)(*args) for args in args_iter)
-            # Start the tasks from another thread ...
-            thread = Thread(target=lambda: results.append(parallel(tasks)))
-            thread.start()
-            # ... so that we can update the GUI (callback) from the main thread
-            _callback_percent(n_callbacks, mp_queue)
-            thread.join()
-
-        results = sorted(results[0])
+        folder = _WorkerPool.folder if pool is not None else None
+        with tempfile.TemporaryDirectory(dir=folder) as folder:
+            if pool is not None:
+                # Results are received in the main thread, so that we can
+                # update the GUI (callback) as the subprocesses complete
+                results_iter = pool.imap_unordered(
+                    _mp_worker_args, _args_iter(folder))
+            else:
+                results_iter = (_mp_worker(*args) for args in _args_iter(None))
+            percents = np.linspace(.0, .99, n_callbacks + 1)[1:]
+            for percent, result in zip(percents, results_iter):
+                results.append(result)
+                _callback_percent(percent)
+
+        results = sorted(results)
 
         ptr, prev_fold_i, prev_n_values = 0, 0, 0
         for res in results:
@@ -436,6 +617,14 @@ class Results:
         self._callback(1)
         return self
 
+    def _fast_predictions(self, train_data, test_data):
+        """
+        Return a dictionary with predictions (values and probabilities) of
+        learners that can be tested without fitting a model for each fold.
+        Such learners are skipped by `fit`.
+        """
+        return {}
+
     def prepare_arrays(self, test_data):
         """Initialize arrays that will be used by `fit` method.
         """
@@ -545,6 +734,25 @@ class LeaveOneOut(Results):
     def setup_indices(self, train_data, test_data):
         self.indices = skl_cross_validation.LeaveOneOut(len(test_data))
 
+    def _fast_predictions(self, train_data, test_data):
+        # Models are not fitted, so they cannot be stored, and downdating
+        # cannot account for a preprocessor that is fitted on each fold
+        if self.store_models or self.preprocessor is not _identity \
+                or test_data is not train_data or len(train_data) < 2:
+            return {}
+        predictions = {}
+        for learner_i, learner in enumerate(self.learners):
+            if not isinstance(learner, Learner):
+                continue
+            try:
+                result = learner.leave_one_out(train_data)
+            except Exception:  # pylint: disable=broad-except
+                # Let the learner fail (and report it) in the usual way
+                result = None
+            if result is not None:
+                predictions[learner_i] = result
+        return predictions
+
     def prepare_arrays(self, test_data):
         # sped up version of super().prepare_arrays(data)
         self.row_indices = np.arange(len(test_data))
@@ -1,5 +1,8 @@
 """Common caching methods, using `lru_cache` sometimes has its downsides."""
+from collections import OrderedDict
 from functools import wraps, lru_cache
+from threading import RLock
+from time import monotonic
 import weakref
 
 
@@ -58,3 +61,100 @@ def memoize_method(*lru_args, **lru_kwargs):
         return _wrapped_func
 
     return _decorator
+
+
+class LRUCache:
+    """Least-recently-used cache whose capacity is bounded by the total size
+    of stored values rather than by their number.
+
+    Parameters
+    ----------
+    max_size : int
+        The maximal total size of stored values.
+    size_of : callable, optional
+        A function that returns the size of a value; by default every value
+        has size 1, so `max_size` limits the number of items.
+    ttl : float, optional
+        The number of seconds after which stored values expire; by default
+        they do not.
+
+    Attributes
+    ----------
+    hits : int
+        The number of successful lookups.
+    misses : int
+        The number of lookups that did not find the key.
+    """
+    def __init__(self, max_size, size_of=None, ttl=None):
+        self.max_size = max_size
+        self.size_of = size_of or (lambda value: 1)
+        self.ttl = ttl
+        self.size = 0
+        self.hits = self.misses = 0
+        self._items = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, key, default=None):
+        """Return the value for `key` and mark it as recently used, or
+        `default` if the key is not in the cache."""
+        with self._lock:
+            self._expire(key)
+            try:
+                value, *_ = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store the value and evict the least recently used items that
+        do not fit into the cache anymore. Values that are larger than the
+        cache itself are not stored."""
+        size = self.size_of(value)
+        with self._lock:
+            self.pop(key)
+            if size > self.max_size:
+                return
+            self._items[key] = (value, size, monotonic())
+            self.size += size
+            while self.size > self.max_size:
+                _, (_, evicted_size, _) = self._items.popitem(last=False)
+                self.size -= evicted_size
+
+    def pop(self, key, default=None):
+        """Remove the key from the cache and return its value."""
+        with self._lock:
+            if key not in self._items:
+                return default
+            value, size, _ = self._items.pop(key)
+            self.size -= size
+            return value
+
+    def _expire(self, key):
+        if self.ttl is not None and key in self._items \
+                and monotonic() - self._items[key][2] > self.ttl:
+            self.pop(key)
+
+    def clear(self):
+        """Remove all items and reset the statistics."""
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Return a dictionary with the number of hits, misses, items and
+        the total size of stored values."""
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses,
+                        items=len(self._items), size=self.size)
+
+    def __contains__(self, key):
+        with self._lock:
+            self._expire(key)
+            return key in self._items
+
+    def __len__(self):
+        return len(self._items)
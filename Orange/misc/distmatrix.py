@@ -1,11 +1,67 @@
+import json
+import struct
+
 import numpy as np
+from scipy.spatial.distance import squareform
 
 from Orange.data import Table, StringVariable, Domain
 from Orange.data.io import detect_encoding
 from Orange.util import deprecated
 
+# Files in the binary format of condensed matrices start with this line
+BINARY_MAGIC = b"#Orange condensed distances 1\n"
+# Distances in binary files are aligned to this number of bytes
+BINARY_ALIGNMENT = 64
+# Elements of condensed matrices are indexed in blocks of this size
+INDEX_BLOCK_SIZE = 2 ** 16
+
+
+def _labels_table(labels):
+    return Table.from_list(Domain([], metas=[StringVariable("label")]),
+                           [[item] for item in labels])
+
+
+def _is_binary_file(filename):
+    with open(filename, "rb") as fle:
+        return fle.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+class DistMatrixBase:
+    """
+    The common base of dense (:obj:`DistMatrix`) and condensed
+    (:obj:`CondensedDistMatrix`) distance matrices; widgets that accept
+    either declare this type for their inputs.
+    """
+    @staticmethod
+    def _trivial_labels(items):
+        return items and \
+               isinstance(items, Table) and \
+               len(items.domain.metas) == 1 and \
+               isinstance(items.domain.metas[0], StringVariable)
+
+    def has_row_labels(self):
+        """
+        Returns `True` if row labels can be automatically determined from data
+
+        For this, the `row_items` must be an instance of ``Orange.data.Table`
+        whose domain contains a single meta attribute, which has to be a string.
+        The domain may contain other variables, but not meta attributes.
+        """
+        return self._trivial_labels(self.row_items)
+
+    def has_col_labels(self):
+        """
+        Returns `True` if column labels can be automatically determined from
+        data
+
+        For this, the `col_items` must be an instance of ``Orange.data.Table`
+        whose domain contains a single meta attribute, which has to be a string.
+        The domain may contain other variables, but not meta attributes.
+        """
+        return self._trivial_labels(self.col_items)
+
 
-class DistMatrix(np.ndarray):
+class DistMatrix(np.ndarray, DistMatrixBase):
     """
     Distance matrix. Extends ``numpy.ndarray``.
 
@@ -85,6 +141,23 @@ class DistMatrix(np.ndarray):
     def flat(self):
         return self[np.triu_indices(self.shape[0], 1)]
 
+    def condensed(self):
+        """
+        Return the matrix in the condensed form, which stores only the
+        distances above the diagonal.
+
+        The matrix must be symmetric; the diagonal is assumed to be zero.
+
+        Returns:
+            CondensedDistMatrix
+        """
+        if self.shape[0] != self.shape[1] or \
+                not np.allclose(self, self.T, equal_nan=True):
+            raise ValueError("only symmetric matrices can be condensed")
+        return CondensedDistMatrix(
+            squareform(np.asarray(self), checks=False),
+            self.row_items, self.col_items, self.axis)
+
     def submatrix(self, row_items, col_items=None):
         """
         Return a submatrix
@@ -137,9 +210,18 @@ class DistMatrix(np.ndarray):
         symmetric, the file contains the lower triangle; any data above the
         diagonal is ignored.
 
+        Files in the binary format of
+        :obj:`~Orange.misc.distmatrix.CondensedDistMatrix.save` are also
+        recognized; they are read into a dense matrix. Use
+        :obj:`~Orange.misc.distmatrix.CondensedDistMatrix.from_file` to
+        read them without densifying.
+
         Args:
             filename: file name
         """
+        if _is_binary_file(filename):
+            return CondensedDistMatrix.from_file(filename, mmap_mode=None) \
+                .dense()
         with open(filename, encoding=detect_encoding(filename)) as fle:
             line = fle.readline()
             if not line:
@@ -201,43 +283,11 @@ class DistMatrix(np.ndarray):
                     if symmetric:
                         matrix[j, i] = matrix[i, j]
         if col_labels:
-            col_labels = Table.from_list(
-                Domain([], metas=[StringVariable("label")]),
-                [[item] for item in col_labels])
+            col_labels = _labels_table(col_labels)
         if row_labels:
-            row_labels = Table.from_list(
-                Domain([], metas=[StringVariable("label")]),
-                [[item] for item in row_labels])
+            row_labels = _labels_table(row_labels)
         return cls(matrix, row_labels, col_labels, axis)
 
-    @staticmethod
-    def _trivial_labels(items):
-        return items and \
-               isinstance(items, Table) and \
-               len(items.domain.metas) == 1 and \
-               isinstance(items.domain.metas[0], StringVariable)
-
-    def has_row_labels(self):
-        """
-        Returns `True` if row labels can be automatically determined from data
-
-        For this, the `row_items` must be an instance of ``Orange.data.Table`
-        whose domain contains a single meta attribute, which has to be a string.
-        The domain may contain other variables, but not meta attributes.
-        """
-        return self._trivial_labels(self.row_items)
-
-    def has_col_labels(self):
-        """
-        Returns `True` if column labels can be automatically determined from
-        data
-
-        For this, the `col_items` must be an instance of ``Orange.data.Table`
-        whose domain contains a single meta attribute, which has to be a string.
-        The domain may contain other variables, but not meta attributes.
-        """
-        return self._trivial_labels(self.col_items)
-
     def save(self, filename):
         """
         Save the distance matrix to a file in the file format described at
@@ -269,3 +319,229 @@ class DistMatrix(np.ndarray):
                     fle.write("\t".join(map(str, row[:i + 1])) + "\n")
                 else:
                     fle.write("\t".join(map(str, row)) + "\n")
+
+
+class CondensedDistMatrix(DistMatrixBase):
+    """
+    Symmetric distance matrix with a zero diagonal, stored in condensed form.
+
+    Only the `n * (n - 1) / 2` distances above the diagonal are stored, row
+    by row, in a 1-d array (as in `scipy.spatial.distance.squareform`). The
+    array can be a `numpy.memmap` of a file saved with :obj:`save`, so that
+    matrices larger than the memory can be used.
+
+    Indexing returns elements, rows or submatrices, which are computed from
+    the condensed distances; `numpy.asarray` or :obj:`dense` return the
+    dense matrix.
+
+    .. attribute:: flat
+
+        Distances above the diagonal.
+
+    .. attribute:: row_items
+
+        Items corresponding to matrix rows.
+
+    .. attribute:: col_items
+
+        Items corresponding to matrix columns.
+
+    .. attribute:: axis
+
+        If axis=1 we calculate distances between rows,
+        if axis=0 we calculate distances between columns.
+    """
+    def __init__(self, data, row_items=None, col_items=None, axis=1):
+        """Construct a distance matrix from condensed distances.
+
+        :param data: Distances above the diagonal
+        :type data: 1-d numpy array
+        :param row_items: Items in matrix rows
+        :type row_items: `Orange.data.Table` or `Orange.data.Instance`
+        :param col_items: Items in matrix columns
+        :type col_items: `Orange.data.Table` or `Orange.data.Instance`
+        :param axis: The axis along which the distances are calculated
+        :type axis: int
+        """
+        if not isinstance(data, np.ndarray):
+            data = np.asarray(data, dtype=float)
+        if data.ndim != 1:
+            raise ValueError("condensed distances must be a 1-d array")
+        n = int(np.ceil(np.sqrt(2 * len(data))))
+        if n * (n - 1) // 2 != len(data):
+            raise ValueError("invalid number of condensed distances")
+        self.flat = data
+        self.dim = max(n, 1)
+        self.row_items = row_items
+        self.col_items = col_items
+        self.axis = axis
+
+    @property
+    def shape(self):
+        return self.dim, self.dim
+
+    @property
+    def dtype(self):
+        return self.flat.dtype
+
+    def __len__(self):
+        return self.dim
+
+    def __array__(self, dtype=None):
+        matrix = squareform(self.flat, checks=False)
+        return matrix if dtype is None else matrix.astype(dtype)
+
+    def dense(self):
+        """Return the matrix as :obj:`DistMatrix`."""
+        return DistMatrix(np.asarray(self),
+                          self.row_items, self.col_items, self.axis)
+
+    def _indices(self, index):
+        if isinstance(index, slice):
+            return np.arange(self.dim)[index]
+        index = np.asarray(index)
+        if index.dtype == bool:
+            return np.flatnonzero(index)
+        if not np.issubdtype(index.dtype, np.integer):
+            raise IndexError("indices must be integers")
+        if index.size and \
+                (index.min() < -self.dim or index.max() >= self.dim):
+            raise IndexError("index out of range")
+        return index % self.dim
+
+    def __getitem__(self, index):
+        if not isinstance(index, tuple):
+            index = (index, slice(None))
+        if len(index) != 2:
+            raise IndexError("too many indices")
+        rows, cols = map(self._indices, index)
+        # Slices combine with other indices into submatrices, like in numpy
+        if (isinstance(index[0], slice) or isinstance(index[1], slice)) \
+                and rows.ndim and cols.ndim:
+            rows, cols = np.ix_(rows, cols)
+        rows, cols = np.broadcast_arrays(rows, cols)
+        if rows.ndim != 2 or rows.size <= INDEX_BLOCK_SIZE:
+            values = self._elements(rows, cols)
+            return values if values.ndim else values[()]
+        # Submatrices are computed by blocks of rows, so that temporary
+        # arrays of indices are not larger than the result
+        values = np.empty(rows.shape, dtype=self.dtype)
+        step = max(1, INDEX_BLOCK_SIZE // rows.shape[1])
+        for start in range(0, len(rows), step):
+            values[start:start + step] = self._elements(
+                rows[start:start + step], cols[start:start + step])
+        return values
+
+    def _elements(self, rows, cols):
+        lo, hi = np.minimum(rows, cols), np.maximum(rows, cols)
+        # Position of (lo, hi) in condensed distances; for the diagonal, it
+        # is still within the bounds and the value is replaced with zero
+        pos = self.dim * lo - lo * (lo + 1) // 2 + hi - lo - 1
+        if len(self.flat):
+            return np.where(lo == hi, 0, self.flat[pos]).astype(self.dtype)
+        else:
+            return np.zeros(lo.shape, dtype=self.dtype)
+
+    def diagonal(self):
+        return np.zeros(self.dim, dtype=self.dtype)
+
+    def max(self):
+        return max(self.flat.max(), 0) if len(self.flat) else 0
+
+    def min(self):
+        return min(self.flat.min(), 0) if len(self.flat) else 0
+
+    def submatrix(self, row_items, col_items=None):
+        """
+        Return a submatrix; if columns are not given or are the same as rows,
+        the submatrix is also condensed.
+
+        Args:
+            row_items: indices of rows
+            col_items: incides of columns
+        """
+        if col_items is not None and \
+                not np.array_equal(row_items, col_items):
+            return self.dense().submatrix(row_items, col_items)
+        indices = self._indices(row_items)
+        i, j = np.triu_indices(len(indices), 1)
+        row_items = self.row_items[indices] \
+            if self.row_items is not None else None
+        if self.col_items is None:
+            col_items = None
+        elif self.col_items is self.row_items:
+            col_items = row_items
+        else:
+            col_items = self.col_items[indices]
+        return CondensedDistMatrix(self[indices[i], indices[j]],
+                                   row_items, col_items, self.axis)
+
+    @classmethod
+    def from_file(cls, filename, mmap_mode="r"):
+        """
+        Load a condensed distance matrix from a file in the binary format
+        described at :obj:`save`.
+
+        Args:
+            filename: file name
+            mmap_mode: the mode for `numpy.memmap` of distances; if `None`,
+                distances are read into memory
+        """
+        with open(filename, "rb") as fle:
+            if fle.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+                raise ValueError("not a file with condensed distances")
+            header_size, = struct.unpack("<Q", fle.read(8))
+            header = json.loads(fle.read(header_size).decode("utf-8"))
+            offset = fle.tell()
+            dtype = np.dtype(header["dtype"])
+            n = header["dim"]
+            size = n * (n - 1) // 2
+            if mmap_mode is None or not size:
+                data = np.fromfile(fle, dtype=dtype, count=size)
+                if len(data) != size:
+                    raise ValueError("file is truncated")
+        if mmap_mode is not None and size:
+            data = np.memmap(filename, dtype=dtype, mode=mmap_mode,
+                             offset=offset, shape=(size,))
+        row_labels, col_labels = header["row_labels"], header["col_labels"]
+        if row_labels is not None:
+            row_labels = _labels_table(row_labels)
+        if col_labels is not None:
+            col_labels = _labels_table(col_labels)
+        return cls(data, row_labels, col_labels, header["axis"])
+
+    def save(self, filename):
+        """
+        Save the distance matrix to a file in a binary format.
+
+        The file starts with a line with a magic string, followed by the
+        size of the header as an 8-byte little-endian integer. The header is
+        a utf-8 encoded JSON object with the dimension (`dim`), numpy type of
+        distances (`dtype`), `axis`, and lists of row and column labels
+        (`row_labels`, `col_labels`) or `null`. The header is padded with
+        spaces, so that condensed distances, which follow it, are aligned
+        for memory mapping.
+
+        Args:
+            filename: file name
+        """
+        def labels(items):
+            return [str(e.metas[0]) for e in items]
+
+        header = json.dumps(dict(
+            dim=self.dim, dtype=self.dtype.str, axis=self.axis,
+            row_labels=labels(self.row_items) if self.has_row_labels()
+            else None,
+            col_labels=labels(self.col_items) if self.has_col_labels()
+            else None)).encode("utf-8")
+        header += b" " * (-(len(BINARY_MAGIC) + 8 + len(header))
+                          % BINARY_ALIGNMENT)
+        with open(filename, "wb") as fle:
+            fle.write(BINARY_MAGIC)
+            fle.write(struct.pack("<Q", len(header)))
+            fle.write(header)
+            # Write in chunks, so that memory-mapped distances are not
+            # read into memory at once
+            chunk = 2 ** 20
+            for start in range(0, len(self.flat), chunk):
+                np.ascontiguousarray(self.flat[start:start + chunk]).tofile(fle)
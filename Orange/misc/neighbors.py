@@ -0,0 +1,164 @@
+"""Indices for finding the nearest neighbours of data instances."""
+import numpy as np
+import scipy.sparse as sp
+from scipy.spatial import cKDTree
+
+# The memory (in bytes) for differences between queries and candidates
+# for neighbours that are computed at the same time in approximate search
+MAX_BLOCK_MEMORY = 2 ** 24
+
+
+class NeighborIndex:
+    """
+    Index of rows of a data matrix for finding their nearest neighbours.
+
+    Rows are put into a k-d tree (`scipy.spatial.cKDTree`), in which exact
+    neighbours are found in time that is logarithmic in the number of rows
+    when the number of columns is small. With `approximate=True`, the tree
+    is built on a random projection of rows to `n_components` dimensions.
+    It gives `oversample` times more candidates than the number of requested
+    neighbours; candidates are then ranked by their distances in the
+    original space. Queries thus remain fast for data with many columns, at
+    the cost of missing some of the nearest neighbours.
+
+    Supported metrics are "euclidean", "manhattan", "chebyshev" and
+    "mahalanobis". Mahalanobis distances are Euclidean distances between
+    rows that are whitened with the covariance matrix given as `V` in
+    `metric_params` or, if it is not given, the covariance matrix of data.
+
+    Args:
+        X (np.ndarray): data
+        metric (str): distance metric
+        metric_params (dict): parameters of the metric
+        approximate (bool): if True, neighbours are approximate
+        n_components (int): the dimension of the random projection
+        oversample (int): the number of candidates per neighbour
+        random_state (int): the seed for the random projection
+        leafsize (int): the maximal number of rows in leaves of the tree
+    """
+    METRICS = {"euclidean": 2, "manhattan": 1, "chebyshev": np.inf,
+               "mahalanobis": 2}
+
+    def __init__(self, X, metric="euclidean", metric_params=None,
+                 approximate=False, n_components=10, oversample=10,
+                 random_state=0, leafsize=16):
+        if sp.issparse(X):
+            raise TypeError("Neighbor index does not support sparse data.")
+        if metric not in self.METRICS:
+            raise ValueError("Unsupported metric '{}'.".format(metric))
+        X = np.asarray(X, dtype=float)
+        if X.ndim != 2:
+            raise ValueError("Data must be a 2-d array.")
+        if np.isnan(X).any():
+            raise ValueError("Data contains missing values.")
+        self.metric = metric
+        self.p = self.METRICS[metric]
+        self.whitening = None
+        if metric == "mahalanobis":
+            V = (metric_params or {}).get("V")
+            if V is None:
+                V = np.cov(X.T)
+            # For VI = L L^T, (x - y)^T VI (x - y) equals |L^T (x - y)|^2
+            self.whitening = np.linalg.cholesky(
+                np.linalg.inv(np.atleast_2d(V)))
+            X = X.dot(self.whitening)
+        self.X = X
+        self.approximate = approximate and X.shape[1] > n_components
+        self.oversample = oversample
+        if self.approximate:
+            random = np.random.RandomState(random_state)
+            self.projection = random.normal(
+                size=(X.shape[1], n_components)) / np.sqrt(n_components)
+            self.tree = cKDTree(X.dot(self.projection), leafsize)
+        else:
+            self.projection = None
+            self.tree = cKDTree(X, leafsize)
+
+    def __len__(self):
+        return len(self.X)
+
+    def query(self, X, k=1, n_jobs=1):
+        """
+        Return the `k` nearest indexed rows for each row of `X`.
+
+        Args:
+            X (np.ndarray): data
+            k (int): the number of neighbours
+            n_jobs (int): the number of threads for the search in the tree
+
+        Returns:
+            tuple of (np.ndarray, np.ndarray): distances and indices of
+            neighbours; both have a row for each row of `X`, sorted by
+            distances
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        if self.whitening is not None:
+            X = X.dot(self.whitening)
+        return self._query(X, k, n_jobs)
+
+    def query_rows(self, rows, k=1, n_jobs=1):
+        """
+        Return the `k` nearest neighbours of indexed rows, excluding the
+        rows themselves.
+
+        Args:
+            rows (np.ndarray): indices of rows
+            k (int): the number of neighbours
+            n_jobs (int): the number of threads for the search in the tree
+
+        Returns:
+            tuple of (np.ndarray, np.ndarray): distances and indices of
+            neighbours; both have a row for each of `rows`, sorted by
+            distances
+        """
+        rows = np.asarray(rows, dtype=int).reshape(-1)
+        dist, ind = self._query(self.X[rows], k + 1, n_jobs)
+        keep = ind != rows[:, None]
+        # A row is not among its neighbours if it has more than k duplicates
+        # or if neighbours are approximate; drop the furthest neighbour then
+        keep[keep.all(axis=1), -1] = False
+        shape = (len(rows), k)
+        return dist[keep].reshape(shape), ind[keep].reshape(shape)
+
+    def kneighbors_graph(self, k, include_self=True, n_jobs=1):
+        """
+        Return the connectivity matrix of the graph in which each row is
+        connected with its `k` nearest neighbours.
+
+        Args:
+            k (int): the number of neighbours
+            include_self (bool): if True, rows are their own neighbours
+            n_jobs (int): the number of threads for the search in the tree
+
+        Returns:
+            scipy.sparse.csr_matrix: connectivity matrix
+        """
+        n = len(self)
+        if include_self:
+            _, ind = self._query(self.X, k, n_jobs)
+        else:
+            _, ind = self.query_rows(np.arange(n), k, n_jobs)
+        return sp.csr_matrix((np.ones(n * k), ind.ravel(),
+                              np.arange(0, n * k + 1, k)), shape=(n, n))
+
+    def _query(self, X, k, n_jobs):
+        if k > len(self):
+            raise ValueError("There are fewer than {} rows.".format(k))
+        n = len(X)
+        if not self.approximate:
+            dist, ind = self.tree.query(X, k, p=self.p, n_jobs=n_jobs)
+            return dist.reshape(n, k), ind.reshape(n, k)
+
+        n_candidates = min(k * self.oversample, len(self))
+        _, candidates = self.tree.query(
+            X.dot(self.projection), n_candidates, n_jobs=n_jobs)
+        candidates = candidates.reshape(n, n_candidates)
+        dist = np.empty(candidates.shape)
+        block = max(1, MAX_BLOCK_MEMORY // (8 * n_candidates * X.shape[1]))
+        for start in range(0, n, block):
+            stop = start + block
+            diff = self.X[candidates[start:stop]] - X[start:stop, None]
+            dist[start:stop] = np.linalg.norm(diff, ord=self.p, axis=2)
+        order = np.argsort(dist, axis=1, kind="mergesort")[:, :k]
+        rows = np.arange(n)[:, None]
+        return dist[rows, order], candidates[rows, order]
@@ -133,10 +133,10 @@ cdef void k_nearest_reg(arr_f2_t X,
                         arr_f1_t Nca) nogil:
     """The k-nearest search for RReliefF."""
     cdef:
-        Py_ssize_t j, a, _
+        Py_ssize_t j, _
         # The heap that gets "sorted"
         vector[HeapPair] nearest = vector[HeapPair]()
-        double cls_diff, difference_sum = 0
+        double difference_sum = 0
 
         # Pleasure yourself with the following mystery:
         #
@@ -175,13 +175,33 @@ cdef void k_nearest_reg(arr_f2_t X,
         nearest.pop_back()
 
         j = nearest.front().second
-        cls_diff = fabs(y[i] - y[j])
-        Nc[0] += cls_diff * influence
-        # Recalculate the distance that was thrown away before
-        calc_difference(X, y, i, j, is_discrete, attr_stats, contingencies, difference, &difference_sum)
-        for a in range(X.shape[1]):
-            Na[a] += difference[a] * influence
-            Nca[a] += cls_diff * difference[a] * influence
+        update_reg_counts(X, y, i, j, influence, is_discrete, attr_stats,
+                          contingencies, difference, Nc, Na, Nca)
+
+
+cdef inline void update_reg_counts(arr_f2_t X,
+                                   arr_f1_t y,
+                                   Py_ssize_t i,
+                                   Py_ssize_t j,
+                                   double influence,
+                                   arr_i1_t is_discrete,
+                                   arr_f2_t attr_stats,
+                                   Contingencies &contingencies,
+                                   arr_f1_t difference,
+                                   double * Nc,
+                                   arr_f1_t Na,
+                                   arr_f1_t Nca) nogil:
+    """Update the counts of RReliefF with the j-th neighbor of i-th instance."""
+    cdef:
+        Py_ssize_t a
+        double cls_diff, difference_sum = 0
+    cls_diff = fabs(y[i] - y[j])
+    Nc[0] += cls_diff * influence
+    # Recalculate the distance that was thrown away before
+    calc_difference(X, y, i, j, is_discrete, attr_stats, contingencies, difference, &difference_sum)
+    for a in range(X.shape[1]):
+        Na[a] += difference[a] * influence
+        Nca[a] += cls_diff * difference[a] * influence
 
 
 cdef void k_nearest_per_class(arr_f2_t X,
@@ -272,8 +292,7 @@ cdef arr_f1_t _relieff_cls_(arr_f2_t X,
     The main loop of the ReliefF for classification (ibid. §2.1, Figure 2).
     """
     cdef:
-        double p
-        Py_ssize_t cls, a, i, _, yi
+        Py_ssize_t a, i, _
         arr_f1_t weights = np.zeros(X.shape[1])
         arr_f2_t weights_adj = np.empty((n_classes, X.shape[1]))
         arr_f1_t difference = np.empty(X.shape[1])
@@ -289,19 +308,103 @@ cdef arr_f1_t _relieff_cls_(arr_f2_t X,
             k_nearest_per_class(X, y, i, k_nearest, n_classes,
                                 is_discrete, attr_stats, contingencies, weights_adj, difference)
             # Update the weights for each class
-            yi = <Py_ssize_t>y[i]
-            for a in range(X.shape[1]):
-                weights[a] -= weights_adj[yi, a]
+            update_cls_weights(weights, weights_adj, <Py_ssize_t>y[i],
+                               n_classes, prior_proba)
+        for a in range(X.shape[1]):
+            weights[a] /= (n_iter * k_nearest)
+    return weights
+
+
+cdef inline void update_cls_weights(arr_f1_t weights,
+                                    arr_f2_t weights_adj,
+                                    Py_ssize_t yi,
+                                    Py_ssize_t n_classes,
+                                    arr_f1_t prior_proba) nogil:
+    """Update weights of ReliefF with adjustments of neighbors of an
+    instance of class `yi`."""
+    cdef:
+        Py_ssize_t a, cls
+        double p
+    for a in range(weights.shape[0]):
+        weights[a] -= weights_adj[yi, a]
+    for cls in range(n_classes):
+        if cls == yi: continue
+        p = prior_proba[cls] / (1 - prior_proba[yi])
+        for a in range(weights.shape[0]):
+            weights[a] += p * weights_adj[cls, a]
+
+
+cdef arr_f1_t _relieff_cls_neighbors_(arr_f2_t X,
+                                      arr_f1_t y,
+                                      int n_classes,
+                                      np.intp_t[:] instances,
+                                      np.intp_t[:, :, :] neighbors,
+                                      arr_i1_t is_discrete,
+                                      arr_f1_t prior_proba,
+                                      arr_f2_t attr_stats,
+                                      Contingencies &contingencies):
+    """
+    The main loop of the ReliefF for classification, with the nearest
+    neighbors of instances given in advance.
+    """
+    cdef:
+        Py_ssize_t cls, a, i, j, t, nn
+        Py_ssize_t n_iter = instances.shape[0], k_nearest = neighbors.shape[2]
+        double difference_sum = 0
+        arr_f1_t weights = np.zeros(X.shape[1])
+        arr_f2_t weights_adj = np.empty((n_classes, X.shape[1]))
+        arr_f1_t difference = np.empty(X.shape[1])
+    with nogil:
+        for t in range(n_iter):
+            weights_adj[:, :] = 0
+            i = instances[t]
             for cls in range(n_classes):
-                if cls == yi: continue
-                p = prior_proba[cls] / (1 - prior_proba[yi])
-                for a in range(X.shape[1]):
-                    weights[a] += p * weights_adj[cls, a]
+                for nn in range(k_nearest):
+                    j = neighbors[t, cls, nn]
+                    if j < 0: continue
+                    calc_difference(X, y, i, j, is_discrete, attr_stats, contingencies, difference, &difference_sum)
+                    for a in range(X.shape[1]):
+                        weights_adj[cls, a] += difference[a]
+            update_cls_weights(weights, weights_adj, <Py_ssize_t>y[i],
+                               n_classes, prior_proba)
         for a in range(X.shape[1]):
             weights[a] /= (n_iter * k_nearest)
     return weights
 
 
+cdef arr_f1_t _relieff_reg_neighbors_(arr_f2_t X,
+                                      arr_f1_t y,
+                                      np.intp_t[:] instances,
+                                      np.intp_t[:, :] neighbors,
+                                      arr_i1_t is_discrete,
+                                      arr_f2_t attr_stats,
+                                      Contingencies &contingencies):
+    """
+    The main loop of the RReliefF for regression, with the nearest
+    neighbors of instances given in advance.
+    """
+    cdef:
+        Py_ssize_t a, t, nn
+        Py_ssize_t n_iter = instances.shape[0], k_nearest = neighbors.shape[1]
+        double Nc = 0
+        # See k_nearest_reg for the choice of influence
+        double influence = 1. / k_nearest / 5
+        arr_f1_t Na = np.zeros(X.shape[1])
+        arr_f1_t Nca = np.zeros(X.shape[1])
+
+        arr_f1_t weights = np.empty(X.shape[1])
+        arr_f1_t difference = np.empty(X.shape[1])
+    with nogil:
+        for t in range(n_iter):
+            for nn in range(k_nearest):
+                update_reg_counts(X, y, instances[t], neighbors[t, nn],
+                                  influence, is_discrete, attr_stats,
+                                  contingencies, difference, &Nc, Na, Nca)
+        for a in range(X.shape[1]):
+            weights[a] = Nca[a] / Nc - (Na[a] - Nca[a]) / (n_iter - Nc)
+    return weights
+
+
 cdef inline void _contingency_table(np.ndarray x1,
                                     int n_unique1,
                                     np.ndarray x2,
@@ -405,3 +508,50 @@ cpdef arr_f1_t rrelieff(np.ndarray X,
     y = (y - np.min(y)) / np.ptp(y)
     return _relieff_reg_(X, y, n_iter, k_nearest,
                          is_discrete, attr_stats, contingencies)
+
+
+cpdef arr_f1_t relieff_neighbors(np.ndarray X,
+                                 np.ndarray y,
+                                 np.ndarray instances,
+                                 np.ndarray neighbors,
+                                 np.ndarray is_discrete):
+    """
+    Score attributes of `X` according to ReliefF and return their weights.
+
+    Instances with indices `instances` are used in iterations.
+    `neighbors[t, c]` contains indices of the nearest instances of class `c`
+    to instance `instances[t]`, padded with -1. Class values must be defined.
+    """
+    cdef:
+        Contingencies contingencies = Contingencies()
+    X, y, attr_stats, is_discrete = prepare(X, y, is_discrete, contingencies)
+    prior_proba = np.bincount(y.astype(int)).astype(np.float64) / len(y)
+    n_classes = int(nanmax(y) + 1)
+    return _relieff_cls_neighbors_(
+        X, y, n_classes,
+        np.asarray(instances, dtype=np.intp),
+        np.asarray(neighbors, dtype=np.intp),
+        is_discrete, prior_proba, attr_stats, contingencies)
+
+
+cpdef arr_f1_t rrelieff_neighbors(np.ndarray X,
+                                  np.ndarray y,
+                                  np.ndarray instances,
+                                  np.ndarray neighbors,
+                                  np.ndarray is_discrete):
+    """
+    Score attributes of `X` according to RReliefF and return their weights.
+
+    Instances with indices `instances` are used in iterations.
+    `neighbors[t]` contains indices of the nearest instances to instance
+    `instances[t]`. Class values must be defined.
+    """
+    cdef:
+        Contingencies contingencies = Contingencies()
+    X, y, attr_stats, is_discrete = prepare(X, y, is_discrete, contingencies)
+    y = (y - np.min(y)) / np.ptp(y)
+    return _relieff_reg_neighbors_(
+        X, y,
+        np.asarray(instances, dtype=np.intp),
+        np.asarray(neighbors, dtype=np.intp),
+        is_discrete, attr_stats, contingencies)
@@ -108,6 +108,17 @@ class Discretization:
             "Subclasses of 'Discretization' need to implement "
             "the call operator")
 
+    def discretize_all(self, data, attributes):
+        """
+        Compute discretizations of the given variables on the given data and
+        return a list of new variables.
+
+        The default implementation calls the discretization for each
+        variable. Derived classes can override it to compute statistics
+        for all variables in a single pass through the data.
+        """
+        return [self(data, attribute) for attribute in attributes]
+
 
 class EqualFreq(Discretization):
     """Discretization into bins with approximately equal number of data
@@ -137,6 +148,17 @@ class EqualFreq(Discretization):
         return Discretizer.create_discretized_var(
             data.domain[attribute], points)
 
+    def discretize_all(self, data, attributes):
+        # Subclasses that override the call operator are called per variable
+        if type(data) == SqlTable or \
+                type(self).__call__ is not EqualFreq.__call__:
+            return super().discretize_all(data, attributes)
+        dists = distribution.get_distributions_for_columns(data, attributes)
+        return [Discretizer.create_discretized_var(
+                    data.domain[attribute],
+                    _discretize.split_eq_freq(d, self.n))
+                for attribute, d in zip(attributes, dists)]
+
 
 class EqualWidth(Discretization):
     """Discretization into a fixed number of bins with equal widths.
@@ -194,6 +216,16 @@ class EntropyMDL(Discretization):
 
     def __call__(self, data, attribute):
         cont = contingency.get_contingency(data, attribute)
+        return self._discretized_var(data.domain[attribute], cont)
+
+    def discretize_all(self, data, attributes):
+        if type(self).__call__ is not EntropyMDL.__call__:
+            return super().discretize_all(data, attributes)
+        conts = contingency.get_contingencies_for_columns(data, attributes)
+        return [self._discretized_var(data.domain[attribute], cont)
+                for attribute, cont in zip(attributes, conts)]
+
+    def _discretized_var(self, variable, cont):
         values, I = cont.values, cont.counts.T
         cut_ind = np.array(self._entropy_discretize_sorted(I, self.force))
         if len(cut_ind) > 0:
@@ -201,8 +233,7 @@ class EntropyMDL(Discretization):
             points = (values[cut_ind] + values[cut_ind - 1]) / 2.
         else:
             points = []
-        return Discretizer.create_discretized_var(
-            data.domain[attribute], points)
+        return Discretizer.create_discretized_var(variable, points)
 
     @classmethod
     def _normalize(cls, X, axis=None, out=None):
@@ -415,13 +446,22 @@ class DomainDiscretizer:
         """
 
         def transform_list(s, fixed=None):
+            fixed = fixed or {}
+            # Discretize variables without fixed ranges together
+            to_discretize = [var for var in s
+                             if var.is_continuous and var.name not in fixed]
+            discretize_all = getattr(method, "discretize_all", None)
+            if discretize_all is not None:
+                discretized = iter(discretize_all(data, to_discretize))
+            else:
+                discretized = (method(data, var) for var in to_discretize)
             new_vars = []
             for var in s:
                 if var.is_continuous:
-                    if fixed and var.name in fixed.keys():
+                    if var.name in fixed:
                         nv = method(data, var, fixed)
                     else:
-                        nv = method(data, var)
+                        nv = next(discretized)
                     if not self.clean or len(nv.values) > 1:
                         new_vars.append(nv)
                 else:
@@ -30,6 +30,13 @@ class ReplaceUnknowns(Transformation):
         else:
             return numpy.where(numpy.isnan(c), self.value, c)
 
+    @classmethod
+    def transform_columns(cls, transformations, c):
+        if cls.transform is not ReplaceUnknowns.transform:
+            return super().transform_columns(transformations, c)
+        values = numpy.array([t.value for t in transformations], dtype=float)
+        return numpy.where(numpy.isnan(c), values, c)
+
 
 class BaseImputeMethod:
     name = ""
@@ -224,6 +231,12 @@ class IsDefined(Transformation):
     def transform(self, c):
         return ~numpy.isnan(c)
 
+    @classmethod
+    def transform_columns(cls, transformations, c):
+        if cls.transform is not IsDefined.transform:
+            return super().transform_columns(transformations, c)
+        return ~numpy.isnan(c)
+
 
 class Lookup(Lookup):
     def __init__(self, variable, lookup_table, unknown=None):
@@ -241,6 +254,15 @@ class Lookup(Lookup):
         values = self.lookup_table[numpy.array(column_valid, dtype=int)]
         return numpy.where(mask, unknown, values)
 
+    @classmethod
+    def transform_columns(cls, transformations, c):
+        if cls.transform is not Lookup.transform:
+            return super().transform_columns(transformations, c)
+        unknowns = numpy.array(
+            [numpy.nan if t.unknown is None else t.unknown
+             for t in transformations], dtype=float)
+        return cls.lookup_columns(transformations, c, unknowns)
+
 
 class AsValue(BaseImputeMethod):
     name = "As a distinct value"
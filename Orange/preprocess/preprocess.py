@@ -4,6 +4,7 @@ Preprocess
 
 """
 import numpy as np
+import scipy.sparse as sp
 import sklearn.preprocessing as skl_preprocessing
 import bottleneck as bn
 
@@ -14,7 +15,7 @@ from ..misc.enum import Enum
 
 __all__ = ["Continuize", "Discretize", "Impute", "SklImpute",
            "Normalize", "Randomize", "RemoveNaNClasses",
-           "ProjectPCA", "ProjectCUR"]
+           "ProjectPCA", "ProjectCUR", "FittedPipeline"]
 
 
 class Preprocess:
@@ -41,6 +42,18 @@ class Preprocess:
     def __call__(self, data):
         raise NotImplementedError("Subclasses need to implement __call__")
 
+    def fit(self, data):
+        """
+        Fit the preprocessor to the data and return a :obj:`FittedPipeline`,
+        which applies the same transformation to other data.
+
+        Parameters
+        ----------
+        data : Orange.data.Table
+            Data for computing the statistics needed by the preprocessor
+        """
+        return FittedPipeline(data.domain, [self(data).domain])
+
 
 class Continuize(Preprocess):
     MultinomialTreatment = Enum(
@@ -98,9 +111,9 @@ class Discretize(Preprocess):
             A data table to be discretized.
         """
 
-        def transform(var):
+        def transform(var, new_vars):
             if var.is_continuous:
-                new_var = method(data, var)
+                new_var = next(new_vars)
                 if new_var is not None and \
                         (len(new_var.values) >= 2 or not self.remove_const):
                     return new_var
@@ -111,7 +124,15 @@ class Discretize(Preprocess):
 
         def discretized(vars, do_discretize):
             if do_discretize:
-                vars = (transform(var) for var in vars)
+                # Cut points for all variables are computed at once,
+                # unless the method is a plain callable
+                continuous = [var for var in vars if var.is_continuous]
+                discretize_all = getattr(method, "discretize_all", None)
+                if discretize_all is not None:
+                    new_vars = iter(discretize_all(data, continuous))
+                else:
+                    new_vars = (method(data, var) for var in continuous)
+                vars = (transform(var, new_vars) for var in vars)
                 vars = [var for var in vars if var is not None]
             return vars
 
@@ -435,3 +456,120 @@ class PreprocessorList:
             data = pp(data)
         return data
 
+    def fit(self, data):
+        """
+        Fit the preprocessors to the data and return a
+        :obj:`FittedPipeline`, which applies the same transformations
+        to other data.
+
+        Parameters
+        ----------
+        data : Orange.data.Table
+            Data for computing the statistics needed by the preprocessors
+        """
+        source_domain = data.domain
+        domains = []
+        for pp in self.preprocessors:
+            data = pp(data)
+            domains.append(data.domain)
+        return FittedPipeline(source_domain, domains)
+
+
+class FittedPipeline:
+    """
+    Preprocessing fitted to data, as returned by :obj:`Preprocess.fit` or
+    :obj:`PreprocessorList.fit`.
+
+    The pipeline stores the domains constructed by preprocessors. Applying
+    it converts the data through these domains, so statistics, like
+    distributions, cut points or means, are not recomputed. Variables of
+    each domain are computed from the preceding domain, hence values of the
+    same type of transformation are computed together for all columns.
+    Preprocessors that only select or shuffle rows (e.g. `RemoveNaNClasses`
+    or `Randomize`) are not reproduced.
+
+    The pipeline can be pickled.
+
+    Attributes
+    ----------
+    source_domain : Orange.data.Domain
+        The domain of the data to which the pipeline was fitted
+    domains : list of Orange.data.Domain
+        Domains constructed by preprocessors that changed the domain;
+        the last is the domain of the transformed data
+    chunk_size : int
+        The number of rows that :obj:`transform` converts at once
+    """
+    chunk_size = 10000
+
+    def __init__(self, source_domain, domains):
+        self.source_domain = source_domain
+        self.domains = []
+        for domain in domains:
+            if domain != (self.domains or [source_domain])[-1]:
+                self.domains.append(domain)
+
+    @property
+    def domain(self):
+        """The domain of the transformed data"""
+        return self.domains[-1] if self.domains else self.source_domain
+
+    def __call__(self, data):
+        """
+        Transform the data table.
+
+        Parameters
+        ----------
+        data : Orange.data.Table
+            Data in the source domain (or in a domain from which its
+            variables can be computed)
+
+        Returns
+        -------
+        Orange.data.Table
+        """
+        for domain in self.domains:
+            data = data.from_table(domain, data)
+        return data
+
+    def transform(self, X, Y=None, metas=None):
+        """
+        Transform arrays with values of the variables of the source domain
+        and return an array with values of attributes of the output domain.
+
+        Arrays are converted in chunks of `chunk_size` rows, which limits
+        the memory used for intermediate domains. Class values and meta
+        attributes are unknown if they are not given.
+
+        Parameters
+        ----------
+        X : np.ndarray or scipy.sparse matrix
+            Values of attributes of the source domain
+        Y : np.ndarray, optional
+            Values of class variables of the source domain
+        metas : np.ndarray, optional
+            Values of meta attributes of the source domain
+
+        Returns
+        -------
+        np.ndarray or scipy.sparse.csr_matrix
+        """
+        source = self.source_domain
+        n_rows = X.shape[0]
+        if Y is None and source.class_vars:
+            Y = np.full((n_rows, len(source.class_vars)), np.nan)
+        if metas is None and source.metas:
+            metas = np.full((n_rows, len(source.metas)), np.nan, dtype=object)
+        chunks = []
+        for start in range(0, n_rows, self.chunk_size):
+            rows = slice(start, start + self.chunk_size)
+            data = Table.from_numpy(
+                source, X[rows],
+                None if Y is None else Y[rows],
+                None if metas is None else metas[rows])
+            chunks.append(self(data).X)
+        if not chunks:
+            return np.zeros((0, len(self.domain.attributes)))
+        if sp.issparse(chunks[0]):
+            return sp.vstack(chunks, format="csr")
+        return np.vstack(chunks)
@@ -276,6 +276,12 @@ class Lookup(Lookup):
         values = self.lookup_table[np.array(column_valid, dtype=int)]
         return np.where(mask, np.nan, values)
 
+    @classmethod
+    def transform_columns(cls, transformations, c):
+        if cls.transform is not Lookup.transform:
+            return super().transform_columns(transformations, c)
+        return cls.lookup_columns(transformations, c, np.nan)
+
 
 def merge_lookup(A, B):
     """
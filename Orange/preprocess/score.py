@@ -20,6 +20,15 @@ __all__ = ["Chi2",
            "RReliefF",
            "FCBF"]
 
+# ReliefF and RReliefF find neighbours in indices of instances (see
+# Orange.misc.neighbors.NeighborIndex) if data has at least this many
+# instances, no missing values and at most RELIEF_INDEX_MAX_DIMENSIONS
+# dimensions (with discrete attributes one-hot encoded), for which k-d trees
+# are efficient; otherwise, they compare each selected instance with all
+# others
+RELIEF_INDEX_MIN_INSTANCES = 10000
+RELIEF_INDEX_MAX_DIMENSIONS = 10
+
 
 class Scorer:
     feature_type = None
@@ -294,6 +303,55 @@ class Gini(ClassificationScorer):
         return (_gini(np.sum(cont, axis=1)) - _gini(cont)) * nan_adjustment
 
 
+def _use_relief_index(data):
+    n_dimensions = sum(len(attr.values) if attr.is_discrete else 1
+                       for attr in data.domain.attributes)
+    return len(data) >= RELIEF_INDEX_MIN_INSTANCES and \
+        n_dimensions <= RELIEF_INDEX_MAX_DIMENSIONS and \
+        not np.isnan(data.X).any()
+
+
+def _relief_space(data):
+    """Return data in space in which Manhattan distances between instances
+    equal their differences in ReliefF: continuous attributes are scaled to
+    [0, 1] and discrete attributes are one-hot encoded with values 1/2."""
+    columns = []
+    for x, attr in zip(data.X.T, data.domain.attributes):
+        if attr.is_discrete:
+            columns.append(0.5 * np.eye(len(attr.values))[x.astype(int)])
+        else:
+            ptp = np.ptp(x) or np.inf
+            columns.append(((x - np.min(x)) / ptp)[:, None])
+    return np.hstack(columns)
+
+
+def _relief_neighbors(data, n_iterations, k_nearest):
+    """Return randomly selected instances and indices of their nearest
+    neighbours of each class, padded with -1."""
+    from Orange.misc.neighbors import NeighborIndex
+    X = _relief_space(data)
+    y = data.Y.astype(int)
+    k_nearest = min(k_nearest, len(data) - 1)
+    instances = np.random.randint(len(data), size=n_iterations)
+    neighbors = np.full((n_iterations, np.max(y) + 1, k_nearest), -1, np.intp)
+    for cls in range(neighbors.shape[1]):
+        members = np.flatnonzero(y == cls)
+        if not len(members):
+            continue
+        index = NeighborIndex(X[members], metric="manhattan")
+        same = y[instances] == cls
+        k = min(k_nearest, len(members))
+        if k and not same.all():
+            _, ind = index.query(X[instances[~same]], k)
+            neighbors[~same, cls, :k] = members[ind]
+        k = min(k_nearest, len(members) - 1)
+        if k and same.any():
+            rows = np.searchsorted(members, instances[same])
+            _, ind = index.query_rows(rows, k)
+            neighbors[same, cls, :k] = members[ind]
+    return instances, neighbors
+
+
 class ReliefF(Scorer):
     """
     ReliefF algorithm. Contrary to most other scorers, Relief family of
@@ -321,10 +379,18 @@ class ReliefF(Scorer):
         if len(data.domain.class_var.values) == 1:  # Single-class value non-problem
             return 0 if feature else np.zeros(data.X.shape[1])
 
-        from Orange.preprocess._relieff import relieff
-        weights = np.asarray(relieff(data.X, data.Y,
-                                     self.n_iterations, self.k_nearest,
-                                     np.array([a.is_discrete for a in data.domain.attributes])))
+        is_discrete = np.array([a.is_discrete for a in data.domain.attributes])
+        if _use_relief_index(data):
+            from Orange.preprocess._relieff import relieff_neighbors
+            instances, neighbors = _relief_neighbors(
+                data, self.n_iterations, self.k_nearest)
+            weights = np.asarray(relieff_neighbors(
+                data.X, data.Y, instances, neighbors, is_discrete))
+        else:
+            from Orange.preprocess._relieff import relieff
+            weights = np.asarray(relieff(data.X, data.Y,
+                                         self.n_iterations, self.k_nearest,
+                                         is_discrete))
         if feature:
             return weights[0]
         return weights
@@ -346,10 +412,21 @@ class RReliefF(Scorer):
             raise ValueError('RReliefF supports regression; use ReliefF '
                              'for classification')
 
-        from Orange.preprocess._relieff import rrelieff
-        weights = np.asarray(rrelieff(data.X, data.Y,
-                                      self.n_iterations, self.k_nearest,
-                                      np.array([a.is_discrete for a in data.domain.attributes])))
+        is_discrete = np.array([a.is_discrete for a in data.domain.attributes])
+        if _use_relief_index(data):
+            from Orange.misc.neighbors import NeighborIndex
+            from Orange.preprocess._relieff import rrelieff_neighbors
+            index = NeighborIndex(_relief_space(data), metric="manhattan")
+            instances = np.random.randint(len(data), size=self.n_iterations)
+            _, neighbors = index.query_rows(
+                instances, min(self.k_nearest, len(data) - 1))
+            weights = np.asarray(rrelieff_neighbors(
+                data.X, data.Y, instances, neighbors, is_discrete))
+        else:
+            from Orange.preprocess._relieff import rrelieff
+            weights = np.asarray(rrelieff(data.X, data.Y,
+                                          self.n_iterations, self.k_nearest,
+                                          is_discrete))
         if feature:
             return weights[0]
         return weights
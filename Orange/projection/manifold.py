@@ -1,4 +1,5 @@
 import numpy as np
+import scipy.sparse as sp
 import sklearn.manifold as skl_manifold
 
 from Orange.distance import (SklDistance, SpearmanDistance, PearsonDistance,
@@ -107,6 +108,22 @@ class LocallyLinearEmbedding(SklProjector):
         self.params = vars()
 
 
+class NeighborAffinity:
+    """
+    Affinity matrix of the graph of nearest neighbours, as in
+    `sklearn.manifold.SpectralEmbedding` with `affinity="nearest_neighbors"`,
+    with neighbours from :obj:`Orange.misc.neighbors.NeighborIndex`.
+    """
+    def __init__(self, n_neighbors=None):
+        self.n_neighbors = n_neighbors
+
+    def __call__(self, X):
+        from Orange.misc.neighbors import NeighborIndex
+        n_neighbors = self.n_neighbors or max(int(X.shape[0] / 10), 1)
+        graph = NeighborIndex(X).kneighbors_graph(n_neighbors)
+        return 0.5 * (graph + graph.T)
+
+
 class SpectralEmbedding(SklProjector):
     __wraps__ = skl_manifold.SpectralEmbedding
     name = 'Spectral Embedding'
@@ -117,6 +134,14 @@ class SpectralEmbedding(SklProjector):
         super().__init__(preprocessors=preprocessors)
         self.params = vars()
 
+    def fit(self, X, Y=None):
+        params = self.params
+        if params["affinity"] == "nearest_neighbors" and not sp.issparse(X):
+            params = dict(params,
+                          affinity=NeighborAffinity(params["n_neighbors"]))
+        proj = self.__wraps__(**params)
+        return proj.fit(X, Y)
+
 
 class TSNE(SklProjector):
     __wraps__ = skl_manifold.TSNE
@@ -1,10 +1,19 @@
+import numpy as np
 import sklearn.neighbors as skl_neighbors
-from Orange.base import KNNBase
-from Orange.regression import SklLearner
+from Orange.base import KNNBase, KNNModelBase
+from Orange.regression import SklLearner, SklModel
 
 __all__ = ["KNNRegressionLearner"]
 
 
+class KNNRegressionModel(KNNModelBase, SklModel):
+    def predict_neighbors(self, neighbors, weights):
+        values = self.skl_model._y[neighbors]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (values * weights).sum(axis=1) / weights.sum(axis=1)
+
+
 class KNNRegressionLearner(KNNBase, SklLearner):
     __wraps__ = skl_neighbors.KNeighborsRegressor
+    __returns__ = KNNRegressionModel
     name = 'knn regression'
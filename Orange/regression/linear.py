@@ -1,4 +1,5 @@
 import numpy as np
+import scipy.sparse as sp
 
 import sklearn.linear_model as skl_linear_model
 import sklearn.pipeline as skl_pipeline
@@ -37,6 +38,34 @@ class LinearRegressionLearner(SklLearner, _FeatureScorerMixin):
         model = super().fit(X, Y, W)
         return LinearModel(model.skl_model)
 
+    def leave_one_out(self, data):
+        # Default preprocessing of data without missing values does not
+        # depend on the rows, so all models use the same columns
+        if self.__wraps__ is not skl_linear_model.LinearRegression \
+                or self.preprocessors != list(type(self).preprocessors) \
+                or not data.domain.has_continuous_class \
+                or sp.issparse(data.X) or data.has_weights() \
+                or np.isnan(data.X).any() or np.isnan(data.Y).any():
+            return None
+        X = self.preprocess(data).X
+        X = np.hstack((np.ones((len(X), 1)), X))
+        y = data.Y.ravel()
+        # A row's prediction by the model fitted without it is
+        # y - e / (1 - h), where e is the row's residual and h its leverage
+        u, s, _ = np.linalg.svd(X, full_matrices=False)
+        u = u[:, s > s[0] * max(X.shape) * np.finfo(float).eps]
+        leverage = (u ** 2).sum(axis=1)
+        residuals = y - u.dot(u.T.dot(y))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            predictions = y - residuals / (1 - leverage)
+        # Models without rows with leverage (close to) 1 are not determined
+        # by the remaining rows, so they are fitted as usual
+        for i in np.flatnonzero(leverage > 1 - 1e-8):
+            rows = np.ones(len(data), dtype=bool)
+            rows[i] = False
+            predictions[i] = self(data[rows])(data[i:i + 1])[0]
+        return predictions, None
+
 
 class RidgeRegressionLearner(LinearRegressionLearner):
     __wraps__ = skl_linear_model.Ridge
@@ -30,6 +30,21 @@ class MeanLearner(Learner):
         dist = distribution.get_distribution(data, data.domain.class_var)
         return MeanModel(dist)
 
+    def leave_one_out(self, data):
+        if self.preprocessors or not data.domain.has_continuous_class:
+            return None
+        y = data.Y.ravel()
+        w = data.W.ravel() if data.has_weights() else numpy.ones(len(y))
+        known = ~numpy.isnan(y)
+        w = numpy.where(known, w, 0)
+        wy = numpy.where(known, w * y, 0)
+        remaining = w.sum() - w
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            means = (wy.sum() - wy) / remaining
+        # A model fitted on no data returns zero
+        means[remaining <= 0] = 0
+        return means, None
+
 
 # noinspection PyMissingConstructor
 class MeanModel(Model):
@@ -290,3 +290,34 @@ def get_contingencies(dat, skipDiscrete=False, skipContinuous=False):
             columns = range(len(vars))
         contigs = [get_contingency(dat, i) for i in columns]
     return contigs
+
+
+def get_contingencies_for_columns(dat, columns, row_variable=None):
+    """
+    Compute the contingencies of columns with the row variable.
+
+    :param Orange.data.Table dat:
+    :param list columns:
+        List of column indices into the `dat.domain` (indices can be
+        :class:`int` or instances of `Orange.data.Variable`)
+    :param row_variable: the row variable (default: the class variable)
+    """
+    domain = dat.domain
+    columns = [col if isinstance(col, int) else domain.index(col)
+               for col in columns]
+    if row_variable is None:
+        row_variable = domain.class_var
+        if row_variable is None:
+            raise ValueError("data has no target variable")
+    else:
+        row_variable = domain[row_variable]
+    if not columns:
+        return []
+    try:
+        dist_unks, unknown_rows = dat._compute_contingency(
+            columns, row_variable)
+    except NotImplementedError:
+        return [get_contingency(dat, col, row_variable) for col in columns]
+    return [get_contingency(cont, domain[col], row_variable, unks,
+                            unknown_rows)
+            for col, (cont, unks) in zip(columns, dist_unks)]
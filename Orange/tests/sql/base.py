@@ -1,6 +1,8 @@
 import contextlib
 import os
+import sqlite3
 import string
+import tempfile
 import unittest
 from urllib import parse
 import uuid
@@ -144,38 +146,29 @@ class TestParseUri(unittest.TestCase):
         self.fail(self._formatMessage(msg, standardMsg))
 
 
-@sql_test
-class PostgresTest(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        from psycopg2.pool import ThreadedConnectionPool
-        from Orange.data.sql.backend.postgres import Psycopg2Backend
-
-        Psycopg2Backend.connection_pool = \
-            ThreadedConnectionPool(1, 1, **connection_params())
-        cls.backend = Psycopg2Backend(connection_params())
-        cls.conn, cls.iris = create_iris()
+class DatabaseTest(unittest.TestCase):
+    """Common helpers for tests on a database
 
-    @classmethod
-    def tearDownClass(cls):
-        from Orange.data.sql.backend.postgres import Psycopg2Backend
-        Psycopg2Backend.connection_pool.closeall()
-        Psycopg2Backend.connection_pool = None
+    Derived classes set up `backend`, `conn` (connection parameters for
+    SqlTable) and `iris` (the name of the table with iris data), and define
+    how to execute statements that create and drop tables.
+    """
+    temporary_tables = True
 
     def create_sql_table(self, data, columns=None):
         table_name = self._create_sql_table(data, columns)
-        return connection_params(), table_name
+        return self.conn, table_name
 
     @contextlib.contextmanager
     def sql_table_from_data(self, data, guess_values=True):
-        from Orange.data.sql.backend.postgres import Psycopg2Backend
-        assert Psycopg2Backend.connection_pool is not None
-
         table_name = self._create_sql_table(data)
-        yield SqlTable(connection_params(), table_name,
+        yield SqlTable(self.conn, table_name, backend=type(self.backend),
                        inspect_values=guess_values)
         self.drop_sql_table(table_name)
 
+    def execute_sql(self, queries):
+        raise NotImplementedError
+
     def _create_sql_table(self, data, sql_column_types=None):
         data = list(data)
         if sql_column_types is None:
@@ -186,17 +179,18 @@ class PostgresTest(unittest.TestCase):
             ]
         table_name = uuid.uuid4()
         create_table_sql = """
-            CREATE TEMPORARY TABLE "%(table_name)s" (
+            CREATE %(temporary)s TABLE "%(table_name)s" (
                 %(columns)s
             )
         """ % dict(
+            temporary="TEMPORARY" if self.temporary_tables else "",
             table_name=table_name,
             columns=",\n".join(
                 'col%d %s' % (i, t)
                 for i, t in enumerate(sql_column_types)
             )
         )
-        with self.backend.execute_sql_query(create_table_sql): pass
+        queries = [create_table_sql]
         for row in data:
             values = []
             for v, t in zip(row, sql_column_types):
@@ -213,7 +207,8 @@ class PostgresTest(unittest.TestCase):
                 table_name=table_name,
                 values=', '.join(values)
             )
-            with self.backend.execute_sql_query(insert_sql): pass
+            queries.append(insert_sql)
+        self.execute_sql(queries)
         return str(table_name)
 
     def _get_column_types(self, data):
@@ -227,7 +222,7 @@ class PostgresTest(unittest.TestCase):
         return column_size
 
     def drop_sql_table(self, table_name):
-        with self.backend.execute_sql_query("""DROP TABLE "%s" """ % table_name): pass
+        self.execute_sql(["""DROP TABLE "%s" """ % table_name])
 
     def float_variable(self, size):
         return [i*.1 for i in range(size)]
@@ -237,3 +232,86 @@ class PostgresTest(unittest.TestCase):
 
     def string_variable(self, size):
         return string.ascii_letters[:size]
+
+
+@sql_test
+class PostgresTest(DatabaseTest):
+    @classmethod
+    def setUpClass(cls):
+        from psycopg2.pool import ThreadedConnectionPool
+        from Orange.data.sql.backend.postgres import Psycopg2Backend
+
+        Psycopg2Backend.connection_pool = \
+            ThreadedConnectionPool(1, 1, **connection_params())
+        cls.backend = Psycopg2Backend(connection_params())
+        cls.conn, cls.iris = create_iris()
+
+    @classmethod
+    def tearDownClass(cls):
+        from Orange.data.sql.backend.postgres import Psycopg2Backend
+        Psycopg2Backend.connection_pool.closeall()
+        Psycopg2Backend.connection_pool = None
+
+    def create_sql_table(self, data, columns=None):
+        table_name = self._create_sql_table(data, columns)
+        return connection_params(), table_name
+
+    @contextlib.contextmanager
+    def sql_table_from_data(self, data, guess_values=True):
+        from Orange.data.sql.backend.postgres import Psycopg2Backend
+        assert Psycopg2Backend.connection_pool is not None
+
+        table_name = self._create_sql_table(data)
+        yield SqlTable(connection_params(), table_name,
+                       inspect_values=guess_values)
+        self.drop_sql_table(table_name)
+
+    def execute_sql(self, queries):
+        for query in queries:
+            with self.backend.execute_sql_query(query):
+                pass
+
+
+class SqliteTest(DatabaseTest):
+    """Tests on a temporary SQLite database with the iris table
+
+    SQLite backends open a connection per thread, so the tables are not
+    temporary (those would only be visible to the connection that made
+    them) but are removed with the database file.
+    """
+    temporary_tables = False
+
+    @classmethod
+    def setUpClass(cls):
+        from Orange.data.sql.backend.sqlite import SqliteBackend
+
+        fd, cls.database = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        cls.conn = dict(database=cls.database)
+        cls.iris = "iris"
+        iris = Orange.data.Table("iris")
+        with sqlite3.connect(cls.database) as conn:
+            conn.execute("""
+                CREATE TABLE iris (
+                    "sepal length" REAL,
+                    "sepal width" REAL,
+                    "petal length" REAL,
+                    "petal width" REAL,
+                    "iris" VARCHAR(15)
+                )""")
+            conn.executemany(
+                "INSERT INTO iris VALUES (?, ?, ?, ?, ?)",
+                [list(map(float, row.x)) + [str(row.get_class())]
+                 for row in iris])
+        cls.backend = SqliteBackend(cls.conn)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.backend = None
+        os.remove(cls.database)
+
+    def execute_sql(self, queries):
+        with contextlib.closing(sqlite3.connect(self.database)) as conn:
+            with conn:
+                for query in queries:
+                    conn.execute(query)
@@ -5,11 +5,11 @@ import unittest
 from Orange.data.sql.table import SqlTable, SqlRowInstance
 from Orange.data import filter, domain
 
-from Orange.tests.sql.base import PostgresTest, sql_version, sql_test
+from Orange.tests.sql.base import PostgresTest, SqliteTest, sql_version, \
+    sql_test
 
 
-@sql_test
-class TestIsDefinedSql(PostgresTest):
+class IsDefinedTests:
     def setUp(self):
         self.data = [
             [1, 2, 3, None, 'm'],
@@ -61,8 +61,7 @@ class TestIsDefinedSql(PostgresTest):
         self.assertSequenceEqual(filtered_data, correct_data)
 
 
-@sql_test
-class TestHasClass(PostgresTest):
+class HasClassTests:
     def setUp(self):
         self.data = [
             [1, 2, 3, None, 'm'],
@@ -95,8 +94,7 @@ class TestHasClass(PostgresTest):
         self.assertSequenceEqual(filtered_data, correct_data)
 
 
-@sql_test
-class TestSameValueSql(PostgresTest):
+class SameValueTests:
     def setUp(self):
         self.data = [
             [1, 2, 3, 'a', 'm'],
@@ -183,8 +181,7 @@ class TestSameValueSql(PostgresTest):
         self.assertSequenceEqual(filtered_data, correct_data)
 
 
-@sql_test
-class TestValuesSql(PostgresTest):
+class ValuesTests:
     def setUp(self):
         self.data = [
             [1, 2, 3, 'a', 'm'],
@@ -317,8 +314,7 @@ class TestValuesSql(PostgresTest):
         self.assertSequenceEqual(filtered_data, correct_data)
 
 
-@sql_test
-class TestFilterStringSql(PostgresTest):
+class FilterStringTests:
     def setUp(self):
         self.data = [
             [w] for w in "Lorem ipsum dolor sit amet, consectetur adipiscing"
@@ -722,3 +718,48 @@ class TestFilterStringSql(PostgresTest):
 
         self.assertEqual(len(filtered_data), len(correct_data))
         self.assertSequenceEqual(filtered_data, correct_data)
+
+
+@sql_test
+class TestIsDefinedSql(IsDefinedTests, PostgresTest):
+    pass
+
+
+class TestIsDefinedSqlite(IsDefinedTests, SqliteTest):
+    pass
+
+
+@sql_test
+class TestHasClass(HasClassTests, PostgresTest):
+    pass
+
+
+class TestHasClassSqlite(HasClassTests, SqliteTest):
+    pass
+
+
+@sql_test
+class TestSameValueSql(SameValueTests, PostgresTest):
+    pass
+
+
+class TestSameValueSqlite(SameValueTests, SqliteTest):
+    pass
+
+
+@sql_test
+class TestValuesSql(ValuesTests, PostgresTest):
+    pass
+
+
+class TestValuesSqlite(ValuesTests, SqliteTest):
+    pass
+
+
+@sql_test
+class TestFilterStringSql(FilterStringTests, PostgresTest):
+    pass
+
+
+class TestFilterStringSqlite(FilterStringTests, SqliteTest):
+    pass
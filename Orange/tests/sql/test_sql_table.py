@@ -111,6 +111,28 @@ class TestSqlTable(PostgresTest):
         # has all necessary class members to create a standard Table
         Table(sql_table.domain, sql_table)
 
+    @unittest.mock.patch("Orange.data.sql.table.FETCH_BATCH_SIZE", 7)
+    def test_download_data_in_batches(self):
+        mat = np.random.randint(0, 3, (50, 3)).astype(float)
+        mat[::5, 0] = np.nan
+        conn, table_name = self.create_sql_table(mat)
+        sql_table = SqlTable(conn, table_name,
+                             type_hints=Domain([], DiscreteVariable(
+                                 name='col2', values=['0', '1', '2'])))
+        progress = []
+        sql_table.download_data(callback=progress.append)
+        assert_almost_equal(sql_table.X, mat[:, :2])
+        assert_almost_equal(sql_table.Y.flatten(), mat[:, 2])
+        self.assertGreaterEqual(len(progress), 8)
+        self.assertEqual(progress[-1], 1)
+        self.assertEqual(progress, sorted(progress))
+
+        expected = list(iter(sql_table))
+        self.assertEqual(len(expected), 50)
+        for inst, x, y in zip(expected, sql_table.X, sql_table.Y):
+            assert_almost_equal(inst.x, x)
+            assert_almost_equal(inst.y, y)
+
     def test_query_all(self):
         table = SqlTable(self.conn, self.iris, inspect_values=True)
         results = list(table)
@@ -0,0 +1,209 @@
+import os
+import pickle
+import sqlite3
+import threading
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from Orange.data import Table, filter, ContinuousVariable, DiscreteVariable, \
+    StringVariable, TimeVariable
+from Orange.data.sql.backend.base import BackendError
+from Orange.data.sql.backend.sqlite import SqliteBackend
+from Orange.data.sql.table import SqlTable
+from Orange.statistics import basic_stats, contingency, distribution
+from Orange.tests.sql.base import SqliteTest
+
+
+class TestSqliteBackend(SqliteTest):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.data = Table("iris")
+        with sqlite3.connect(cls.database) as conn:
+            conn.execute("""
+                CREATE TABLE misc (
+                    i INTEGER, s TEXT, d DATETIME, b BLOB, n NUMERIC)""")
+            conn.executemany(
+                "INSERT INTO misc VALUES (?, ?, ?, ?, ?)",
+                [(i % 3, "s%d" % i, "2016-01-0%d 12:00:00" % (i + 1),
+                  b"", i if i else None) for i in range(5)])
+
+    def sql_table(self, table_or_sql="iris", **kwargs):
+        return SqlTable(self.conn, table_or_sql,
+                        backend=SqliteBackend, **kwargs)
+
+    def test_missing_database(self):
+        with self.assertRaises(BackendError):
+            SqliteBackend(dict(database=self.database + ".missing"))
+        self.assertFalse(os.path.exists(self.database + ".missing"))
+        with self.assertRaises(BackendError):
+            SqliteBackend(dict(host="localhost", database=self.database))
+
+    def test_domain(self):
+        table = self.sql_table("misc")
+        i, d, n, s, b = table.domain.variables + table.domain.metas
+        self.assertIsInstance(i, ContinuousVariable)
+        self.assertIsInstance(s, StringVariable)
+        self.assertIsInstance(d, TimeVariable)
+        self.assertIsInstance(b, StringVariable)
+        self.assertIsInstance(n, ContinuousVariable)
+
+        table = self.sql_table("misc", inspect_values=True)
+        i, s, d, n = table.domain.attributes
+        self.assertIsInstance(i, DiscreteVariable)
+        self.assertEqual(i.values, ["0", "1", "2"])
+        self.assertIsInstance(s, DiscreteVariable)
+
+        table = self.sql_table("SELECT i, s FROM misc", inspect_values=True)
+        self.assertIsInstance(table.domain["i"], DiscreteVariable)
+        self.assertIsInstance(table.domain["s"], DiscreteVariable)
+
+    def test_download_data(self):
+        table = self.sql_table(inspect_values=True)
+        table.download_data()
+        np.testing.assert_almost_equal(table.X[:, :4], self.data.X)
+        iris = table.domain["iris"]
+        self.assertEqual([iris.values[int(x)] for x in table.X[:, 4]],
+                         [str(row.get_class()) for row in self.data])
+
+        table = self.sql_table("misc")
+        table.download_data()
+        self.assertEqual(table.X[0, 1], 1451649600)
+        np.testing.assert_equal(table.X[:, 2], [np.nan, 1, 2, 3, 4])
+
+    def test_basic_stats(self):
+        table = self.sql_table(inspect_values=True)
+        stats = basic_stats.DomainBasicStats(table)
+        for i, stat in enumerate(stats.stats[:4]):
+            column = self.data.X[:, i]
+            self.assertAlmostEqual(stat.min, column.min())
+            self.assertAlmostEqual(stat.max, column.max())
+            self.assertAlmostEqual(stat.mean, column.mean())
+        stds = [s[3] for s in table._compute_basic_stats(range(4))]
+        np.testing.assert_almost_equal(stds, np.std(self.data.X, 0, ddof=1))
+
+        table = self.sql_table("misc")
+        stats = table._compute_basic_stats(["n"])
+        self.assertEqual(stats[0][4:], (1, 4))
+
+    def test_distributions(self):
+        table = self.sql_table(inspect_values=True)
+        dist = distribution.get_distribution(table, "iris")
+        np.testing.assert_equal(dist, [50, 50, 50])
+        dist = distribution.get_distribution(table, "sepal length")
+        values, counts = np.unique(self.data.X[:, 0], return_counts=True)
+        np.testing.assert_almost_equal(dist[0], values)
+        np.testing.assert_equal(dist[1], counts)
+
+    def test_contingency(self):
+        table = self.sql_table(inspect_values=True)
+        cont = contingency.get_contingency(table, "sepal length", "iris")
+        expected = contingency.get_contingency(
+            self.data, "sepal length", "iris")
+        order = [self.data.domain.class_var.values.index(value)
+                 for value in table.domain["iris"].values]
+        np.testing.assert_almost_equal(cont.values, expected.values)
+        np.testing.assert_equal(cont.counts, expected.counts[order])
+
+    def test_count_approx(self):
+        table = self.sql_table()
+        self.assertEqual(table.approx_len(), 150)
+        table = self.sql_table(
+            "SELECT * FROM iris WHERE iris = 'Iris-setosa'")
+        self.assertEqual(table.approx_len(), 50)
+
+    def test_sample_percentage(self):
+        table = self.sql_table()
+        sample = table.sample_percentage(50, no_cache=True)
+        self.assertLess(len(sample), 150)
+        self.assertEqual(len(table.backend.list_tables()), 2)
+        with self.assertRaises(NotImplementedError):
+            table.sample_time(1)
+
+    def test_connection_per_thread(self):
+        table = self.sql_table()
+        lengths = []
+        thread = threading.Thread(target=lambda: lengths.append(len(table)))
+        thread.start()
+        thread.join()
+        self.assertEqual(lengths, [150])
+
+        table = pickle.loads(pickle.dumps(table))
+        self.assertEqual(len(table), 150)
+
+    def test_query_cache(self):
+        table = self.sql_table(inspect_values=True)
+        backend = table.backend
+        self.assertIsNone(backend.query_cache)
+        table._compute_basic_stats()
+        table._compute_basic_stats()
+        self.assertFalse(backend.query_log[-1].cached)
+
+        backend.enable_query_cache()
+        table._compute_basic_stats()
+        self.assertFalse(backend.query_log[-1].cached)
+        table._compute_basic_stats()
+        self.assertTrue(backend.query_log[-1].cached)
+        self.assertEqual(backend.query_log[-1].caller, __name__)
+        stats = [stat for stat in backend.query_stats()
+                 if stat[1] == backend.query_log[-1].query]
+        self.assertEqual([stat[2:4] for stat in stats], [(4, 1)])
+
+        setosa = table.domain["iris"].to_val("Iris-setosa")
+        filtered = filter.SameValue(table.domain["iris"], setosa)(table)
+        stats = filtered._compute_basic_stats()
+        self.assertFalse(backend.query_log[-1].cached)
+        self.assertEqual(stats[0][5], 50)
+
+        with patch("Orange.misc.cache.monotonic",
+                   return_value=backend.query_cache_ttl + 1e9):
+            table._compute_basic_stats()
+        self.assertFalse(backend.query_log[-1].cached)
+
+        backend.clear_query_cache()
+        table._compute_basic_stats()
+        self.assertFalse(backend.query_log[-1].cached)
+
+        backend.disable_query_cache()
+        table._compute_basic_stats()
+        self.assertFalse(backend.query_log[-1].cached)
+
+        backend.enable_query_cache()
+        table = pickle.loads(pickle.dumps(table))
+        self.assertIsNone(table.backend.query_cache)
+
+    def test_fetch_rows(self):
+        table = self.sql_table(inspect_values=True)
+        for indices in ([5, 3, 3, -1], [0, 140], range(10, 20, 3)):
+            rows = table[indices]
+            self.assertIsInstance(rows, Table)
+            np.testing.assert_almost_equal(rows.X[:, :4],
+                                           self.data.X[indices])
+        np.testing.assert_almost_equal(table[10:13].X[:, :4],
+                                       self.data.X[10:13])
+        mask = self.data.X[:, 0] > 7
+        np.testing.assert_almost_equal(table[mask].X[:, :4],
+                                       self.data.X[mask])
+        self.assertEqual(len(table[[]]), 0)
+
+        rows = table[[0, 140], ["sepal width"]]
+        self.assertEqual([var.name for var in rows.domain], ["sepal width"])
+        np.testing.assert_almost_equal(rows.X[:, 0], self.data.X[[0, 140], 1])
+
+        with self.assertRaises(IndexError):
+            table[[0, 150]]
+        for indices in ([-151], [0, -151], range(-160, -150)):
+            with self.assertRaises(IndexError):
+                table[indices]
+
+    def test_fetch_sparse_rows(self):
+        table = self.sql_table(inspect_values=True)
+        table.backend.query_log.clear()
+        rows = table[[140, 0, 70]]
+        np.testing.assert_almost_equal(rows.X[:, :4],
+                                       self.data.X[[140, 0, 70]])
+        # rows are numbered once, so the numbering is consistent
+        self.assertEqual(
+            sum("ROW_NUMBER" in r.query for r in table.backend.query_log), 1)
@@ -0,0 +1,167 @@
+# Test methods with long descriptive names can omit docstrings
+# pylint: disable=missing-docstring
+
+import json
+import os
+import struct
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import scipy.sparse as sp
+
+from Orange.data import Table, Domain, ContinuousVariable, DiscreteVariable, \
+    StringVariable, TimeVariable
+from Orange.data.io import BinaryReader, FileFormat
+
+
+class TestBinaryReader(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".orb")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def assert_tables_equal(self, table1, table2):
+        self.assertEqual(table1.domain, table2.domain)
+        for attr in ("X", "_Y", "W"):
+            arr1, arr2 = getattr(table1, attr), getattr(table2, attr)
+            if sp.issparse(arr1):
+                arr1, arr2 = arr1.toarray(), arr2.toarray()
+            np.testing.assert_equal(arr1, arr2)
+        np.testing.assert_equal(table1.metas, table2.metas)
+        self.assertEqual(table1.attributes, table2.attributes)
+
+    def test_registered(self):
+        self.assertIsInstance(
+            FileFormat.get_reader(self.filename), BinaryReader)
+
+    def test_write_read(self):
+        for name in ("iris", "zoo", "heart_disease"):
+            table = Table(name)
+            table.save(self.filename)
+            loaded = Table(self.filename)
+            self.assert_tables_equal(table, loaded)
+            self.assertEqual(loaded.name,
+                             os.path.splitext(
+                                 os.path.basename(self.filename))[0])
+
+    def test_memory_mapped(self):
+        table = Table("iris")
+        table.save(self.filename)
+        loaded = Table(self.filename)
+        base = loaded.X
+        while not isinstance(base, np.memmap):
+            base = base.base
+            self.assertIsNotNone(base)
+        self.assertTrue(loaded.X.flags.f_contiguous)
+
+        # Changes stay in memory and do not affect the file
+        loaded.X[0, 0] = 42
+        np.testing.assert_equal(Table(self.filename).X, table.X)
+
+    def test_metas_and_weights(self):
+        table = Table("zoo")
+        table.metas[1, 0] = ""
+        table.metas[2, 0] = "čžš"
+        table.set_weights(np.arange(len(table)))
+        table.save(self.filename)
+        loaded = Table(self.filename)
+        self.assert_tables_equal(table, loaded)
+        self.assertEqual(loaded.metas.dtype, object)
+
+    def test_missing_strings(self):
+        table = Table("zoo")
+        table.metas[1, 0] = None
+        table.metas[2, 0] = np.nan
+        table.metas[3, 0] = ""
+        table.save(self.filename)
+        metas = Table(self.filename).metas
+        self.assertIsNone(metas[1, 0])
+        self.assertTrue(np.isnan(metas[2, 0]))
+        self.assertEqual(metas[3, 0], "")
+        np.testing.assert_equal(metas[4:], table.metas[4:])
+
+    def test_json_header(self):
+        table = Table("zoo")
+        table.attributes = {"source": "zoo", "n": 1}
+        table.save(self.filename)
+        with open(self.filename, "rb") as f:
+            f.seek(len(BinaryReader.SIGNATURE))
+            offset, = struct.unpack("<Q", f.read(8))
+            f.seek(offset)
+            size, = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(size).decode("utf-8"))
+        self.assertEqual(header["attributes"], table.attributes)
+        with patch("pickle.load", side_effect=AssertionError), \
+                patch("pickle.loads", side_effect=AssertionError):
+            self.assert_tables_equal(table, Table(self.filename))
+
+    def test_variables(self):
+        disc = DiscreteVariable("orb_disc", values=["b", "a", "c"])
+        cont = ContinuousVariable("orb_cont", number_of_decimals=5)
+        time = TimeVariable("orb_time")
+        time.have_date, time.have_time = 1, 0
+        cont.attributes["unit"] = "cm"
+        domain = Domain([disc, cont], metas=[time, StringVariable("orb_s")])
+        table = Table.from_numpy(
+            domain, np.array([[0, 1.5], [1, 2], [np.nan, 3], [2, 4]]),
+            metas=np.array([[0., "x"], [86400., "y"], [3600., "z"], [0., "w"]],
+                           dtype=object))
+        table.save(self.filename)
+        self.assert_tables_equal(table, Table(self.filename))
+
+        # New variables have sorted values, so the data is recoded
+        for var_type in (DiscreteVariable, ContinuousVariable, TimeVariable):
+            var_type._clear_cache()
+        loaded = Table(self.filename)
+        disc2, cont2 = loaded.domain.attributes
+        time2 = loaded.domain.metas[0]
+        self.assertIsNot(disc2, disc)
+        self.assertEqual(disc2.values, ["a", "b", "c"])
+        self.assertEqual([disc2.str_val(x) for x in loaded.X[:, 0]],
+                         ["b", "a", "?", "c"])
+        self.assertEqual(cont2.number_of_decimals, 5)
+        self.assertEqual(cont2.attributes, {"unit": "cm"})
+        self.assertIsInstance(time2, TimeVariable)
+        self.assertEqual((time2.have_date, time2.have_time), (1, 0))
+
+    def test_recode_sparse(self):
+        disc = DiscreteVariable("orb_sparse", values=["b", "a", "c"])
+        domain = Domain([ContinuousVariable("orb_x"), disc], disc)
+        table = Table.from_numpy(
+            domain, sp.csr_matrix(np.array([[1, 0], [0, 1], [2, 2]])),
+            np.array([1, 0, np.nan]))
+        table.save(self.filename)
+        DiscreteVariable._clear_cache()
+        loaded = Table(self.filename)
+        attr, cls = loaded.domain.attributes[1], loaded.domain.class_var
+        self.assertEqual([attr.str_val(x) for x in loaded.X[:, 1].toarray()],
+                         ["b", "a", "c"])
+        np.testing.assert_equal(loaded.X[:, 0].toarray().ravel(), [1, 0, 2])
+        self.assertEqual([cls.str_val(y) for y in loaded.Y],
+                         ["a", "b", "?"])
+
+    def test_sparse(self):
+        table = Table("iris")
+        table.X = sp.csr_matrix(table.X)
+        table.save(self.filename)
+        loaded = Table(self.filename)
+        self.assertTrue(sp.issparse(loaded.X))
+        self.assert_tables_equal(table, loaded)
+
+    def test_empty(self):
+        table = Table("iris")[:0]
+        table.save(self.filename)
+        self.assert_tables_equal(table, Table(self.filename))
+
+    def test_invalid_file(self):
+        with open(self.filename, "wb") as f:
+            f.write(b"not an Orange file")
+        self.assertRaises(ValueError, Table, self.filename)
+
+
+if __name__ == "__main__":
+    unittest.main()
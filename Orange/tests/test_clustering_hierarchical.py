@@ -127,6 +127,30 @@ class TestHierarchical(unittest.TestCase):
         self.assertGreater(score_unordered, score_ordered)
         self.assertEqual(score_ordered, 21.0)
 
+    def test_condensed_matrix(self):
+        condensed = self.matrix.condensed()
+        numpy.testing.assert_equal(
+            hierarchical.condensedform(condensed),
+            hierarchical.condensedform(self.matrix))
+        self.assertIs(hierarchical.condensedform(condensed), condensed.flat)
+        numpy.testing.assert_equal(
+            hierarchical.condensedform(condensed, mode="lower"),
+            list(flatten(self.m)))
+
+        for linkage in (hierarchical.AVERAGE, hierarchical.WARD):
+            numpy.testing.assert_equal(
+                hierarchical.dist_matrix_linkage(condensed, linkage),
+                hierarchical.dist_matrix_linkage(self.matrix, linkage))
+
+        def indices(root):
+            return [leaf.value.index for leaf in hierarchical.leaves(root)]
+
+        self.assertEqual(
+            indices(hierarchical.optimal_leaf_ordering(
+                self.cluster, condensed)),
+            indices(hierarchical.optimal_leaf_ordering(
+                self.cluster, self.matrix)))
+
     def test_table_clustering(self):
         table = Orange.data.Table(numpy.eye(3))
         tree = hierarchical.data_clustering(table, linkage="single")
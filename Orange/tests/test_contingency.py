@@ -2,7 +2,7 @@
 # pylint: disable=missing-docstring
 
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import numpy as np
 import scipy.sparse as sp
@@ -244,6 +244,26 @@ class TestDiscrete(unittest.TestCase):
         np.testing.assert_almost_equal(cont["b"], [0, 1, 1])
         np.testing.assert_almost_equal(cont[2], [1, 0, 0])
 
+    def test_get_contingencies_for_columns(self):
+        d = self._construct_sparse()
+        attrs = d.domain.attributes
+        conts = contingency.get_contingencies_for_columns(
+            d, [14, attrs[5], "c3"])
+        self.assertEqual(len(conts), 3)
+        for cont, col in zip(conts, [14, 5, 13]):
+            single = contingency.get_contingency(d, col)
+            self.assertIsInstance(cont, type(single))
+            self.assertIs(cont.col_variable, attrs[col])
+            for value in range(3):
+                np.testing.assert_almost_equal(cont[value], single[value])
+        self.assertEqual(
+            contingency.get_contingencies_for_columns(d, []), [])
+
+        no_class = data.Table(data.Domain(attrs), d)
+        self.assertRaises(ValueError,
+                          contingency.get_contingencies_for_columns,
+                          no_class, [0])
+
     def test_compute_contingency_metas(self):
         d = data.Table(test_filename("test9.tab"))
         var1, var2 = d.domain[-2], d.domain[-4]
@@ -251,3 +271,83 @@ class TestDiscrete(unittest.TestCase):
         np.testing.assert_almost_equal(cont, [[3, 0, 0], [0, 2, 0],
                                               [0, 0, 2], [0, 1, 0]])
 
+
+
+class TestComputeContingencies(unittest.TestCase):
+    def setUp(self):
+        random = np.random.RandomState(0)
+        n = 200
+        disc = random.randint(4, size=(n, 5)).astype(float)
+        disc[random.random_sample(disc.shape) < 0.1] = np.nan
+        cont = np.round(random.normal(size=(n, 5)), 1)
+        cont[random.random_sample(cont.shape) < 0.1] = np.nan
+        y = random.randint(3, size=n).astype(float)
+        y[::17] = np.nan
+        self.domain = data.Domain(
+            [data.DiscreteVariable("d{}".format(i), values="abcd")
+             for i in range(5)] +
+            [data.ContinuousVariable("c{}".format(i)) for i in range(5)],
+            data.DiscreteVariable("y", values="abc"))
+        self.X = np.hstack((disc, cont))
+        self.y = y
+        self.W = random.random_sample(n)
+
+    def assert_contingencies(self, table, W=None):
+        W = np.ones(len(self.y)) if W is None else W
+        conts, unknown_rows = table._compute_contingency(
+            table.domain.attributes, table.domain.class_var)
+        self.assertAlmostEqual(unknown_rows, W[np.isnan(self.y)].sum())
+        known = ~np.isnan(self.y)
+        y, w = self.y[known].astype(int), W[known]
+        for i, (cont, unknowns) in enumerate(conts):
+            col = self.X[known, i]
+            nans = np.isnan(col)
+            np.testing.assert_almost_equal(
+                unknowns, np.bincount(y[nans], w[nans], minlength=3))
+            if i < 5:
+                expected = np.zeros((3, 4))
+                np.add.at(expected, (y[~nans], col[~nans].astype(int)),
+                          w[~nans])
+                np.testing.assert_almost_equal(cont, expected)
+            else:
+                values, counts = cont
+                expected_values = np.unique(col[~nans])
+                np.testing.assert_almost_equal(values, expected_values)
+                expected = np.zeros((3, len(expected_values)))
+                np.add.at(
+                    expected,
+                    (y[~nans], np.searchsorted(expected_values, col[~nans])),
+                    w[~nans])
+                np.testing.assert_almost_equal(counts, expected)
+
+    def test_dense(self):
+        table = data.Table.from_numpy(self.domain, self.X, self.y)
+        self.assert_contingencies(table)
+
+    def test_weighted(self):
+        table = data.Table.from_numpy(self.domain, self.X, self.y, W=self.W)
+        self.assert_contingencies(table, self.W)
+
+    def test_sparse(self):
+        disc, cont = self.X[:, :5], self.X[:, 5:]
+        disc[disc == 1] = 0
+        # Contingencies for sparse continuous columns omit implicit zeros
+        cont[cont == 0] = 0.05
+        for fmt in (sp.csr_matrix, sp.csc_matrix):
+            table = data.Table.from_numpy(self.domain, fmt(self.X), self.y)
+            self.assert_contingencies(table)
+            table = data.Table.from_numpy(
+                self.domain, fmt(self.X), self.y, W=self.W)
+            self.assert_contingencies(table, self.W)
+
+    def test_threads(self):
+        table = data.Table.from_numpy(self.domain, self.X, self.y, W=self.W)
+        with patch("Orange.data.table.MIN_THREAD_VALUES", 50), \
+                patch("os.cpu_count", Mock(return_value=3)):
+            self.assert_contingencies(table, self.W)
+
+    def test_class_out_of_range(self):
+        self.y[0] = 3
+        table = data.Table.from_numpy(self.domain, self.X, self.y)
+        self.assertRaises(ValueError, table._compute_contingency,
+                          table.domain.attributes, table.domain.class_var)
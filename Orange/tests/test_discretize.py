@@ -3,7 +3,7 @@
 
 import random
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import numpy as np
 import scipy.sparse as sp
@@ -312,6 +312,97 @@ class TestDiscretizeTable(TestCase):
         self.assertIs(dom.class_var, table.domain.class_var)
 
 
+class TestDiscretizeAll(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        random = np.random.RandomState(0)
+        X = np.round(random.normal(size=(200, 6)), 1)
+        Y = (X[:, 0] + X[:, 1] > 0).astype(float)
+        Y[::17] = np.nan
+        X[random.random_sample(X.shape) < 0.1] = np.nan
+        cls.data = Table.from_numpy(
+            Domain([ContinuousVariable("x{}".format(i)) for i in range(6)],
+                   DiscreteVariable("y", values="ab")),
+            X, Y)
+        cls.sparse = cls.data.copy()
+        cls.sparse.X = sp.csr_matrix(np.fmax(np.nan_to_num(X), 0))
+
+    def assert_same_as_single(self, method, data):
+        attributes = data.domain.attributes
+        for var, single in zip(method.discretize_all(data, attributes),
+                               (method(data, attr) for attr in attributes)):
+            np.testing.assert_almost_equal(var.compute_value.points,
+                                           single.compute_value.points)
+            self.assertEqual(var.values, single.values)
+
+    def test_equal_freq(self):
+        for n in (2, 4, 10):
+            self.assert_same_as_single(discretize.EqualFreq(n), self.data)
+            self.assert_same_as_single(discretize.EqualFreq(n), self.sparse)
+
+    def test_entropy_mdl(self):
+        self.assert_same_as_single(discretize.EntropyMDL(), self.data)
+        self.assert_same_as_single(discretize.EntropyMDL(force=True),
+                                   self.sparse)
+
+    def test_default(self):
+        self.assert_same_as_single(discretize.EqualWidth(), self.data)
+
+    def test_domain_discretizer(self):
+        method = discretize.EqualFreq()
+        with patch.object(discretize.EqualFreq, "discretize_all",
+                          wraps=method.discretize_all) as discretize_all:
+            dom = discretize.DomainDiscretizer(self.data, method=method)
+            discretize_all.assert_called_once()
+        for var, attr in zip(dom.attributes, self.data.domain.attributes):
+            np.testing.assert_equal(
+                var.compute_value.points,
+                method(self.data, attr).compute_value.points)
+
+    def test_discretize(self):
+        method = discretize.EntropyMDL(force=True)
+        with patch.object(discretize.EntropyMDL, "discretize_all",
+                          wraps=method.discretize_all) as discretize_all:
+            table = Discretize(method=method)(self.data)
+            discretize_all.assert_called_once()
+        for var, attr in zip(table.domain.attributes,
+                             self.data.domain.attributes):
+            np.testing.assert_equal(
+                var.compute_value.points,
+                method(self.data, attr).compute_value.points)
+
+    def test_plain_callable(self):
+        def method(data, var):
+            return discretize.Discretizer.create_discretized_var(var, [0])
+
+        dom = discretize.DomainDiscretizer(self.data, method=method)
+        table = Discretize(method=method)(self.data)
+        for domain in (dom, table.domain):
+            for var in domain.attributes:
+                self.assertEqual(list(var.compute_value.points), [0])
+
+    def test_overridden_call(self):
+        def shifted(cls):
+            class Shifted(cls):
+                def __call__(self, data, attribute):
+                    points = super().__call__(data, attribute) \
+                        .compute_value.points
+                    return discretize.Discretizer.create_discretized_var(
+                        attribute, np.asarray(points) + 1)
+            return Shifted
+
+        attributes = self.data.domain.attributes
+        for cls, kwargs in ((discretize.EqualFreq, {}),
+                            (discretize.EntropyMDL, {"force": True})):
+            method, base = shifted(cls)(**kwargs), cls(**kwargs)
+            for var, attr in zip(method.discretize_all(self.data, attributes),
+                                 attributes):
+                np.testing.assert_almost_equal(
+                    var.compute_value.points,
+                    np.asarray(base(self.data, attr).compute_value.points)
+                    + 1)
+
+
 class TestInstanceConversion(TestCase):
     def test_single_instance(self):
         iris = Table("iris")
@@ -2,6 +2,7 @@
 # pylint: disable=missing-docstring
 
 from unittest import TestCase
+from unittest.mock import patch
 import os
 import pickle
 
@@ -14,7 +15,7 @@ from Orange.data import (Table, Domain, ContinuousVariable,
 from Orange.distance import (Euclidean, SpearmanR, SpearmanRAbsolute,
                              PearsonR, PearsonRAbsolute, Manhattan, Cosine,
                              Jaccard, _preprocess, Mahalanobis, MahalanobisDistance)
-from Orange.misc import DistMatrix
+from Orange.misc import DistMatrix, CondensedDistMatrix, DistMatrixBase
 from Orange.tests import named_file, test_filename
 from Orange.util import OrangeDeprecationWarning
 
@@ -182,6 +183,104 @@ class TestDistMatrix(TestCase):
             self.assertEqual(m.axis, 0)
 
 
+class TestCondensedDistMatrix(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.iris = Table('iris')
+        dist = Euclidean(cls.iris)
+        cls.dist = DistMatrix((dist + dist.T) / 2, cls.iris)
+        cls.condensed = cls.dist.condensed()
+
+    def test_condensed(self):
+        self.assertEqual(len(self.condensed.flat), 150 * 149 // 2)
+        self.assertEqual(self.condensed.shape, (150, 150))
+        self.assertEqual(len(self.condensed), 150)
+        self.assertIs(self.condensed.row_items, self.iris)
+        np.testing.assert_equal(np.asarray(self.condensed), self.dist)
+        np.testing.assert_equal(self.condensed.dense(), self.dist)
+        self.assertIsInstance(self.condensed.dense(), DistMatrix)
+
+        with self.assertRaises(ValueError):
+            DistMatrix(np.arange(4.).reshape(2, 2)).condensed()
+        with self.assertRaises(ValueError):
+            CondensedDistMatrix(np.arange(4.))
+
+    def test_indexing(self):
+        dist, condensed = self.dist, self.condensed
+        self.assertEqual(condensed[3, 7], dist[3, 7])
+        self.assertEqual(condensed[7, 3], dist[3, 7])
+        self.assertEqual(condensed[5, 5], 0)
+        self.assertEqual(condensed[-1, 0], dist[149, 0])
+        np.testing.assert_equal(condensed[4], dist[4])
+        np.testing.assert_equal(condensed[:, 4], dist[:, 4])
+        np.testing.assert_equal(condensed[10:20, 5:8], dist[10:20, 5:8])
+        indices = np.array([5, 3, 3, 140, -1])
+        np.testing.assert_equal(condensed[indices[:, None], indices],
+                                dist[indices[:, None], indices])
+        np.testing.assert_equal(condensed[[1, 2], [2, 1]], dist[[1, 2], [2, 1]])
+        with self.assertRaises(IndexError):
+            condensed[150, 0]
+
+        # large submatrices are computed by blocks of rows
+        with patch("Orange.misc.distmatrix.INDEX_BLOCK_SIZE", 1000):
+            np.testing.assert_equal(condensed[:, :], dist)
+            indices = np.arange(149, 9, -1)
+            np.testing.assert_equal(condensed[indices[:, None], indices],
+                                    dist[indices[:, None], indices])
+
+    def test_base(self):
+        self.assertIsInstance(self.dist, DistMatrixBase)
+        self.assertIsInstance(self.condensed, DistMatrixBase)
+        self.assertTrue(self.condensed.has_row_labels() ==
+                        self.dist.has_row_labels())
+
+    def test_submatrix(self):
+        sub = self.condensed.submatrix([2, 3, 4])
+        self.assertIsInstance(sub, CondensedDistMatrix)
+        np.testing.assert_equal(np.asarray(sub), self.dist[2:5, 2:5])
+        self.assertTrue(tables_equal(sub.row_items, self.iris[2:5]))
+        sub = self.condensed.submatrix([2, 3], [4, 5, 6])
+        np.testing.assert_equal(sub, self.dist[2:4, 4:7])
+
+    def test_statistics(self):
+        self.assertEqual(self.condensed.max(), self.dist.max())
+        self.assertEqual(self.condensed.min(), 0)
+        np.testing.assert_equal(self.condensed.diagonal(), 0)
+
+    def test_save(self):
+        labels = Table.from_list(Domain([], metas=[StringVariable("label")]),
+                                 [["danny"], ["eve"], ["frank"]])
+        condensed = CondensedDistMatrix([1, 2, 3], labels, axis=0)
+        with named_file("") as name:
+            condensed.save(name)
+            m = CondensedDistMatrix.from_file(name)
+            self.assertIsInstance(m.flat, np.memmap)
+            np.testing.assert_equal(m.flat, [1, 2, 3])
+            self.assertEqual([e.metas[0] for e in m.row_items],
+                             ["danny", "eve", "frank"])
+            self.assertIsNone(m.col_items)
+            self.assertEqual(m.axis, 0)
+            del m
+
+            m = DistMatrix.from_file(name)
+            self.assertIsInstance(m, DistMatrix)
+            np.testing.assert_equal(m, [[0, 1, 2], [1, 0, 3], [2, 3, 0]])
+            self.assertEqual([e.metas[0] for e in m.row_items],
+                             ["danny", "eve", "frank"])
+
+            self.condensed.save(name)
+            m = CondensedDistMatrix.from_file(name, mmap_mode=None)
+            self.assertNotIsInstance(m.flat, np.memmap)
+            np.testing.assert_equal(m.flat, self.condensed.flat)
+            self.assertIsNone(m.row_items)
+            self.assertEqual(m.axis, 1)
+
+    def test_pickling(self):
+        unpickled = pickle.loads(pickle.dumps(self.condensed))
+        np.testing.assert_equal(unpickled.flat, self.condensed.flat)
+        self.assertTrue(tables_equal(unpickled.row_items, self.iris))
+
+
 class TestEuclidean(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -819,3 +918,81 @@ class TestDistances(TestCase):
         iris = Table('iris')
         inst = Instance(iris.domain, np.concatenate((iris[1].x, iris[1].y)))
         self.assertEqual(Euclidean(iris[1], inst), 0)
+
+
+class TestBlocks(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.breast = Table("breast-cancer-wisconsin-cont")
+
+    def test_blocks(self):
+        for dist in (Euclidean, Manhattan, Cosine, SpearmanR,
+                     SpearmanRAbsolute, PearsonR, PearsonRAbsolute):
+            for args in ((self.breast[:100],), (self.breast[:50], self.breast)):
+                expected = dist(*args)
+                # distances between equal rows are not exactly 0 if
+                # computed from dot products
+                np.testing.assert_almost_equal(
+                    dist(*args, max_memory=1000), expected, decimal=5)
+                np.testing.assert_almost_equal(
+                    dist(*args, max_memory=1000, n_jobs=3), expected,
+                    decimal=5)
+                matrix = dist(*args, dtype=np.float32)
+                self.assertEqual(matrix.dtype, np.float32)
+                np.testing.assert_almost_equal(matrix, expected, decimal=5)
+
+    def test_mahalanobis(self):
+        data = self.breast[:100]
+        dist = MahalanobisDistance(self.breast)
+        expected = dist(data)
+        np.testing.assert_almost_equal(
+            dist(data, max_memory=1000, n_jobs=3), expected)
+        np.testing.assert_almost_equal(
+            dist(data[:10], data, max_memory=1000), expected[:10])
+        self.assertEqual(dist(data, dtype=np.float32).dtype, np.float32)
+        condensed = dist(data, condensed=True, max_memory=1000)
+        self.assertIsInstance(condensed, CondensedDistMatrix)
+        np.testing.assert_almost_equal(np.asarray(condensed), expected)
+
+    def test_out(self):
+        expected = Euclidean(self.breast[:100])
+        out = np.empty((100, 100), dtype=np.float32)
+        dist = Euclidean(self.breast[:100], out=out)
+        self.assertIs(dist.base, out)
+        np.testing.assert_almost_equal(dist, expected, decimal=5)
+
+        with named_file("") as fname:
+            dist = Euclidean(self.breast[:100], out=fname, max_memory=1000)
+            self.assertIsInstance(dist, DistMatrix)
+            self.assertEqual(os.path.getsize(fname), 100 * 100 * 8)
+            np.testing.assert_almost_equal(dist, expected)
+            del dist
+
+        with self.assertRaises(ValueError):
+            Euclidean(self.breast[:100], out=np.empty((100, 50)))
+
+    def test_condensed(self):
+        data = self.breast[:100]
+        for dist in (Euclidean, SpearmanR, PearsonR):
+            expected = dist(data)
+            condensed = dist(data, condensed=True, max_memory=1000, n_jobs=2)
+            self.assertIsInstance(condensed, CondensedDistMatrix)
+            self.assertIs(condensed.row_items, data)
+            np.testing.assert_almost_equal(np.asarray(condensed), expected)
+
+        with named_file("") as fname:
+            condensed = Euclidean(data, condensed=True, out=fname)
+            self.assertEqual(os.path.getsize(fname), 100 * 99 // 2 * 8)
+            self.assertIsInstance(condensed.flat, np.memmap)
+            del condensed
+
+        with self.assertRaises(ValueError):
+            Euclidean(self.breast[:10], self.breast, condensed=True)
+
+    def test_missing_values(self):
+        x = np.array([[1, 2, 3, 4], [4, 2, 3, 1], [np.nan, 1, 2, 3]])
+        for dist in (SpearmanR, PearsonR):
+            d = dist(x)
+            self.assertFalse(np.isnan(d[:2, :2]).any())
+            self.assertTrue(np.isnan(d[2]).all())
+            np.testing.assert_equal(dist(x, impute=True)[2], 0.5)
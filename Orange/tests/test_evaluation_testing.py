@@ -1,15 +1,22 @@
 # Test methods with long descriptive names can omit docstrings
 # pylint: disable=missing-docstring
 
+import os
+import pickle
+import tempfile
+import warnings
 import unittest
+from unittest.mock import patch
 import multiprocessing as mp
 import numpy as np
 
 from Orange.classification import NaiveBayesLearner, MajorityLearner
-from Orange.regression import LinearRegressionLearner, MeanLearner
+from Orange.regression import LinearRegressionLearner, MeanLearner, \
+    RidgeRegressionLearner
 from Orange.data import Table
 from Orange.evaluation import (Results, CrossValidation, LeaveOneOut, TestOnTrainingData,
                                TestOnTestData, ShuffleSplit, sample, RMSE)
+from Orange.evaluation.testing import _SharedTable, _WorkerPool
 from Orange.preprocess import discretize, preprocess
 from Orange.util import OrangeWarning
 
@@ -253,6 +260,67 @@ class TestCrossValidation(TestSampling):
         # +2 for class, +1 for fold
         self.assertEqual(len(table.domain.metas), len(data.domain.metas) + 2 + 1)
 
+    def test_shared_preprocessing(self):
+        calls = []
+
+        class CountingPreprocessor(preprocess.Preprocess):
+            def __call__(self, data):
+                calls.append(len(data))
+                return data
+
+        pps = [CountingPreprocessor()] + list(NaiveBayesLearner.preprocessors)
+        learners = [NaiveBayesLearner(preprocessors=pps),
+                    NaiveBayesLearner(preprocessors=pps),
+                    MajorityLearner()]
+        res = CrossValidation(self.iris, learners, k=3, store_models=True)
+        self.assertFalse(any(res.failed))
+        # once per fold, not once per fold and learner
+        self.assertEqual(len(calls), 3)
+        np.testing.assert_equal(res.predicted[0], res.predicted[1])
+        np.testing.assert_equal(
+            res.predicted[0],
+            CrossValidation(self.iris, [NaiveBayesLearner()], k=3).predicted[0])
+        for models in res.models:
+            self.assertIs(models[0].original_domain, self.iris.domain)
+            self.assertEqual(models[0].name, learners[0].name)
+        self.assertEqual(learners[0].preprocessors, pps)
+
+    def test_shared_table(self):
+        with tempfile.TemporaryDirectory() as folder:
+            shared = _SharedTable(self.iris, folder)
+            table = pickle.loads(pickle.dumps(shared)).load()
+            np.testing.assert_equal(table.X, self.iris.X)
+            self.assertEqual(table.domain, self.iris.domain)
+            self.assertIs(shared.load(), shared.load())
+
+    def test_worker_pool(self):
+        random = np.random.RandomState(0)
+        X = random.random_sample((1000, 20))  # large enough for parallel
+        data = Table.from_numpy(None, X, X.sum(axis=1))
+        self.addCleanup(_WorkerPool.shutdown)
+        learners = [LinearRegressionLearner(), MeanLearner()]
+        expected = CrossValidation(data, learners, k=3).predicted
+        res = CrossValidation(data, learners, k=3, n_jobs=2)
+        np.testing.assert_almost_equal(res.predicted, expected)
+        pool = _WorkerPool.pool
+        self.assertIsNotNone(pool)
+
+        # The pool is reused, also for data that is otherwise too small
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always", OrangeWarning)
+            res = CrossValidation(self.iris, [MajorityLearner()] * 2, k=3,
+                                  n_jobs=2)
+        self.assertFalse([x for x in w if x.category is OrangeWarning])
+        self.assertIs(_WorkerPool.pool, pool)
+        self.assertFalse(any(res.failed))
+
+        # Tables of finished evaluations are removed
+        self.assertEqual(os.listdir(_WorkerPool.folder), [])
+        folder = _WorkerPool.folder
+        _WorkerPool.shutdown()
+        self.assertIsNone(_WorkerPool.pool)
+        self.assertFalse(os.path.exists(folder))
+
     def test_unpicklable_params(self):
 
         class NonPicklableLearner(MajorityLearner):
@@ -354,6 +422,50 @@ class TestLeaveOneOut(TestSampling):
         self.run_test_preprocessor(LeaveOneOut, [149] * 150)
 
 
+    def run_test_fast_predictions(self, data, learners):
+        res = LeaveOneOut(data, learners)
+        with patch.object(LeaveOneOut, "_fast_predictions",
+                          return_value={}) as fast:
+            expected = LeaveOneOut(data, learners)
+            fast.assert_called()
+        self.assertEqual(res.failed, expected.failed)
+        np.testing.assert_almost_equal(res.predicted, expected.predicted)
+        if data.domain.has_discrete_class:
+            np.testing.assert_almost_equal(res.probabilities,
+                                           expected.probabilities)
+
+    def test_fast_predictions(self):
+        zoo = Table("zoo")
+        zoo.X[::7, 3] = np.nan
+        zoo.Y[::13] = np.nan
+        self.run_test_fast_predictions(zoo, [NaiveBayesLearner()])
+        housing = Table("housing")
+        self.run_test_fast_predictions(
+            housing, [LinearRegressionLearner(), MeanLearner()])
+
+        # A row with leverage 1 is refitted
+        random = np.random.RandomState(0)
+        X = np.hstack((random.random_sample((30, 3)), np.eye(30)[:, :1]))
+        data = Table.from_numpy(None, X, random.random_sample(30))
+        self.run_test_fast_predictions(data, [LinearRegressionLearner()])
+
+        with patch.object(NaiveBayesLearner, "leave_one_out") as loo:
+            LeaveOneOut(housing[:20], [MeanLearner()], store_models=True)
+            LeaveOneOut(self.iris, [NaiveBayesLearner()], store_models=True)
+            loo.assert_not_called()
+
+    def test_fast_predictions_unsupported(self):
+        # continuous attributes are discretized on each fold
+        self.assertIsNone(NaiveBayesLearner().leave_one_out(self.iris))
+        housing = Table("housing")
+        self.assertIsNone(
+            LinearRegressionLearner(preprocessors=[]).leave_one_out(housing))
+        self.assertIsNone(RidgeRegressionLearner().leave_one_out(housing))
+        self.assertIsNone(MajorityLearner().leave_one_out(self.iris))
+        self.run_test_fast_predictions(
+            self.iris, [NaiveBayesLearner(), MajorityLearner()])
+
+
 class TestTestOnTrainingData(TestSampling):
     def test_results(self):
         nrows, ncols = self.random_table.X.shape
@@ -7,10 +7,11 @@ import itertools
 
 import numpy as np
 
-from Orange.data import Table, Domain, ContinuousVariable
+from Orange.data import Table, Domain, ContinuousVariable, DiscreteVariable
 from Orange.data.filter import \
-    FilterContinuous, FilterDiscrete, FilterString, Values, HasClass, \
-    IsDefined, SameValue
+    FilterContinuous, FilterDiscrete, FilterString, FilterStringList, \
+    FilterRegex, Values, HasClass, IsDefined, SameValue, ValueFilter, \
+    compile_filter
 
 NIMOCK = MagicMock(side_effect=NotImplementedError())
 
@@ -330,6 +331,151 @@ class TestFilterString(unittest.TestCase):
         self.assertFalse(flt(self.inst))
 
 
+class TestColumnMask(unittest.TestCase):
+    def setUp(self):
+        self.zoo = Table("zoo")
+        self.iris = Table("iris")
+
+    def assert_same_as_instances(self, flt, data):
+        var = data.domain[flt.column]
+        col = data.get_column_view(var)[0]
+        np.testing.assert_equal(flt.column_mask(col, var),
+                                [flt(inst) for inst in data])
+
+    def test_filter_string(self):
+        for oper in range(FilterString.IsDefined):
+            for case_sensitive in (True, False):
+                flt = FilterString("name", oper, "GiRl", "lion",
+                                   case_sensitive=case_sensitive)
+                self.assert_same_as_instances(flt, self.zoo)
+        col = self.zoo.get_column_view("name")[0]
+        flt = FilterString("name", FilterString.Contains, "ea")
+        self.assertEqual(sum(flt.column_mask(col, None)),
+                         sum("ea" in name for name in col))
+
+    def test_filter_string_list(self):
+        for case_sensitive in (True, False):
+            flt = FilterStringList("name", ["GIRL", "lion", "wasp"],
+                                   case_sensitive=case_sensitive)
+            self.assert_same_as_instances(flt, self.zoo)
+        flt = FilterStringList("name", [])
+        self.assertFalse(
+            any(flt.column_mask(self.zoo.get_column_view("name")[0], None)))
+
+    def test_filter_regex(self):
+        flt = FilterRegex("name", "^c...$")
+        col = self.zoo.get_column_view("name")[0]
+        np.testing.assert_equal(flt.column_mask(col, None),
+                                [flt(value) for value in col])
+
+    def test_filter_continuous(self):
+        for oper in range(FilterContinuous.IsDefined + 1):
+            flt = FilterContinuous(0, oper, 5, 6)
+            self.assert_same_as_instances(flt, self.iris)
+        flt = FilterContinuous(0, -1, 5)
+        self.assertRaises(TypeError, flt.column_mask, self.iris.X[:, 0], None)
+
+    def test_filter_discrete(self):
+        flt = FilterDiscrete("iris", ["Iris-setosa", 2])
+        self.assert_same_as_instances(flt, self.iris)
+        flt = FilterDiscrete("iris", None)
+        self.assert_same_as_instances(flt, self.iris)
+
+
+class TestCompileFilter(unittest.TestCase):
+    def setUp(self):
+        self.zoo = Table("zoo")
+
+    def test_same_as_instances(self):
+        domain = self.zoo.domain
+        filters = [
+            FilterDiscrete("type", ["mammal", "bird"]),
+            FilterContinuous("legs", FilterContinuous.Between, 1, 3),
+            FilterString("name", FilterString.Contains, "A",
+                         case_sensitive=False),
+            Values([FilterDiscrete("hair", ["1"]),
+                    FilterStringList("name", ["GIRL", "bear"],
+                                     case_sensitive=False)],
+                   conjunction=False, negate=True)]
+        for conjunction in (True, False):
+            for negate in (True, False):
+                flt = Values(filters, conjunction=conjunction, negate=negate)
+                np.testing.assert_equal(
+                    compile_filter(flt, domain)(self.zoo),
+                    [flt(inst) for inst in self.zoo])
+
+    def test_cache(self):
+        domain = self.zoo.domain
+        flt = FilterContinuous("legs", FilterContinuous.Greater, 2)
+        compiled = compile_filter(flt, domain)
+        self.assertIs(compile_filter(
+            FilterContinuous("legs", FilterContinuous.Greater, 2), domain),
+                      compiled)
+        self.assertIsNot(compile_filter(
+            FilterContinuous("legs", FilterContinuous.Greater, 4), domain),
+                         compiled)
+
+        # Changing the filter does not change the compiled filter
+        legs = self.zoo.get_column_view("legs")[0]
+        flt.ref = 4
+        np.testing.assert_equal(compiled(self.zoo), legs > 2)
+        np.testing.assert_equal(compile_filter(flt, domain)(self.zoo),
+                                legs > 4)
+
+    def test_evaluate_undecided_rows(self):
+        evaluated = []
+
+        class Recorder(ValueFilter):
+            def column_mask(self, values, var):
+                evaluated.append(len(values))
+                return np.ones(len(values), dtype=bool)
+
+        is_bird = FilterDiscrete("type", ["bird"])
+        n_birds = sum(compile_filter(is_bird, self.zoo.domain)(self.zoo))
+        compile_filter(Values([Recorder("name"), is_bird]),
+                       self.zoo.domain)(self.zoo)
+        self.assertEqual(evaluated, [n_birds])
+
+        evaluated.clear()
+        compile_filter(Values([Recorder("name"), is_bird], conjunction=False),
+                       self.zoo.domain)(self.zoo)
+        self.assertEqual(evaluated, [len(self.zoo) - n_birds])
+
+    def test_without_column_mask(self):
+        class LegsEven(ValueFilter):
+            def __call__(self, inst):
+                return inst[self.column] % 2 == 0
+
+        is_bird = FilterDiscrete("type", ["bird"])
+        legs = self.zoo.get_column_view("legs")[0]
+        birds = compile_filter(is_bird, self.zoo.domain)(self.zoo)
+        np.testing.assert_equal(
+            compile_filter(LegsEven("legs"), self.zoo.domain)(self.zoo),
+            legs % 2 == 0)
+        np.testing.assert_equal(
+            compile_filter(Values([LegsEven("legs"), is_bird],
+                                  conjunction=False),
+                           self.zoo.domain)(self.zoo),
+            (legs % 2 == 0) | birds)
+
+    def test_many_discrete_values(self):
+        var = DiscreteVariable("x", values=[str(i) for i in range(30)])
+        domain = Domain([var])
+        data = Table(domain, np.array([[0], [5], [29], [np.nan], [20]]))
+        flt = FilterDiscrete(var, [str(i) for i in range(20)])
+        np.testing.assert_equal(compile_filter(flt, domain)(data),
+                                [True, True, False, False, False])
+
+    def test_invalid(self):
+        domain = self.zoo.domain
+        self.assertRaises(TypeError, compile_filter,
+                          FilterContinuous("legs", -1, 2), domain)
+        self.assertRaises(ValueError, compile_filter,
+                          FilterDiscrete("type", ["martian"]), domain)
+        self.assertRaises(TypeError, compile_filter, Values([IsDefined()]),
+                          domain)
+
+
 class TestSameValueFilter(unittest.TestCase):
     def setUp(self):
         self.table = Table('zoo')
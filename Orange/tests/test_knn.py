@@ -6,7 +6,8 @@ import unittest
 import numpy as np
 
 from Orange.data import Table, Domain, ContinuousVariable, DiscreteVariable
-from Orange.classification import KNNLearner
+from Orange.base import KNNModelBase
+from Orange.classification import KNNLearner, SklModel
 from Orange.regression import KNNRegressionLearner
 from Orange.evaluation import CA, CrossValidation, MSE
 
@@ -30,6 +31,64 @@ class TestKNNLearner(unittest.TestCase):
             clf(ins)
             val, prob = clf(ins, clf.ValueProbs)
 
+    def test_approximate(self):
+        X = np.random.RandomState(0).random_sample((300, 20))
+        y = (X[:, 0] > 0.5).astype(float)
+        domain = Domain([ContinuousVariable("x{}".format(i))
+                         for i in range(20)],
+                        DiscreteVariable("y", ["a", "b"]))
+        data = Table.from_numpy(domain, X, y)
+        exact = KNNLearner()(data)
+        model = KNNLearner(approximate=True)(data)
+        self.assertTrue(model.neighbor_index.approximate)
+        self.assertFalse(exact.neighbor_index.approximate)
+        values, probs = model(data, model.ValueProbs)
+        self.assertEqual(probs.shape, (300, 2))
+        np.testing.assert_almost_equal(probs.sum(axis=1), 1)
+        self.assertGreater(np.mean(values == exact(data)), 0.9)
+
+        model = KNNLearner(approximate=True, weights="distance")(data)
+        np.testing.assert_equal(model(data), y)
+
+        reg = KNNRegressionLearner(approximate=True)(self.housing)
+        self.assertIsNotNone(reg._neighbor_index)
+        predictions = reg(self.housing)
+        self.assertLess(
+            np.mean((predictions - self.housing.Y) ** 2),
+            2 * np.mean((KNNRegressionLearner()(self.housing)(self.housing)
+                         - self.housing.Y) ** 2))
+
+    def test_exact_neighbor_index(self):
+        for metric in ("euclidean", "manhattan", "mahalanobis"):
+            for weights in ("uniform", "distance"):
+                model = KNNLearner(metric=metric, weights=weights)(self.iris)
+                # the index is built with the model and used for predictions
+                self.assertTrue(model.uses_neighbor_index)
+                self.assertIsNotNone(model._neighbor_index)
+                values, probs = model(self.iris, model.ValueProbs)
+                skl_model = model.skl_model
+                np.testing.assert_equal(skl_model.predict(self.iris.X),
+                                        values)
+                np.testing.assert_almost_equal(
+                    skl_model.predict_proba(self.iris.X), probs)
+
+        for learner in (KNNLearner(metric="cosine"),
+                        KNNLearner(algorithm="ball_tree"),
+                        KNNLearner(metric="minkowski",
+                                   metric_params={"p": 3})):
+            model = learner(self.iris)
+            self.assertFalse(model.uses_neighbor_index)
+            self.assertIsNone(model._neighbor_index)
+            self.assertEqual(len(model(self.iris)), len(self.iris))
+
+    def test_predict_neighbors_required(self):
+        class Model(KNNModelBase, SklModel):
+            pass
+
+        model = KNNLearner()(self.iris)
+        model.__class__ = Model
+        self.assertRaises(TypeError, model, self.iris)
+
     def test_random(self):
         nrows, ncols = 1000, 5
         x = np.random.random_integers(-20, 50, (nrows, ncols))
@@ -6,6 +6,7 @@ import numpy as np
 
 from Orange.projection import (MDS, Isomap, LocallyLinearEmbedding,
                                SpectralEmbedding, TSNE)
+from Orange.projection.manifold import NeighborAffinity
 from Orange.distance import Euclidean
 from Orange.data import Table
 
@@ -112,6 +113,15 @@ class TestManifold(unittest.TestCase):
         se = se(data)
         self.assertEqual((data.X.shape[0], n_com), se.embedding_.shape)
 
+    def test_se_neighbor_affinity(self):
+        from sklearn.neighbors import kneighbors_graph
+        # random data, so that there are no ties among neighbours
+        X = np.random.RandomState(0).random_sample((200, 5))
+        affinity = NeighborAffinity(5)(X)
+        graph = kneighbors_graph(X, 5, include_self=True)
+        np.testing.assert_equal(affinity.toarray(),
+                                (0.5 * (graph + graph.T)).toarray())
+
     def test_tsne(self):
         data = self.ionosphere[:50]
         for i in range(1, 4):
@@ -1,6 +1,7 @@
 import unittest
+from unittest.mock import patch
 
-from Orange.misc.cache import memoize_method, single_cache
+from Orange.misc.cache import memoize_method, single_cache, LRUCache
 
 
 class Calculator:
@@ -28,3 +29,32 @@ class TestCache(unittest.TestCase):
         self.assertEqual(calc.my_sum(1, 2, 3, 4, 5), 15)
         # Make sure different args produce different results
         self.assertEqual(calc.my_sum(1, 2, 3, 4), 10)
+
+    def test_lru_cache(self):
+        cache = LRUCache(5, size_of=len)
+        cache.put("a", "xx")
+        cache.put("b", "yy")
+        self.assertEqual(cache.get("a"), "xx")
+        cache.put("c", "zz")
+        # "b" was the least recently used
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.get("b"), None)
+        self.assertEqual(cache.size, 4)
+        cache.put("d", "too long")
+        self.assertNotIn("d", cache)
+        self.assertEqual(cache.stats(),
+                         dict(hits=1, misses=1, items=2, size=4))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.hits, 0)
+
+    def test_lru_cache_ttl(self):
+        cache = LRUCache(5, ttl=60)
+        with patch("Orange.misc.cache.monotonic", return_value=0):
+            cache.put("a", 1)
+        with patch("Orange.misc.cache.monotonic", return_value=60):
+            self.assertEqual(cache.get("a"), 1)
+        with patch("Orange.misc.cache.monotonic", return_value=61):
+            self.assertNotIn("a", cache)
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.size, 0)
@@ -3,6 +3,9 @@
 
 import unittest
 
+import numpy as np
+import scipy.sparse as sp
+
 from Orange.classification import NaiveBayesLearner
 from Orange.data import Table, Domain, DiscreteVariable, ContinuousVariable
 from Orange.evaluation import CrossValidation, CA
@@ -45,3 +48,30 @@ class TestNaiveBayesLearner(unittest.TestCase):
         self.assertEqual(model.domain.attributes, ())
         self.assertEqual(model(t[0]), 1)
         self.assertTrue(all(model(t) == 1))
+
+    def test_predict_missing_values(self):
+        data = self.table.copy()
+        data.X[::2, 0] = np.nan
+        data.X[1::3, 1] = np.nan
+        vals, probs = self.model(data, self.model.ValueProbs)
+        np.testing.assert_almost_equal(probs.sum(axis=1), 1)
+
+        # Missing values must not contribute to the prediction
+        n_cls = len(self.model.class_freq)
+        for inst, prob in zip(data, probs):
+            log_prob = np.log(self.model.class_prob)
+            for val, attr_prob in zip(inst.x, self.model.log_cont_prob):
+                if not np.isnan(val):
+                    log_prob = log_prob + attr_prob[:, int(val)]
+            expected = np.exp(log_prob)
+            np.testing.assert_almost_equal(prob, expected / expected.sum())
+        self.assertEqual(probs.shape, (len(data), n_cls))
+
+    def test_predict_sparse(self):
+        X = self.table.X.copy()
+        X[::4, 2] = np.nan
+        dense_vals, dense_probs = self.model(X, self.model.ValueProbs)
+        sparse_vals, sparse_probs = self.model(sp.csr_matrix(X),
+                                               self.model.ValueProbs)
+        np.testing.assert_equal(dense_vals, sparse_vals)
+        np.testing.assert_almost_equal(dense_probs, sparse_probs)
@@ -0,0 +1,102 @@
+# Test methods with long descriptive names can omit docstrings
+# pylint: disable=missing-docstring
+
+import pickle
+import unittest
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.neighbors import NearestNeighbors
+
+from Orange.misc.neighbors import NeighborIndex
+
+
+class TestNeighborIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        random = np.random.RandomState(0)
+        cls.X = random.random_sample((500, 4))
+        cls.queries = random.random_sample((20, 4))
+
+    def test_query(self):
+        for metric in ("euclidean", "manhattan", "chebyshev"):
+            index = NeighborIndex(self.X, metric=metric)
+            dist, ind = index.query(self.queries, 5)
+            exp_dist, exp_ind = NearestNeighbors(5, metric=metric) \
+                .fit(self.X).kneighbors(self.queries)
+            np.testing.assert_equal(ind, exp_ind)
+            np.testing.assert_almost_equal(dist, exp_dist)
+
+        dist, ind = NeighborIndex(self.X).query(self.queries[0], 3)
+        self.assertEqual(ind.shape, (1, 3))
+
+        with self.assertRaises(ValueError):
+            NeighborIndex(self.X).query(self.queries, 501)
+
+    def test_mahalanobis(self):
+        V = np.cov(self.X.T)
+        index = NeighborIndex(self.X, metric="mahalanobis",
+                              metric_params={"V": V})
+        dist, ind = index.query(self.queries, 5)
+        exp_dist, exp_ind = NearestNeighbors(
+            5, metric="mahalanobis", algorithm="ball_tree",
+            metric_params={"V": V}).fit(self.X).kneighbors(self.queries)
+        np.testing.assert_equal(ind, exp_ind)
+        np.testing.assert_almost_equal(dist, exp_dist)
+
+    def test_query_rows(self):
+        index = NeighborIndex(self.X)
+        dist, ind = index.query_rows([3, 7], 4)
+        _, exp_ind = NearestNeighbors(5).fit(self.X).kneighbors(self.X[[3, 7]])
+        np.testing.assert_equal(ind, exp_ind[:, 1:])
+
+        # Duplicates are neighbours, but the row itself is not
+        X = np.array([[0.], [0.], [0.], [1.]])
+        _, ind = NeighborIndex(X).query_rows([0, 1, 2], 2)
+        self.assertFalse((ind == np.arange(3)[:, None]).any())
+        np.testing.assert_equal(np.sort(ind, axis=1),
+                                [[1, 2], [0, 2], [0, 1]])
+
+    def test_kneighbors_graph(self):
+        index = NeighborIndex(self.X)
+        graph = index.kneighbors_graph(3)
+        self.assertIsInstance(graph, csr_matrix)
+        expected = NearestNeighbors(3).fit(self.X).kneighbors_graph()
+        graph_self = index.kneighbors_graph(3, include_self=False)
+        np.testing.assert_equal(graph_self.toarray(), expected.toarray())
+        np.testing.assert_equal(graph.diagonal(), 1)
+        np.testing.assert_equal(graph.sum(axis=1), 3)
+
+    def test_approximate(self):
+        random = np.random.RandomState(0)
+        # data with a low intrinsic dimension
+        X = random.random_sample((2000, 3)).dot(random.normal(size=(3, 30)))
+        queries = X[:50] + random.normal(scale=0.01, size=(50, 30))
+        index = NeighborIndex(X, approximate=True)
+        self.assertTrue(index.approximate)
+        dist, ind = index.query(queries, 5)
+        exp_dist, exp_ind = NearestNeighbors(5).fit(X).kneighbors(queries)
+        recall = np.mean([len(set(a) & set(b)) / 5
+                          for a, b in zip(ind, exp_ind)])
+        self.assertGreater(recall, 0.9)
+        # Distances are exact and sorted
+        np.testing.assert_almost_equal(
+            dist, np.linalg.norm(X[ind] - queries[:, None], axis=2))
+        self.assertTrue((np.diff(dist, axis=1) >= 0).all())
+
+        # Projections to more dimensions than data has are not used
+        self.assertFalse(NeighborIndex(self.X, approximate=True).approximate)
+
+    def test_invalid_data(self):
+        with self.assertRaises(TypeError):
+            NeighborIndex(csr_matrix(self.X))
+        with self.assertRaises(ValueError):
+            NeighborIndex(np.array([[0, np.nan]]))
+        with self.assertRaises(ValueError):
+            NeighborIndex(self.X, metric="cosine")
+
+    def test_pickle(self):
+        index = pickle.loads(pickle.dumps(NeighborIndex(self.X)))
+        _, ind = index.query(self.queries, 3)
+        np.testing.assert_equal(ind, NeighborIndex(self.X).query(
+            self.queries, 3)[1])
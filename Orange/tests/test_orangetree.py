@@ -215,6 +215,48 @@ class TestClassifier(TestTree, unittest.TestCase):
         cls.blind_prediction = np.ones((1, 3)) / 3
         cls.prediction_on_0_1 = np.array([[0.5, 0.5, 0]])
 
+    def test_n_jobs(self):
+        def structure(node):
+            if node is None:
+                return None
+            return (type(node), node.attr_idx, getattr(node, "threshold", None),
+                    list(node.subset), [structure(c) for c in node.children])
+
+        for data in (self.data, self.data_mixed):
+            for binarize in (False, True):
+                trees = [structure(self.TreeLearner(binarize=binarize,
+                                                    n_jobs=n_jobs)(data).root)
+                         for n_jobs in (1, 3, -1)]
+                self.assertEqual(trees[0], trees[1])
+                self.assertEqual(trees[0], trees[2])
+
+    def test_same_tree_as_before(self):
+        # Trees built on shared columns are the same as those built on
+        # subtables; ties in numeric attributes must be resolved in the
+        # same order
+        def splits(node):
+            if node is None or not node.children:
+                return []
+            desc = node.attr.name
+            if isinstance(node, NumericNode):
+                desc += " > {}".format(node.threshold)
+            return [desc] + [d for c in node.children for d in splits(c)]
+
+        data = Table("heart_disease")
+        tree = self.TreeLearner(max_depth=3)(data)
+        self.assertEqual(
+            splits(tree.root),
+            ["thal", "chest pain", "max HR > 118.0", "age > 56.0", "gender",
+             "gender", "chest pain", "ST by exercise > 0.5",
+             "cholesterol > 221.0", "slope peak exc ST",
+             "cholesterol > 227.0", "chest pain", "age > 65.0", "age > 41.0"])
+        tree = self.TreeLearner(binarize=True, max_depth=3)(data)
+        self.assertEqual(
+            splits(tree.root),
+            ["thal", "chest pain", "major vessels colored > 0.0",
+             "major vessels colored > 0.0", "major vessels colored > 0.0",
+             "age > 57.0", "chest pain"])
+
 
 class TestRegressor(TestTree, unittest.TestCase):
     from Orange.regression import TreeLearner
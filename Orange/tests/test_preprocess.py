@@ -1,13 +1,17 @@
 # Test methods with long descriptive names can omit docstrings
 # pylint: disable=missing-docstring
 
+import pickle
 import unittest
 from unittest.mock import Mock, MagicMock, patch
 import numpy as np
+import scipy.sparse as sp
 
 import Orange
 from Orange.data import Domain, Table, DiscreteVariable
-from Orange.preprocess import RemoveNaNClasses
+from Orange.preprocess import RemoveNaNClasses, Impute, Continuize, \
+    Normalize, Discretize
+from Orange.preprocess.preprocess import PreprocessorList
 
 
 class TestPreprocess(unittest.TestCase):
@@ -78,3 +82,57 @@ class TestRemoveNanClass(unittest.TestCase):
         self.assertTrue(not np.isnan(table).any())
         self.assertEqual(table.domain, domain)
         self.assertEqual(len(table), 1)
+
+
+class TestFittedPipeline(unittest.TestCase):
+    def setUp(self):
+        data = Table("heart_disease")
+        self.train, self.test = data[:200], data[200:]
+        self.preprocessors = PreprocessorList(
+            [Impute(), Continuize(), RemoveNaNClasses(), Normalize()])
+        self.fitted = self.preprocessors.fit(self.train)
+        self.expected = Table.from_table(
+            self.preprocessors(self.train).domain, self.test)
+
+    def test_domains(self):
+        # RemoveNaNClasses does not change the domain
+        self.assertEqual(len(self.fitted.domains), 3)
+        self.assertIs(self.fitted.source_domain, self.train.domain)
+        self.assertIs(self.fitted.domain, self.fitted.domains[-1])
+
+    def test_call(self):
+        with patch.object(Orange.statistics.basic_stats.BasicStats,
+                          "__init__") as stats:
+            transformed = self.fitted(self.test)
+            stats.assert_not_called()
+        self.assertEqual(transformed.domain, self.fitted.domain)
+        np.testing.assert_almost_equal(transformed.X, self.expected.X)
+
+    def test_transform(self):
+        self.fitted.chunk_size = 17
+        np.testing.assert_almost_equal(
+            self.fitted.transform(self.test.X, self.test.Y), self.expected.X)
+        np.testing.assert_almost_equal(
+            self.fitted.transform(self.test.X), self.expected.X)
+        self.assertEqual(self.fitted.transform(self.test.X[:0]).shape,
+                         (0, len(self.fitted.domain.attributes)))
+
+    def test_transform_sparse(self):
+        data = Table("iris")
+        data.X = sp.csr_matrix(data.X)
+        fitted = Discretize().fit(data)
+        transformed = fitted.transform(data.X)
+        self.assertTrue(sp.issparse(transformed))
+        np.testing.assert_almost_equal(transformed.toarray(),
+                                       fitted(data).X.toarray())
+
+    def test_single_preprocessor(self):
+        fitted = Discretize().fit(self.train)
+        np.testing.assert_equal(
+            fitted(self.test).X,
+            Table.from_table(Discretize()(self.train).domain, self.test).X)
+
+    def test_pickle(self):
+        fitted = pickle.loads(pickle.dumps(self.fitted))
+        np.testing.assert_almost_equal(fitted.transform(self.test.X),
+                                       self.expected.X)
@@ -9,6 +9,8 @@ from Orange.preprocess import RemoveNaNClasses, Impute
 from Orange.classification.rules import main as rules_main
 from Orange.classification.rules import (_RuleLearner, _RuleClassifier,
                                          RuleHunter, Rule, EntropyEvaluator,
+                                         CoverageCache, Selector,
+                                         TopDownSearchStrategy, get_dist,
                                          LaplaceAccuracyEvaluator,
                                          WeightedRelativeAccuracyEvaluator,
                                          argmaxrnd, hash_dist)
@@ -204,6 +206,75 @@ class TestRuleInduction(unittest.TestCase):
         predictions = classifier.predict(self.titanic.X)
         self.assertEqual(len(predictions), self.titanic.X.shape[0])
 
+    def testCoverageCache(self):
+        data = Table('heart_disease')
+        for preprocessor in CN2Learner.preprocessors:
+            data = preprocessor(data)
+        X, Y, domain = data.X, data.Y.astype(int), data.domain
+        W = np.random.RandomState(0).random_sample(len(data))
+        selectors = TopDownSearchStrategy().find_new_selectors(
+            X, Y, None, domain, [])
+        parent = Selector(column=0, op=">=", value=50).filter_data(X)
+
+        for weights in (None, W):
+            coverage = CoverageCache(X, Y, weights, domain)
+            bitsets = coverage.refine(coverage.pack(parent), selectors)
+            covered = coverage.unpack(bitsets)
+            dists = coverage.class_dists(bitsets)
+            self.assertEqual(len(covered), len(selectors))
+            for selector, cov, dist in zip(selectors, covered, dists):
+                expected = parent & selector.filter_data(X)
+                np.testing.assert_equal(cov, expected)
+                np.testing.assert_equal(
+                    dist, get_dist(Y[expected],
+                                   weights[expected]
+                                   if weights is not None else None,
+                                   domain))
+            self.assertEqual(dists.dtype, float if weights is not None
+                             else np.intp)
+
+        # each selector is evaluated only once
+        self.assertEqual(len(coverage.bitsets), len(set(selectors)))
+
+        rule = Rule(selectors=selectors[:3])
+        np.testing.assert_equal(
+            coverage.unpack(coverage.rule_bitset(rule.selectors)),
+            rule.evaluate_data(X))
+        np.testing.assert_equal(coverage.unpack(coverage.rule_bitset([])),
+                                np.ones(len(X), dtype=bool))
+
+        # the kernel does not check bounds, so classes are checked in advance
+        for y in (np.nan, -1, len(domain.class_var.values)):
+            Z = data.Y.copy()
+            Z[3] = y
+            self.assertRaises(ValueError, CoverageCache, X, Z, None, domain)
+        self.assertRaises(ValueError, CoverageCache, X, Y, W[:-1], domain)
+
+    def testRuleClassifierCoverage(self):
+        for learner in (CN2Learner(), CN2SDUnorderedLearner()):
+            classifier = learner(self.titanic)
+            expected = np.zeros((len(self.titanic), 2))
+            if isinstance(learner, CN2Learner):
+                status = np.ones(len(self.titanic), dtype=bool)
+                for rule in classifier.rule_list:
+                    covered = rule.evaluate_data(self.titanic.X) & status
+                    status &= ~covered
+                    expected[covered] = rule.probabilities
+            else:
+                total = np.zeros((len(self.titanic), 1))
+                for rule in classifier.rule_list[:-1]:
+                    if not rule.length:
+                        continue
+                    covered = rule.evaluate_data(self.titanic.X)
+                    weight = rule.curr_class_dist.sum()
+                    expected[covered] += rule.probabilities * weight
+                    total[covered] += weight
+                hit = total[:, 0] > 0
+                expected[hit] /= total[hit]
+                expected[~hit] = classifier.rule_list[-1].probabilities
+            np.testing.assert_almost_equal(
+                classifier.predict(self.titanic.X), expected)
+
     def testArgMaxRnd(self):
         temp = np.array([np.nan, 1, 2.3, 37, 37, 37, 1])
         self.assertEqual(argmaxrnd(temp, hash_dist(np.array([3, 4]))), 5)
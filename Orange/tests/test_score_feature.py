@@ -1,14 +1,20 @@
 # Test methods with long descriptive names can omit docstrings
 # pylint: disable=missing-docstring
 
+import sys
 import unittest
+from unittest.mock import patch
 
 import numpy as np
 
 from Orange.data import Table, Domain, DiscreteVariable
 from Orange import preprocess
 from Orange.preprocess.score import InfoGain, GainRatio, Gini, Chi2, ANOVA,\
-    UnivariateLinearRegression, ReliefF, FCBF, RReliefF
+    UnivariateLinearRegression, ReliefF, FCBF, RReliefF, _use_relief_index
+
+# Orange.preprocess.score is a lazy module, so patches must be applied to
+# the module in which the scorers are defined
+score_module = sys.modules[ReliefF.__module__]
 
 
 class FeatureScoringTest(unittest.TestCase):
@@ -125,6 +131,44 @@ class FeatureScoringTest(unittest.TestCase):
         for feature in ('LSTAT', 'RM', 'AGE'):
             self.assertIn(feature, best)
 
+    @patch.object(score_module, "RELIEF_INDEX_MIN_INSTANCES", 0)
+    @patch.object(score_module, "RELIEF_INDEX_MAX_DIMENSIONS", 100)
+    def test_relieff_index(self):
+        weights = ReliefF(n_iterations=200)(self.monk, None)
+        found = [self.monk.domain[attr].name
+                 for attr in reversed(weights.argsort()[-3:])]
+        self.assertEqual(sorted(found), ['a', 'b', 'e'])
+
+        # Data with missing values is scored without the index
+        weights = ReliefF()(self.adult, None)
+        found = sorted([self.adult.domain[attr].name
+                        for attr in weights.argsort()[-2:]])
+        self.assertEqual(found, ['marital-status', 'relationship'])
+
+    @patch.object(score_module, "RELIEF_INDEX_MIN_INSTANCES", 0)
+    @patch.object(score_module, "RELIEF_INDEX_MAX_DIMENSIONS", 100)
+    def test_rrelieff_index(self):
+        weights = RReliefF(n_iterations=200)(self.housing, None)
+        best = {self.housing.domain[attr].name
+                for attr in weights.argsort()[-6:]}
+        for feature in ('LSTAT', 'RM'):
+            self.assertIn(feature, best)
+
+    @patch.object(score_module, "RELIEF_INDEX_MIN_INSTANCES", 0)
+    def test_relief_index_dimensions(self):
+        # k-d trees are slower than comparing all instances in many
+        # dimensions; discrete attributes are one-hot encoded
+        def first(data, n_attributes):
+            domain = data.domain
+            return Table(Domain(domain.attributes[:n_attributes],
+                                domain.class_var), data)
+
+        self.assertFalse(_use_relief_index(self.housing))
+        self.assertFalse(_use_relief_index(self.monk))
+        self.assertTrue(_use_relief_index(first(self.housing, 3)))
+        self.assertFalse(_use_relief_index(first(self.monk, 4)))
+        self.assertTrue(_use_relief_index(first(self.monk, 3)))
+
     def test_fcbf(self):
         scorer = FCBF()
         weights = scorer(self.zoo, None)
@@ -8,11 +8,13 @@ import tempfile
 import shutil
 import pickle
 from collections import OrderedDict
+from unittest.mock import patch
 
 import numpy as np
 
 from Orange.data import Table, DiscreteVariable
-from Orange.data.io import TabReader
+from Orange.data.io import TabReader, CSVReader, FileFormat, \
+    _csv_chunk_bounds
 
 
 def read_tab_file(filename):
@@ -206,3 +208,146 @@ class TestTabReader(unittest.TestCase):
         table2 = TabReader(table1.__file__).read()
         self.assertEqual(table1.name, 'iris')
         self.assertEqual(table2.name, 'iris')
+
+
+class TestChunkedTabReader(unittest.TestCase):
+    def setUp(self):
+        DiscreteVariable._clear_cache()
+
+    def assert_same_tables(self, table1, table2):
+        self.assertEqual(table1.domain, table2.domain)
+        for var1, var2 in zip(table1.domain.variables, table2.domain.variables):
+            self.assertIs(type(var1), type(var2))
+        np.testing.assert_equal(table1.X, table2.X)
+        np.testing.assert_equal(table1.Y, table2.Y)
+        np.testing.assert_equal(table1.W, table2.W)
+        np.testing.assert_equal(table1.metas, table2.metas)
+
+    def test_same_as_data_table(self):
+        for name in ("iris", "zoo", "heart_disease", "titanic"):
+            table = Table(name)
+            read = TabReader(table.__file__, chunk_size=7).read()
+            self.assert_same_tables(table, read)
+
+    def test_types_from_sample(self):
+        rows = [["a", "b", "c", "d"],
+                ["?", "1.5", "1.5", "x"],
+                ["?", "2.5", "z", "y"],
+                ["1", "0", "2", "3"],
+                ["0", "?", "4", "3"],
+                ["1", "7", "5", "2"]]
+        table = FileFormat.data_table(rows)
+        for chunk_size in (1, 2, 10):
+            chunked = FileFormat.data_table_chunked(
+                rows, chunk_size=chunk_size, sample_size=2)
+            self.assert_same_tables(table, chunked)
+        a, b = table.domain.attributes
+        # All values in the sample were missing, yet the column is discrete
+        self.assertTrue(a.is_discrete)
+        self.assertTrue(b.is_continuous)
+        self.assertEqual([var.name for var in table.domain.metas], ["c", "d"])
+
+    def test_ambiguous_discrete_values(self):
+        rows = [["a"], ["?"], ["1"], ["1.0"]]
+        self.assertIsNone(
+            FileFormat.data_table_chunked(rows, chunk_size=1, sample_size=1))
+
+    def test_longer_rows(self):
+        rows = [["a", "b"], ["1.5", "2.5"], ["3.5", "4.5", "5"]]
+        self.assertIsNone(
+            FileFormat.data_table_chunked(rows, chunk_size=1, sample_size=1))
+
+    def test_non_continuous_value(self):
+        rows = [["a", "b"], ["c", "c"], ["", ""],
+                ["1", "2"], ["3", "4"], ["5", "x"]]
+        with self.assertRaisesRegex(ValueError, "line 6, column 2"):
+            FileFormat.data_table(rows)
+        # The error is reported by data_table when reading falls back to it
+        self.assertIsNone(
+            FileFormat.data_table_chunked(rows, chunk_size=1, sample_size=1))
+
+    def test_fallback(self):
+        samplefile = "a\tb\n1.5\t1.5\n2.5\t2.5\n1\tfoo\n"
+        rows = [line.split("\t") for line in samplefile.splitlines()]
+        self.assertIsNone(
+            FileFormat.data_table_chunked(rows, chunk_size=1, sample_size=1))
+
+        table = TabReader(io.StringIO(samplefile)).read()
+        self.assertTrue(table.domain["b"].is_string)
+        chunked = TabReader(io.StringIO(samplefile), chunk_size=1).read()
+        self.assert_same_tables(table, chunked)
+
+
+@patch.object(CSVReader, "PARALLEL_MIN_SIZE", 0)
+class TestParallelCSVReader(unittest.TestCase):
+    def setUp(self):
+        DiscreteVariable._clear_cache()
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    assert_same_tables = TestChunkedTabReader.assert_same_tables
+
+    def write(self, name, content):
+        filename = path.join(self.tempdir, name)
+        with open(filename, "w", newline="") as f:
+            f.write(content)
+        return filename
+
+    def test_same_as_sequential(self):
+        for name in ("iris", "zoo", "heart_disease", "titanic"):
+            table = Table(name)
+            read = TabReader(table.__file__, chunk_size=7, n_jobs=3).read()
+            self.assert_same_tables(table, read)
+            self.assertEqual(read.name, name)
+
+    def test_quoted_newlines(self):
+        lines = ["a,b,c"] + ['{},"x,\n{}\n",{}'.format(i, i, i % 5 / 2)
+                             for i in range(40)]
+        filename = self.write("quoted.csv", "\n".join(lines) + "\n")
+        bounds = _csv_chunk_bounds(filename, 8, '"')
+        with open(filename, "rb") as f:
+            content = f.read()
+        for bound in bounds[1:-1]:
+            # Each range starts with a row
+            self.assertRegex(content[bound:], rb"^\d+,")
+        table = CSVReader(filename).read()
+        read = CSVReader(filename, n_jobs=4).read()
+        self.assert_same_tables(table, read)
+        self.assertEqual(read.metas[1, 0], "x,\n1")
+
+    def test_fallback(self):
+        # Unbalanced quotes
+        filename = self.write("quotes.tab", 'a\tb\n1\t5"11\n2\t3\n' * 5)
+        self.assertIsNone(_csv_chunk_bounds(filename, 4, '"'))
+        table = TabReader(filename).read()
+        self.assert_same_tables(table, TabReader(filename, n_jobs=2).read())
+
+        # Value not continuous after the first rows
+        filename = self.write(
+            "values.tab",
+            "a\tb\n" + "".join("1.5\t{}\n".format(i / 2) for i in range(2000))
+            + "1.5\tx\n")
+        reader = TabReader(filename, n_jobs=2)
+        self.assertIsNone(reader._read_parallel(2))
+        table = reader.read()
+        self.assertTrue(table.domain["b"].is_string)
+        self.assert_same_tables(TabReader(filename).read(), table)
+
+    def test_encoding_beyond_prefix(self):
+        # Only the beginning of the file is checked for the encoding; the
+        # rest must still be read correctly
+        filename = self.write(
+            "utf8.tab",
+            "a\tb\n" + "".join("{}\tx\n".format(i) for i in range(2000)))
+        with open(filename, "ab") as f:
+            f.write("2000\tčšž\n".encode("utf-8"))
+        with patch("Orange.data.io._SNIFF_SIZE", 64):
+            table = TabReader(filename, n_jobs=2).read()
+        self.assert_same_tables(TabReader(filename).read(), table)
+        self.assertIn("čšž", table.domain["b"].values)
+
+    def test_all_processors(self):
+        filename = Table("iris").__file__
+        self.assert_same_tables(Table("iris"), TabReader(filename, n_jobs=-1).read())
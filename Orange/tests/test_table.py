@@ -1,6 +1,7 @@
 # Test methods with long descriptive names can omit docstrings
 # pylint: disable=missing-docstring
 
+import copy
 import os
 import unittest
 from itertools import chain
@@ -1180,6 +1181,26 @@ class TableTestCase(unittest.TestCase):
         x = filter.Values([f])(d)
         self.assertEqual(len(x), 7)
 
+        f2 = filter.FilterString("name", filter.FilterString.Equal, "wasp")
+        x = filter.Values([f, f2], conjunction=False)(d)
+        self.assertEqual(len(x), 8)
+        x = filter.Values([f, f2])(d)
+        self.assertEqual(len(x), 0)
+
+    def test_iter_batches(self):
+        d = data.Table("zoo")
+        batches = list(d.iter_batches(30))
+        self.assertEqual([len(batch) for batch in batches], [30, 30, 30, 11])
+        for batch in batches:
+            self.assertIs(batch.domain, d.domain)
+            self.assertIs(batch.X.base, d.X)
+        np.testing.assert_equal(
+            np.vstack([batch.X for batch in batches]), d.X)
+        np.testing.assert_equal(
+            np.hstack([batch.ids for batch in batches]), d.ids)
+        self.assertEqual(list(d[:0].iter_batches()), [])
+        self.assertRaises(ValueError, next, d.iter_batches(0))
+
     def test_table_dtypes(self):
         table = data.Table("iris")
         metas = np.hstack((table.metas, table.Y.reshape(len(table), 1)))
@@ -2150,6 +2171,151 @@ class TestRowInstance(unittest.TestCase):
         np.testing.assert_array_equal(table.X[:, 0], np.arange(len(table)))
 
 
+class TestConversionCache(unittest.TestCase):
+    def setUp(self):
+        self.iris = data.Table("iris")
+        self.compute = Mock(side_effect=lambda table: table.X[:, 0] * 2)
+        self.domain = data.Domain(
+            [data.ContinuousVariable("double", compute_value=self.compute)],
+            self.iris.domain.class_var)
+        self.cache = data.enable_conversion_cache()
+
+    def tearDown(self):
+        data.disable_conversion_cache()
+
+    def test_reuses_conversion(self):
+        new = data.Table.from_table(self.domain, self.iris)
+        self.assertEqual(self.compute.call_count, 1)
+        again = data.Table.from_table(self.domain, self.iris)
+        self.assertEqual(self.compute.call_count, 1)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+        np.testing.assert_equal(again.X, new.X)
+        np.testing.assert_equal(again.ids, self.iris.ids)
+
+        # Modifying the returned table must not affect the cache
+        again.X[:] = 0
+        third = data.Table.from_table(self.domain, self.iris)
+        np.testing.assert_equal(third.X, new.X)
+
+    def test_detects_changes(self):
+        data.Table.from_table(self.domain, self.iris)
+        self.iris.X[0, 0] = 42
+        new = data.Table.from_table(self.domain, self.iris)
+        self.assertEqual(self.compute.call_count, 2)
+        self.assertEqual(new.X[0, 0], 84)
+
+        # Copies have the same content and ids, hence the same conversion
+        data.Table.from_table(self.domain, self.iris.copy())
+        self.assertEqual(self.compute.call_count, 2)
+        # A table with the same values but different ids is converted anew
+        data.Table.from_table(
+            self.domain,
+            data.Table.from_numpy(self.iris.domain, self.iris.X, self.iris.Y))
+        self.assertEqual(self.compute.call_count, 3)
+
+    def test_row_indices_not_cached(self):
+        data.Table.from_table(self.domain, self.iris, [1, 2, 3])
+        data.Table.from_table(self.domain, self.iris, [1, 2, 3])
+        self.assertEqual(self.compute.call_count, 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_memory_bound(self):
+        cache = data.enable_conversion_cache(max_bytes=2000)
+        data.Table.from_table(self.domain, self.iris)
+        data.Table.from_table(self.domain, self.iris)
+        self.assertEqual(self.compute.call_count, 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_disabled(self):
+        data.disable_conversion_cache()
+        self.assertIsNone(data.get_conversion_cache())
+        data.Table.from_table(self.domain, self.iris)
+        data.Table.from_table(self.domain, self.iris)
+        self.assertEqual(self.compute.call_count, 2)
+
+
+class TestSortedIndex(unittest.TestCase):
+    def setUp(self):
+        self.iris = data.Table("iris")
+        self.iris.X[::10, 1] = np.nan
+        self.plain = self.iris.copy()
+
+    def assert_same_selection(self, flt):
+        np.testing.assert_equal(self.iris._filter_values_indicators(flt),
+                                self.plain._filter_values_indicators(flt))
+
+    def test_build(self):
+        self.assertIsNone(self.iris.get_sorted_index(0))
+        self.iris.build_sorted_index(["sepal width"])
+        self.assertIsNone(self.iris.get_sorted_index(0))
+        order, values = self.iris.get_sorted_index("sepal width")
+        col = self.iris.X[:, 1]
+        np.testing.assert_equal(values, np.sort(col[~np.isnan(col)]))
+        np.testing.assert_equal(col[order[:len(values)]], values)
+        self.assertTrue(np.all(np.isnan(col[order[len(values):]])))
+
+        self.iris.build_sorted_index()
+        self.assertIsNotNone(self.iris.get_sorted_index(3))
+        self.iris.drop_sorted_index([3])
+        self.assertIsNone(self.iris.get_sorted_index(3))
+        self.iris.drop_sorted_index()
+        self.assertIsNone(self.iris.get_sorted_index(1))
+
+    def test_lazy(self):
+        self.iris.build_sorted_index(lazy=True)
+        self.assertIsNone(self.iris._sorted_index[1])
+        self.assertIsNotNone(self.iris.get_sorted_index(1))
+        self.assertIsNotNone(self.iris._sorted_index[1])
+
+    def test_pickle(self):
+        import pickle
+
+        self.iris.build_sorted_index()
+        pickled = pickle.dumps(self.iris)
+        self.assertLess(len(pickled), 1.1 * len(pickle.dumps(self.plain)))
+        iris = pickle.loads(pickled)
+        self.assertIsNone(iris._sorted_index[1])
+        order, values = iris.get_sorted_index(1)
+        np.testing.assert_equal(order, self.iris.get_sorted_index(1)[0])
+        self.assertIsNotNone(self.iris._sorted_index[1])
+
+        self.assertIsNone(copy.deepcopy(self.iris)._sorted_index[1])
+
+    def test_filter(self):
+        self.iris.build_sorted_index()
+        FC = filter.FilterContinuous
+        for column in (0, 1):
+            for oper in range(FC.IsDefined + 1):
+                for ref, high in ((3, 5), (5, 3), (3.5, 3.5), (0, 10),
+                                  (np.nan, 5)):
+                    flt = filter.FilterContinuous(column, oper, ref, high)
+                    self.assert_same_selection(filter.Values([flt]))
+                    self.assert_same_selection(
+                        filter.Values([flt], negate=True))
+
+    def test_invalidate(self):
+        self.iris.build_sorted_index()
+        flt = filter.FilterContinuous(0, filter.FilterContinuous.Greater, 7.5)
+        self.assertEqual(sum(self.iris._filter_values_indicators(flt)), 6)
+
+        self.iris[0, 0] = 8
+        self.assertEqual(sum(self.iris._filter_values_indicators(flt)), 7)
+        self.iris[1]["sepal length"] = 8
+        self.assertEqual(sum(self.iris._filter_values_indicators(flt)), 8)
+        self.iris.append(list(self.iris[0]))
+        self.assertEqual(sum(self.iris._filter_values_indicators(flt)), 9)
+        del self.iris[0]
+        self.assertEqual(sum(self.iris._filter_values_indicators(flt)), 8)
+        self.iris.shuffle()
+        np.testing.assert_equal(self.iris._filter_values_indicators(flt),
+                                self.iris.X[:, 0] > 7.5)
+
+        self.iris.X = self.iris.X.copy()
+        self.iris.X[:, 0] = 0
+        self.assertEqual(sum(self.iris._filter_values_indicators(flt)), 0)
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,121 @@
+# Test methods with long descriptive names can omit docstrings
+# pylint: disable=missing-docstring
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from Orange.data import Table, Domain, ContinuousVariable, DiscreteVariable
+from Orange.preprocess import impute, remove
+from Orange.preprocess.discretize import Discretizer
+from Orange.preprocess.transformation import \
+    Transformation, Identity, Indicator, Indicator1, Normalizer
+
+
+class Scale(Normalizer):
+    def transform(self, c):
+        return 2 * super().transform(c)
+
+
+class Twice(Transformation):
+    def __call__(self, data):
+        return data.get_column_view(self.variable)[0] * 2
+
+
+class TestTransformColumns(unittest.TestCase):
+    def setUp(self):
+        self.data = Table("heart_disease")
+        self.data.X[::7, 0] = np.nan
+        self.data.X[::5, 2] = np.nan
+        self.data.Y[::9] = np.nan
+        self.cont = [var for var in self.data.domain.attributes
+                     if var.is_continuous]
+        self.disc = [var for var in self.data.domain.attributes
+                     if var.is_discrete] + [self.data.domain.class_var]
+
+    def domain_for(self, transformations, discrete=False):
+        cls = DiscreteVariable if discrete else ContinuousVariable
+        kwargs = {"values": ["a", "b", "c", "d", "e"]} if discrete else {}
+        return Domain([cls("v{}".format(i), compute_value=t, **kwargs)
+                       for i, t in enumerate(transformations)])
+
+    def assert_same_as_columns(self, transformations, discrete=False):
+        domain = self.domain_for(transformations, discrete)
+        for rows in (..., [4, 2, 8, 7], slice(10, 40, 3)):
+            table = Table.from_table(domain, self.data, rows)
+            expected = np.column_stack(
+                [t(self.data)[rows] for t in transformations])
+            np.testing.assert_almost_equal(table.X, expected)
+
+    def test_identity(self):
+        self.assert_same_as_columns([Identity(var) for var in self.cont])
+
+    def test_normalizer(self):
+        self.assert_same_as_columns(
+            [Normalizer(var, i, 1 / (i + 1))
+             for i, var in enumerate(self.cont)])
+
+    def test_indicators(self):
+        self.assert_same_as_columns(
+            [Indicator(var, i % 2) for i, var in enumerate(self.disc)])
+        self.assert_same_as_columns(
+            [Indicator1(var, i % 2) for i, var in enumerate(self.disc)])
+
+    def test_impute(self):
+        self.assert_same_as_columns(
+            [impute.ReplaceUnknowns(var, i)
+             for i, var in enumerate(self.cont)])
+        self.assert_same_as_columns(
+            [impute.IsDefined(var) for var in self.cont])
+        self.assert_same_as_columns(
+            [impute.Lookup(var, np.arange(len(var.values))[::-1],
+                           unknown=len(var.values))
+             for var in self.disc], discrete=True)
+
+    def test_lookup(self):
+        self.assert_same_as_columns(
+            [remove.Lookup(var, np.arange(len(var.values))[::-1])
+             for var in self.disc], discrete=True)
+
+    def test_discretizer(self):
+        self.assert_same_as_columns(
+            [Discretizer(var, [50, 100, 150][:i % 4])
+             for i, var in enumerate(self.cont)], discrete=True)
+
+    def test_derived_transform(self):
+        transformations = [Scale(var, 1, 2) for var in self.cont]
+        self.assert_same_as_columns(transformations)
+        table = Table.from_table(self.domain_for(transformations), self.data)
+        np.testing.assert_almost_equal(
+            table.X[:, 1], 4 * (self.data[:, self.cont[1]].X[:, 0] - 1))
+
+    def test_overridden_call(self):
+        transformations = [Twice(var) for var in self.cont]
+        table = Table.from_table(self.domain_for(transformations), self.data)
+        np.testing.assert_almost_equal(
+            table.X, 2 * self.data[:, self.cont].X)
+
+    def test_one_call_per_type(self):
+        transformations = [Normalizer(var, 1, 2) for var in self.cont] + \
+                          [Indicator(var, 1) for var in self.disc]
+        with patch.object(Transformation, "__call__") as call, \
+                patch.object(Normalizer, "transform_columns",
+                             wraps=Normalizer.transform_columns) as norm:
+            Table.from_table(self.domain_for(transformations), self.data)
+            call.assert_not_called()
+            norm.assert_called_once()
+
+    def test_variables_not_in_source(self):
+        # Transformation of a computed variable is computed per column
+        var = ContinuousVariable(
+            "x", compute_value=Normalizer(self.cont[0], 1, 2))
+        transformations = [Normalizer(var, 0, 3),
+                           Normalizer(self.cont[1], 0, 3)]
+        table = Table.from_table(self.domain_for(transformations), self.data)
+        np.testing.assert_almost_equal(
+            table.X,
+            np.column_stack([t(self.data) for t in transformations]))
+
+
+if __name__ == "__main__":
+    unittest.main()
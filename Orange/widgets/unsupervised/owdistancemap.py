@@ -245,7 +245,7 @@ class OWDistanceMap(widget.OWWidget):
     icon = "icons/DistanceMap.svg"
     priority = 1200
 
-    inputs = [("Distances", Orange.misc.DistMatrix, "set_distances")]
+    inputs = [("Distances", Orange.misc.DistMatrixBase, "set_distances")]
     outputs = [("Selected Data", Orange.data.Table, widget.Default),
                (ANNOTATED_DATA_SIGNAL_NAME, Orange.data.Table),
                ("Features", widget.AttributeList)]
@@ -538,7 +538,8 @@ class OWDistanceMap(widget.OWWidget):
 
     def _update_ordering(self):
         if self.sorting == OWDistanceMap.NoOrdering:
-            self._sorted_matrix = self.matrix
+            # Condensed matrices are expanded only for the image
+            self._sorted_matrix = self.matrix[:, :]
             self._sort_indices = None
         else:
             if self.sorting == OWDistanceMap.Clustering:
@@ -1,15 +1,13 @@
 from math import isnan
 import itertools
 
-import numpy as np
-
 from AnyQt.QtWidgets import QTableView, QItemDelegate, QHeaderView
 from AnyQt.QtGui import QColor, QPen, QBrush
 from AnyQt.QtCore import Qt, QAbstractTableModel, QModelIndex, \
     QItemSelectionModel, QItemSelection, QSize
 
 from Orange.data import Table, Variable, ContinuousVariable, DiscreteVariable
-from Orange.misc import DistMatrix
+from Orange.misc import DistMatrix, DistMatrixBase, CondensedDistMatrix
 from Orange.widgets import widget, gui
 from Orange.widgets.data.owtable import ranges
 from Orange.widgets.gui import OrangeUserRole
@@ -24,7 +22,7 @@ class DistanceMatrixModel(QAbstractTableModel):
         self.distances = None
         self.fact = 70
         self.labels = None
-        self.colors = None
+        self.color_scale = 0
         self.variable = None
         self.values = None
         self.label_colors = None
@@ -35,9 +33,10 @@ class DistanceMatrixModel(QAbstractTableModel):
         self.distances = distances
         if distances is None:
             return
+        # Colors are computed for each shown cell, so that the matrix, which
+        # can be condensed, is not copied
         span = distances.max()
-        self.colors = \
-            (distances * (170 / span if span > 1e-10 else 0)).astype(np.int)
+        self.color_scale = 170 / span if span > 1e-10 else 0
         self.zero_diag = all(distances.diagonal() < 1e-6)
         self.endResetModel()
 
@@ -75,7 +74,9 @@ class DistanceMatrixModel(QAbstractTableModel):
         return QBrush(color)
 
     def color_for_cell(self, row, col):
-        return QBrush(QColor.fromHsv(120, self.colors[row, col], 255))
+        value = self.distances[row, col] * self.color_scale
+        return QBrush(QColor.fromHsv(120, 0 if isnan(value) else int(value),
+                                     255))
 
     def data(self, index, role=Qt.DisplayRole):
         if role == Qt.TextAlignmentRole:
@@ -202,7 +203,7 @@ class OWDistanceMatrix(widget.OWWidget):
     icon = "icons/DistanceMatrix.svg"
     priority = 200
 
-    inputs = [("Distances", DistMatrix, "set_distances")]
+    inputs = [("Distances", DistMatrixBase, "set_distances")]
     outputs = [("Distances", DistMatrix),
                ("Table", Table)]
 
@@ -322,6 +323,9 @@ class OWDistanceMatrix(widget.OWWidget):
             inds = self.tableview.selectionModel().selected_items()
             if inds:
                 sub_distances = self.distances.submatrix(inds)
+                # The output is dense, as expected by other widgets
+                if isinstance(sub_distances, CondensedDistMatrix):
+                    sub_distances = sub_distances.dense()
                 if self.distances.axis and isinstance(self.items, Table):
                     sub_table = self.items[inds]
         self.send("Distances", sub_distances)
@@ -1,6 +1,9 @@
 # Test methods with long descriptive names can omit docstrings
 # pylint: disable=missing-docstring
 import random
+
+import numpy as np
+
 from Orange.distance import Euclidean
 from Orange.widgets.unsupervised.owdistancemap import OWDistanceMap
 from Orange.widgets.tests.base import WidgetTest, WidgetOutputsTestMixin
@@ -24,3 +27,15 @@ class TestOWDistanceMap(WidgetTest, WidgetOutputsTestMixin):
         self.widget._selection = selected_indices
         self.widget.commit()
         return selected_indices
+
+    def test_condensed_distances(self):
+        distances = Euclidean(self.data, condensed=True)
+        for sorting in (OWDistanceMap.NoOrdering, OWDistanceMap.Clustering,
+                        OWDistanceMap.OrderedClustering):
+            self.widget.sorting = sorting
+            self.send_signal("Distances", distances)
+            self.assertEqual(self.widget._sorted_matrix.shape,
+                             (len(self.data), len(self.data)))
+            if sorting == OWDistanceMap.NoOrdering:
+                np.testing.assert_equal(self.widget._sorted_matrix,
+                                        distances.dense())
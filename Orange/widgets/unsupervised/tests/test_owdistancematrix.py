@@ -1,3 +1,5 @@
+from AnyQt.QtCore import Qt
+
 from Orange.data import Table
 from Orange.distance import Euclidean
 from Orange.widgets.tests.base import WidgetTest
@@ -22,3 +24,13 @@ class TestOWDistanceMatrix(WidgetTest):
         distances.row_items = None
         self.widget.set_distances(distances)
         self.assertNotIn(iris.domain[0], self.widget.annot_combo.model())
+
+    def test_condensed_distances(self):
+        iris = Table("iris")[:5]
+        distances = Euclidean(iris, condensed=True)
+        self.widget.set_distances(distances)
+        model = self.widget.tablemodel
+        self.assertEqual(model.rowCount(), 5)
+        self.assertEqual(model.data(model.index(1, 2)),
+                         "{:.3f}".format(distances[1, 2]))
+        model.data(model.index(1, 2), Qt.BackgroundColorRole)
@@ -4,6 +4,7 @@ from itertools import product, chain
 from math import sqrt, log
 from operator import mul, attrgetter
 
+import numpy as np
 from scipy.stats import distributions
 from scipy.misc import comb
 from AnyQt.QtCore import Qt, QSize, pyqtSignal as Signal
@@ -49,9 +50,12 @@ class MosaicVizRank(VizRankDialog, OWComponent):
             callback=self.max_attr_changed)
         gui.rubber(box)
         self.layout().addWidget(self.button)
+        self.processingStateChanged.connect(
+            lambda state: self.max_attr_spin.setDisabled(state == 1))
         self.attr_ordering = None
         self.marginal = {}
         self.last_run_max_attr = None
+        self._columns = None
 
     def sizeHint(self):
         return QSize(400, 512)
@@ -69,11 +73,12 @@ class MosaicVizRank(VizRankDialog, OWComponent):
         """
         Add handling of the spin box for maximal number of attributes.
 
-        Disable the spin for maximal number of attributes before running and
-        enable afterwards. Also, if the number of attributes is different than
+        The spin for maximal number of attributes is disabled while states
+        are being scored. If the number of attributes is different than
         in the last run, reset the saved state (if it was paused).
         """
         if self.max_attrs != self.last_run_max_attr:
+            self._cancel()
             self.saved_state = None
             self.saved_progress = 0
         if self.saved_state is None:
@@ -81,11 +86,7 @@ class MosaicVizRank(VizRankDialog, OWComponent):
             self.rank_model.clear()
         self.compute_attr_order()
         self.last_run_max_attr = self.max_attrs
-        self.max_attr_spin.setDisabled(True)
-        try:
-            super().run()
-        finally:
-            self.max_attr_spin.setDisabled(False)
+        super().run()
 
     def max_attr_changed(self):
         """
@@ -195,6 +196,19 @@ class MosaicVizRank(VizRankDialog, OWComponent):
                 else:
                     break
 
+    def prepare_scoring(self):
+        """
+        Store columns with indices of values for all variables, so that
+        `compute_score` can count the combinations of values with numpy.
+        """
+        data = self.master.discrete_data
+        if isinstance(data, SqlTable):
+            self._columns = None
+        else:
+            self._columns = {
+                attr: data.get_column_view(attr)[0].astype(float)
+                for attr in data.domain.variables}
+
     def compute_score(self, state):
         """
         Compute score using chi-square test of independence.
@@ -203,6 +217,38 @@ class MosaicVizRank(VizRankDialog, OWComponent):
         comparing the expected (prior) and observed class distribution in
         each cell. Otherwise, compute the independence of the shown attributes.
         """
+        if self._columns is None:
+            return self._compute_score_from_table(state)
+        domain = self.master.discrete_data.domain
+        attrlist = [self.attr_ordering[i] for i in state]
+        shape = tuple(len(attr.values) for attr in attrlist)
+        n = len(self._columns[attrlist[0]])
+
+        def counts(attrs, shape):
+            cols = np.vstack([self._columns[attr] for attr in attrs])
+            cols = cols[:, ~np.isnan(cols).any(axis=0)].astype(int)
+            return np.bincount(np.ravel_multi_index(cols, shape),
+                               minlength=reduce(mul, shape)).reshape(shape)
+
+        totals = counts(attrlist, shape)
+        if self._compute_class_dists():
+            class_var = domain.class_var
+            observed = counts(attrlist + [class_var],
+                              shape + (len(class_var.values), ))
+            expected = totals[..., np.newaxis] * np.asarray(self.marginal)
+            dof = (len(class_var.values) - 1) * reduce(mul, shape)
+        else:
+            observed = totals
+            expected = n * reduce(
+                np.multiply.outer,
+                (np.asarray(self.marginal[domain.index(attr)])
+                 for attr in attrlist))
+            dof = reduce(mul, (len(attr.values) - 1 for attr in attrlist))
+        mask = expected > 1e-6
+        ss = np.sum((expected[mask] - observed[mask]) ** 2 / expected[mask])
+        return distributions.chi2.sf(ss, dof)
+
+    def _compute_score_from_table(self, state):
         master = self.master
         data = master.discrete_data
         domain = data.domain
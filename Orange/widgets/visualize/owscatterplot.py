@@ -6,7 +6,6 @@ from AnyQt.QtGui import (
 )
 from AnyQt.QtWidgets import QApplication, QAction
 
-from sklearn.neighbors import NearestNeighbors
 from sklearn.metrics import r2_score
 
 import Orange
@@ -14,6 +13,7 @@ from Orange.data import Table, Domain, StringVariable, ContinuousVariable, \
     DiscreteVariable
 from Orange.canvas import report
 from Orange.data.sql.table import SqlTable, AUTO_DL_LIMIT
+from Orange.misc.neighbors import NeighborIndex
 from Orange.preprocess.score import ReliefF, RReliefF
 from Orange.widgets import gui
 from Orange.widgets.settings import \
@@ -62,22 +62,30 @@ class ScatterPlotVizRank(VizRankDialogAttrPair):
             self.attrs = self.score_heuristic()
         yield from super().iterate_states(initial_state)
 
-    def compute_score(self, state):
+    def prepare_scoring(self):
+        # Columns are taken once for all pairs; this also protects the
+        # scoring threads from changes of jittering
         graph = self.master.graph
-        ind12 = [graph.domain.index(self.attrs[x]) for x in state]
-        valid = graph.get_valid_list(ind12)
-        X = graph.jittered_data[ind12, :][:, valid].T
-        Y = self.master.data.Y[valid]
+        indices = [graph.domain.index(attr) for attr in self.attrs]
+        self._jittered = graph.jittered_data[indices]
+        self._valid = graph.valid_data_array[indices]
+        self._Y = self.master.data.Y
+        self._n_instances = len(self.master.data)
+        self._discrete_class = self.master.data.domain.has_discrete_class
+
+    def compute_score(self, state):
+        valid = np.all(self._valid[list(state)], axis=0)
+        X = self._jittered[list(state)][:, valid].T
+        Y = self._Y[valid]
         if X.shape[0] < self.K:
             return
         n_neighbors = min(self.K, len(X) - 1)
-        knn = NearestNeighbors(n_neighbors=n_neighbors).fit(X)
-        ind = knn.kneighbors(return_distance=False)
-        if self.master.data.domain.has_discrete_class:
+        _, ind = NeighborIndex(X).query_rows(np.arange(len(X)), n_neighbors)
+        if self._discrete_class:
             return -np.sum(Y[ind] == Y.reshape(-1, 1))
         else:
             return -r2_score(Y, np.mean(Y[ind], axis=1)) * \
-                   (len(Y) / len(self.master.data))
+                   (len(Y) / self._n_instances)
 
     def score_heuristic(self):
         X = self.master.graph.jittered_data.T
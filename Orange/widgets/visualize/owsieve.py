@@ -29,7 +29,21 @@ class ChiSqStats:
     pair of attributes. The class is also used for ranking.
     """
     def __init__(self, data, attr1, attr2):
-        self.observed = get_contingency(data, attr1, attr2)
+        self._set_observed(get_contingency(data, attr1, attr2))
+
+    @classmethod
+    def from_observed(cls, observed):
+        """
+        Construct statistics from a contingency matrix with a row for each
+        value of the second and a column for each value of the first
+        attribute.
+        """
+        stats = cls.__new__(cls)
+        stats._set_observed(observed)
+        return stats
+
+    def _set_observed(self, observed):
+        self.observed = observed
         self.n = np.sum(self.observed)
         self.probs_x = self.observed.sum(axis=0) / self.n
         self.probs_y = self.observed.sum(axis=1) / self.n
@@ -49,8 +63,30 @@ class SieveRank(VizRankDialogAttrPair):
         super().initialize()
         self.attrs = self.master.attrs
 
+    def prepare_scoring(self):
+        # Columns are taken once and then contingencies are counted with
+        # numpy for each pair, instead of constructing them from the table
+        data = self.master.discrete_data
+        if isinstance(data, SqlTable):
+            self._data, self._columns = data, None
+            return
+        self._data = data
+        self._columns = [data.get_column_view(attr)[0].astype(float)
+                         for attr in self.attrs]
+        self._weights = data.W.ravel() if data.has_weights() else None
+
     def compute_score(self, state):
-        return ChiSqStats(self.master.discrete_data, *state).p
+        i, j = state
+        if self._columns is None:
+            return ChiSqStats(self._data, self.attrs[i], self.attrs[j]).p
+        col1, col2 = self._columns[i], self._columns[j]
+        n1, n2 = len(self.attrs[i].values), len(self.attrs[j].values)
+        known = ~(np.isnan(col1) | np.isnan(col2))
+        weights = self._weights[known] if self._weights is not None else None
+        observed = np.bincount(
+            col2[known].astype(int) * n1 + col1[known].astype(int),
+            weights=weights, minlength=n1 * n2).reshape(n2, n1)
+        return ChiSqStats.from_observed(observed.astype(float)).p
 
 
 class OWSieveDiagram(OWWidget):
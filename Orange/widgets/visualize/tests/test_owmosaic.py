@@ -1,8 +1,10 @@
 # Test methods with long descriptive names can omit docstrings
 # pylint: disable=missing-docstring
-from PyQt4.QtCore import QEvent, QPoint, Qt
+from PyQt4.QtCore import QEvent, QPoint, Qt, QThreadPool
 from PyQt4.QtGui import QMouseEvent
 
+import numpy as np
+
 from Orange.data import Table, DiscreteVariable, Domain
 from Orange.widgets.tests.base import WidgetTest, WidgetOutputsTestMixin
 from Orange.widgets.visualize.owmosaic import OWMosaicDisplay, MosaicVizRank
@@ -45,6 +47,12 @@ class MosaicVizRankTests(WidgetTest):
         self.widget = self.create_widget(OWMosaicDisplay)
         self.vizrank = self.widget.vizrank
 
+    def _wait(self):
+        # States are scored in threads; results are inserted by the event loop
+        while self.vizrank._tasks:
+            QThreadPool.globalInstance().waitForDone()
+            self.process_events()
+
     def test_count(self):
         """MosaicVizrank correctly computes the number of combinations"""
         widget = self.widget
@@ -147,15 +155,75 @@ class MosaicVizRankTests(WidgetTest):
 
         widget.interior_coloring = widget.PEARSON
         vizrank.toggle()
+        self._wait()
         self.assertEqual(vizrank.rank_model.rowCount(), 10)  # 4x5 / 2
         widget.interior_coloring = widget.CLASS_DISTRIBUTION
         vizrank.toggle()
+        self._wait()
         self.assertEqual(vizrank.rank_model.rowCount(), 10)  # 4 + 4x5 / 2
 
         widget.set_data(self.iris_no_class)
         vizrank.toggle()
+        self._wait()
         self.assertEqual(vizrank.rank_model.rowCount(), 6)  # 3x4 / 2
 
         data = Table("housing.tab")
         widget.set_data(data)
         vizrank.toggle()
+        self._wait()
+
+    def test_pause_and_continue(self):
+        """Pausing keeps the scored states; continuing scores the rest"""
+        widget = self.widget
+        vizrank = self.vizrank
+        vizrank.batch_size = 1
+        widget.set_data(self.iris)
+        vizrank.max_attrs = 2
+        widget.interior_coloring = widget.PEARSON
+
+        pool = QThreadPool.globalInstance()
+        max_threads = pool.maxThreadCount()
+        pool.setMaxThreadCount(1)
+        try:
+            vizrank.toggle()
+            vizrank.toggle()
+            self._wait()
+        finally:
+            pool.setMaxThreadCount(max_threads)
+        self.assertIsNotNone(vizrank.saved_state)
+        self.assertLess(vizrank.rank_model.rowCount(), 10)
+        self.assertEqual(vizrank.rank_model.rowCount(), vizrank.saved_progress)
+
+        vizrank.toggle()
+        self._wait()
+        self.assertIsNone(vizrank.saved_state)
+        self.assertEqual(vizrank.rank_model.rowCount(), 10)
+        self.assertEqual(vizrank.scores, sorted(vizrank.scores))
+
+    def test_reset_discards_pending_states(self):
+        """New data cancels the states that are being scored"""
+        widget = self.widget
+        vizrank = self.vizrank
+        widget.set_data(self.iris)
+        vizrank.max_attrs = 2
+        vizrank.toggle()
+        widget.set_data(self.iris_no_class)
+        self.assertFalse(vizrank._tasks)
+        QThreadPool.globalInstance().waitForDone()
+        self.process_events()
+        self.assertEqual(vizrank.rank_model.rowCount(), 0)
+
+    def test_scores_from_table(self):
+        """Scores computed from columns equal those computed from the table"""
+        widget = self.widget
+        vizrank = self.vizrank
+        widget.set_data(Table("titanic"))
+        for coloring in (widget.PEARSON, widget.CLASS_DISTRIBUTION):
+            widget.interior_coloring = coloring
+            vizrank.compute_attr_order()
+            states = list(map(list, vizrank.iterate_states(None)))
+            vizrank.prepare_scoring()
+            np.testing.assert_almost_equal(
+                [vizrank.compute_score(state) for state in states],
+                [vizrank._compute_score_from_table(state)
+                 for state in states])
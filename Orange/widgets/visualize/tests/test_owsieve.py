@@ -3,8 +3,9 @@
 from PyQt4.QtCore import QEvent, QPoint, Qt
 from PyQt4.QtGui import QMouseEvent
 
+from Orange.data import Table
 from Orange.widgets.tests.base import WidgetTest, WidgetOutputsTestMixin
-from Orange.widgets.visualize.owsieve import OWSieveDiagram
+from Orange.widgets.visualize.owsieve import OWSieveDiagram, ChiSqStats
 
 
 class TestOWSieveDiagram(WidgetTest, WidgetOutputsTestMixin):
@@ -25,3 +26,17 @@ class TestOWSieveDiagram(WidgetTest, WidgetOutputsTestMixin):
             QEvent.MouseButtonPress, QPoint(), Qt.LeftButton,
             Qt.LeftButton, Qt.KeyboardModifiers()))
         return [0, 4, 6, 7, 11, 17, 19, 21, 22, 24, 26, 39, 40, 43, 44, 46]
+
+
+    def test_vizrank_scores(self):
+        """Scores computed from columns equal those of ChiSqStats"""
+        data = Table("heart_disease")
+        self.send_signal("Data", data)
+        vizrank = self.widget.vizrank
+        attrs = vizrank.attrs
+        states = list(vizrank.iterate_states(None))
+        vizrank.prepare_scoring()
+        for state in states:
+            stats = ChiSqStats(self.widget.discrete_data,
+                               attrs[state[0]], attrs[state[1]])
+            self.assertAlmostEqual(vizrank.compute_score(state), stats.p)
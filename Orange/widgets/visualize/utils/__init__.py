@@ -3,9 +3,12 @@ Utility classes for visualization widgets
 """
 
 from bisect import bisect_left
+from collections import deque
+from copy import copy
+from itertools import islice
 from operator import attrgetter
 
-from AnyQt.QtCore import Qt, QSize, pyqtSignal as Signal
+from AnyQt.QtCore import Qt, QSize, QThreadPool, pyqtSignal as Signal
 from AnyQt.QtGui import QStandardItemModel, QStandardItem, QColor, QBrush, QPen
 from AnyQt.QtWidgets import (
     QTableView, QGraphicsTextItem, QGraphicsRectItem, QGraphicsView, QDialog,
@@ -14,6 +17,7 @@ from AnyQt.QtWidgets import (
 from Orange.data import Variable
 from Orange.widgets import gui
 from Orange.widgets.gui import HorizontalGridDelegate
+from Orange.widgets.utils.concurrent import ThreadExecutor, FutureWatcher
 from Orange.widgets.utils.messages import WidgetMessagesMixin
 from Orange.widgets.utils.progressbar import ProgressBarMixin
 from Orange.widgets.widget import Msg
@@ -53,11 +57,16 @@ class VizRankDialog(QDialog, ProgressBarMixin, WidgetMessagesMixin):
     Clicking the Start button calls method `run` (and renames the button to
     Pause). Run sets up a progress bar by getting the number of combinations
     from :obj:`VizRankDialog.state_count()`. It restores the paused state
-    (if any) and calls generator :obj:`VizRankDialog.iterate_states()`. For
-    each generated state, it calls :obj:`VizRankDialog.score(state)`, which
-    must return the score (lower is better) for this state. If the returned
-    state is not `None`, the data returned by `row_for_state` is inserted at
-    the appropriate place in the table.
+    (if any) and calls generator :obj:`VizRankDialog.iterate_states()`.
+    Generated states are scored in batches of `batch_size` in a pool of
+    threads, so the GUI remains responsive. Before the first batch, `run`
+    calls :obj:`VizRankDialog.prepare_scoring()`, in which derived classes
+    can precompute data that is shared by all states. For each state, a
+    thread calls :obj:`VizRankDialog.compute_score(state)`, which must return
+    the score (lower is better) for this state. If the returned score is not
+    `None`, the data returned by `row_for_state` is inserted at the
+    appropriate place in the table. Batches are inserted in the order in
+    which the states were generated.
 
     Args:
         master (Orange.widget.OWWidget): widget to which the dialog belongs
@@ -69,6 +78,8 @@ class VizRankDialog(QDialog, ProgressBarMixin, WidgetMessagesMixin):
     """
 
     captionTitle = ""
+    #: the number of states that are scored by a single task
+    batch_size = 64
 
     processingStateChanged = Signal(int)
     progressBarValueChanged = Signal(float)
@@ -95,6 +106,14 @@ class VizRankDialog(QDialog, ProgressBarMixin, WidgetMessagesMixin):
         self.saved_progress = 0
         self.scores = []
 
+        self._executor = ThreadExecutor(self)
+        # Iterator over states that are yet to be scored, and a queue of
+        # tuples (future, watcher, states) for batches that are being scored
+        self._states = None
+        self._tasks = deque()
+        self._state_count = 1
+        self._scoring_prepared = False
+
         self.rank_model = QStandardItemModel(self)
         self.rank_table = view = QTableView(
             selectionBehavior=QTableView.SelectRows,
@@ -168,6 +187,7 @@ class VizRankDialog(QDialog, ProgressBarMixin, WidgetMessagesMixin):
         This method must be called by the widget when the data is reset,
         e.g. from `set_data` handler.
         """
+        self._cancel()
         self.keep_running = False
         self.scheduled_call = None
         self.saved_state = None
@@ -178,11 +198,10 @@ class VizRankDialog(QDialog, ProgressBarMixin, WidgetMessagesMixin):
         self.button.setEnabled(self.check_preconditions())
 
     def stop_and_reset(self, reset_method=None):
-        if self.keep_running:
-            self.scheduled_call = reset_method or self.initialize
-            self.keep_running = False
-        else:
-            self.initialize()
+        # Scores of pending states are discarded, so reset can be immediate
+        self._cancel()
+        self.keep_running = False
+        (reset_method or self.initialize)()
 
     def check_preconditions(self):
         """Check whether there is sufficient data for ranking."""
@@ -223,11 +242,24 @@ class VizRankDialog(QDialog, ProgressBarMixin, WidgetMessagesMixin):
         the progress bar"""
         return 0
 
+    def prepare_scoring(self):
+        """
+        Precompute data that is used for scoring all states, e.g. columns of
+        data for individual attributes.
+
+        The method is called in the GUI thread, after the first batch of
+        states is generated. Methods `compute_score` are called from other
+        threads afterwards, so they must not modify the dialog or the widget.
+        """
+        pass
+
     def compute_score(self, state):
         """
         Abstract method for computing the score for the given state. Smaller
         scores are better.
 
+        The method is called from a worker thread.
+
         Args:
             state: the state, e.g. the combination of attributes as generated
                 by :obj:`state_count`.
@@ -249,37 +281,100 @@ class VizRankDialog(QDialog, ProgressBarMixin, WidgetMessagesMixin):
             self.rank_table.selectRow(0)
 
     def run(self):
-        """Compute and show scores"""
-        with self.progressBar(self.state_count()) as progress:
-            progress.advance(self.saved_progress)
-            for state in self.iterate_states(self.saved_state):
-                if not self.keep_running:
-                    if self.scheduled_call:
-                        self.scheduled_call()
-                    else:
-                        self.saved_state = state
-                        self.saved_progress = progress.count
-                        self._select_first_if_none()
-                    return
-                score = self.compute_score(state)
+        """Start (or continue) computing and showing scores"""
+        self._state_count = max(self.state_count(), 1)
+        self.progressBarInit(None)
+        self.progressBarSet(100 * self.saved_progress / self._state_count,
+                            None)
+        if self._states is None:
+            self._states = iter(self.iterate_states(self.saved_state))
+            self._scoring_prepared = False
+        self._fill_queue()
+        if not self._tasks:
+            self._finish()
+
+    def _fill_queue(self):
+        # Keep some batches waiting, so the threads do not idle
+        n_tasks = 2 * QThreadPool.globalInstance().maxThreadCount()
+        while len(self._tasks) < n_tasks and self._submit_batch():
+            pass
+
+    def _submit_batch(self):
+        # States may be reused by `iterate_states`, so they are copied
+        states = [copy(state)
+                  for state in islice(self._states, self.batch_size)]
+        if not states:
+            return False
+        if not self._scoring_prepared:
+            self.prepare_scoring()
+            self._scoring_prepared = True
+        future = self._executor.submit(self._compute_scores, states)
+        watcher = FutureWatcher(future)
+        watcher.finished.connect(self._on_batch_finished)
+        self._tasks.append((future, watcher, states))
+        return True
+
+    def _compute_scores(self, states):
+        return [self.compute_score(state) for state in states]
+
+    def _on_batch_finished(self):
+        if self._states is None:  # batches were already processed
+            return
+        while self._tasks and self._tasks[0][0].done():
+            future, _, states = self._tasks.popleft()
+            for score, state in zip(future.result(), states):
                 if score is not None:
                     pos = bisect_left(self.scores, score)
                     self.rank_model.insertRow(
                         pos, self.row_for_state(score, state))
                     self.scores.insert(pos, score)
-                progress.advance()
-            self._select_first_if_none()
-            self.button.setText("Finished")
-            self.button.setEnabled(False)
-            self.keep_running = False
-            self.saved_state = None
+            self.saved_progress += len(states)
+            self.progressBarSet(
+                100 * self.saved_progress / self._state_count, None)
+        if self.keep_running:
+            self._fill_queue()
+        if self._tasks:
+            return
+        if self.keep_running:
+            self._finish()
+        else:  # paused
+            state = next(self._states, None)
+            self._states = None
+            self.saved_state = copy(state)
+            self.progressBarFinished(None)
+            if state is None:
+                self._finish()
+            else:
+                self._select_first_if_none()
+
+    def _finish(self):
+        self._states = None
+        self.progressBarFinished(None)
+        self._select_first_if_none()
+        self.button.setText("Finished")
+        self.button.setEnabled(False)
+        self.keep_running = False
+        self.saved_state = None
+
+    def _cancel(self):
+        """Discard the states that are being scored"""
+        for future, watcher, _ in self._tasks:
+            future.cancel()
+            watcher.finished.disconnect(self._on_batch_finished)
+        if self._tasks or self._states is not None:
+            self.progressBarFinished(None)
+        self._tasks.clear()
+        self._states = None
 
     def toggle(self):
         """Start or pause the computation."""
         self.keep_running = not self.keep_running
         if self.keep_running:
             self.button.setText("Pause")
-            self.run()
+            if self._tasks:  # paused while states were still being scored
+                self._fill_queue()
+            else:
+                self.run()
         else:
             self._select_first_if_none()
             self.button.setText("Continue")
@@ -1,3 +1,5 @@
+import numpy as np
+
 from .base import Benchmark, benchmark, pandas_only, non_pandas_only
 from Orange.data import Table
 from Orange.preprocess import Discretize
@@ -15,6 +17,8 @@ except:
 class BenchBasic(Benchmark):
     def setUp(self):
         self.iris = Table('iris')
+        self.iris_large = Table.from_table_rows(
+            self.iris, np.tile(np.arange(len(self.iris)), 1000))
         self.adult = Table('adult')
         self.discretizer = Discretize(EqualFreq(n=3))
 
@@ -74,3 +78,15 @@ class BenchBasic(Benchmark):
     def bench_iris_iteration_pre_pandas(self):
         for _ in self.iris:
             pass
+
+    @non_pandas_only
+    @benchmark(number=3, warmup=1)
+    def bench_iris_large_iteration_pre_pandas(self):
+        for _ in self.iris_large:
+            pass
+
+    @non_pandas_only
+    @benchmark(number=3, warmup=1)
+    def bench_iris_large_iter_batches(self):
+        for batch in self.iris_large.iter_batches(10000):
+            batch.X.sum(axis=1)
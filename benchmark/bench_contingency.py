@@ -0,0 +1,39 @@
+import numpy as np
+import scipy.sparse as sp
+
+from Orange.data import Table, Domain, ContinuousVariable, DiscreteVariable
+from Orange.statistics.contingency import get_contingencies
+
+from .base import Benchmark, benchmark
+
+
+# noinspection PyStatementEffect
+class BenchContingency(Benchmark):
+    def setUp(self):
+        random = np.random.RandomState(0)
+        class_var = DiscreteVariable("y", values=["a", "b", "c"])
+        y = random.randint(3, size=5000).astype(float)
+
+        x = random.randint(5, size=(5000, 1000)).astype(float)
+        domain = Domain([DiscreteVariable("d{}".format(i), values="abcde")
+                         for i in range(x.shape[1])], class_var)
+        self.discrete = Table.from_numpy(domain, x, y)
+        x[random.random_sample(x.shape) > 0.05] = 0
+        self.sparse = Table.from_numpy(domain, sp.csr_matrix(x), y)
+
+        x = np.round(random.normal(size=(5000, 1000)), 2)
+        domain = Domain([ContinuousVariable("c{}".format(i))
+                         for i in range(x.shape[1])], class_var)
+        self.continuous = Table.from_numpy(domain, x, y)
+
+    @benchmark(number=3)
+    def bench_discrete(self):
+        get_contingencies(self.discrete)
+
+    @benchmark(number=3)
+    def bench_discrete_sparse(self):
+        get_contingencies(self.sparse)
+
+    @benchmark(number=3)
+    def bench_continuous(self):
+        get_contingencies(self.continuous)
@@ -0,0 +1,34 @@
+import numpy as np
+import scipy.sparse as sp
+
+from Orange.data import Table, Domain, ContinuousVariable, DiscreteVariable
+from Orange.preprocess.discretize import \
+    DomainDiscretizer, EqualFreq, EntropyMDL
+
+from .base import Benchmark, benchmark
+
+
+# noinspection PyStatementEffect
+class BenchDiscretize(Benchmark):
+    def setUp(self):
+        random = np.random.RandomState(0)
+        x = np.round(random.normal(size=(2000, 2000)), 2)
+        domain = Domain([ContinuousVariable("x{}".format(i))
+                         for i in range(x.shape[1])],
+                        DiscreteVariable("y", values=["a", "b"]))
+        y = (x[:, 0] > 0).astype(float)
+        self.dense = Table.from_numpy(domain, x, y)
+        x[random.random_sample(x.shape) > 0.05] = 0
+        self.sparse = Table.from_numpy(domain, sp.csr_matrix(x), y)
+
+    @benchmark(number=3)
+    def bench_equal_freq(self):
+        DomainDiscretizer(self.dense, method=EqualFreq())
+
+    @benchmark(number=3)
+    def bench_entropy_mdl(self):
+        DomainDiscretizer(self.dense, method=EntropyMDL())
+
+    @benchmark(number=3)
+    def bench_equal_freq_sparse(self):
+        DomainDiscretizer(self.sparse, method=EqualFreq())
@@ -0,0 +1,54 @@
+import numpy as np
+from scipy import stats
+import sklearn.metrics as skl_metrics
+
+from Orange.distance import Euclidean, PearsonR, SpearmanR
+
+from .base import Benchmark, benchmark
+
+
+def _pearson_pairs(x):
+    """Pearson distances as computed before they were computed by blocks of
+    dot products; kept for comparison."""
+    rho = np.array([[stats.pearsonr(i, j)[0] for j in x] for i in x])
+    return (1. - rho) / 2.
+
+
+# noinspection PyStatementEffect
+class BenchDistance(Benchmark):
+    def setUp(self):
+        random = np.random.RandomState(0)
+        self.x = random.random_sample((5000, 50))
+        self.x_small = self.x[:500]
+
+    @benchmark(number=1, warmup=1)
+    def bench_euclidean_full(self):
+        skl_metrics.pairwise.pairwise_distances(self.x, metric="euclidean")
+
+    @benchmark(number=1, warmup=1)
+    def bench_euclidean_blocks(self):
+        Euclidean(self.x)
+
+    @benchmark(number=1, warmup=1)
+    def bench_euclidean_blocks_float32(self):
+        Euclidean(self.x, dtype=np.float32)
+
+    @benchmark(number=1, warmup=1)
+    def bench_euclidean_condensed(self):
+        Euclidean(self.x, condensed=True)
+
+    @benchmark(number=1, repeat=1, warmup=0)
+    def bench_pearson_pairs(self):
+        _pearson_pairs(self.x_small)
+
+    @benchmark(number=1, warmup=1)
+    def bench_pearson_blocks(self):
+        PearsonR(self.x_small)
+
+    @benchmark(number=1, warmup=1)
+    def bench_spearman_full(self):
+        stats.spearmanr(self.x_small, self.x_small, axis=1)
+
+    @benchmark(number=1, warmup=1)
+    def bench_spearman_blocks(self):
+        SpearmanR(self.x_small)
@@ -0,0 +1,44 @@
+import os
+import shutil
+import tempfile
+
+from Orange.data import Table
+from Orange.data.io import TabReader
+
+from .base import Benchmark, benchmark
+
+
+SCALE = 100
+
+
+# noinspection PyStatementEffect
+class BenchTabReader(Benchmark):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Adult with its rows repeated SCALE times
+        cls.tempdir = tempfile.mkdtemp()
+        cls.filename = os.path.join(cls.tempdir, 'adult_large.tab')
+        with open(Table('adult').__file__, 'rb') as f:
+            header = b''.join(f.readline() for _ in range(3))
+            rows = f.read()
+        with open(cls.filename, 'wb') as f:
+            f.write(header)
+            for _ in range(SCALE):
+                f.write(rows)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    @benchmark(number=1, repeat=1, warmup=0)
+    def bench_adult_large_read(self):
+        TabReader(self.filename).read()
+
+    @benchmark(number=1, repeat=1, warmup=0)
+    def bench_adult_large_read_chunked(self):
+        TabReader(self.filename, chunk_size=10000).read()
+
+    @benchmark(number=1, repeat=1, warmup=0)
+    def bench_adult_large_read_parallel(self):
+        TabReader(self.filename, n_jobs=-1).read()
@@ -0,0 +1,39 @@
+import numpy as np
+
+from Orange.classification import NaiveBayesLearner
+from Orange.data import Table
+
+from .base import Benchmark, benchmark
+
+
+def _predict_storage_loop(model, data):
+    """Prediction as implemented before the probabilities were vectorized;
+    kept for comparison."""
+    n_cls = len(model.class_freq)
+    class_prob = (model.class_freq + 1) / (np.sum(model.class_freq) + n_cls)
+    log_cont_prob = [np.log(np.divide(np.array(c) + 1,
+                                      model.class_freq.reshape((n_cls, 1)) +
+                                      c.shape[1])) for c in model.cont]
+    probs = np.exp(np.array([np.sum(attr_prob[:, int(attr_val)]
+                                    for attr_val, attr_prob
+                                    in zip(ins, log_cont_prob)
+                                    if not np.isnan(attr_val))
+                             for ins in data]) + np.log(class_prob))
+    probs /= probs.sum(axis=1)[:, None]
+    return probs.argmax(axis=1), probs
+
+
+# noinspection PyStatementEffect
+class BenchNaiveBayes(Benchmark):
+    def setUp(self):
+        adult = Table('adult')
+        self.model = NaiveBayesLearner()(adult)
+        self.adult = Table.from_table(self.model.domain, adult)
+
+    @benchmark(number=3, warmup=1)
+    def bench_adult_predict_loop(self):
+        _predict_storage_loop(self.model, self.adult)
+
+    @benchmark(number=10, warmup=1)
+    def bench_adult_predict(self):
+        self.model.predict_storage(self.adult)
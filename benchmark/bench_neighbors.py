@@ -0,0 +1,49 @@
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+
+from Orange.data import Table, Domain, ContinuousVariable, DiscreteVariable
+from Orange.classification import KNNLearner
+from Orange.misc.neighbors import NeighborIndex
+
+from .base import Benchmark, benchmark
+
+
+# noinspection PyStatementEffect
+class BenchNeighbors(Benchmark):
+    def setUp(self):
+        random = np.random.RandomState(0)
+        # 50 columns, but with a low intrinsic dimension
+        self.x = random.random_sample((100000, 8)).dot(
+            random.normal(size=(8, 50)))
+        self.queries = self.x[:500] + random.normal(scale=0.01,
+                                                    size=(500, 50))
+        self.skl = NearestNeighbors(10).fit(self.x)
+        self.exact = NeighborIndex(self.x)
+        self.approximate = NeighborIndex(self.x, approximate=True)
+
+        x = self.x[:20000]
+        domain = Domain([ContinuousVariable("x{}".format(i))
+                         for i in range(50)],
+                        DiscreteVariable("y", ["0", "1"]))
+        self.data = Table.from_numpy(domain, x, (x[:, 0] > 0).astype(float))
+        self.test = self.data[:1000]
+
+    @benchmark(number=1, warmup=1)
+    def bench_query_sklearn(self):
+        self.skl.kneighbors(self.queries)
+
+    @benchmark(number=1, warmup=1)
+    def bench_query_exact(self):
+        self.exact.query(self.queries, 10)
+
+    @benchmark(number=1, warmup=1)
+    def bench_query_approximate(self):
+        self.approximate.query(self.queries, 10)
+
+    @benchmark(number=1, warmup=1)
+    def bench_knn_exact(self):
+        KNNLearner()(self.data)(self.test)
+
+    @benchmark(number=1, warmup=1)
+    def bench_knn_approximate(self):
+        KNNLearner(approximate=True)(self.data)(self.test)
@@ -0,0 +1,62 @@
+import numpy as np
+
+from Orange.classification import CN2Learner, CN2SDUnorderedLearner
+from Orange.classification.rules import (CoverageCache, TopDownSearchStrategy,
+                                         get_dist)
+from Orange.data import Table
+
+from .base import Benchmark, benchmark
+
+
+def _class_dists_loop(X, Y, W, domain, covered, selectors):
+    """Evaluation of candidates as implemented before the coverage was
+    cached in bitsets; kept for comparison."""
+    storage = {}
+    dists = []
+    for selector in selectors:
+        if selector not in storage:
+            storage[selector] = selector.filter_data(X)
+        pdc = covered & storage[selector]
+        dists.append(get_dist(Y[pdc], W[pdc] if W is not None else None,
+                              domain))
+    return dists
+
+
+# noinspection PyStatementEffect
+class BenchCN2(Benchmark):
+    def setUp(self):
+        adult = Table('adult')
+        for preprocessor in CN2Learner.preprocessors:
+            adult = preprocessor(adult)
+        self.adult = adult
+        self.X, self.Y = adult.X, adult.Y.astype(int)
+        self.W = np.random.RandomState(0).random_sample(len(adult))
+        self.covered = np.ones(len(adult), dtype=bool)
+        self.selectors = TopDownSearchStrategy().find_new_selectors(
+            self.X, self.Y, None, adult.domain, [])
+
+    @benchmark(number=3, warmup=1)
+    def bench_adult_candidates_loop(self):
+        _class_dists_loop(self.X, self.Y, None, self.adult.domain,
+                          self.covered, self.selectors)
+
+    @benchmark(number=3, warmup=1)
+    def bench_adult_candidates_batched(self):
+        coverage = CoverageCache(self.X, self.Y, None, self.adult.domain)
+        coverage.class_dists(coverage.refine(coverage.pack(self.covered),
+                                             self.selectors))
+
+    @benchmark(number=3, warmup=1)
+    def bench_adult_weighted_candidates_loop(self):
+        _class_dists_loop(self.X, self.Y, self.W, self.adult.domain,
+                          self.covered, self.selectors)
+
+    @benchmark(number=3, warmup=1)
+    def bench_adult_weighted_candidates_batched(self):
+        coverage = CoverageCache(self.X, self.Y, self.W, self.adult.domain)
+        coverage.class_dists(coverage.refine(coverage.pack(self.covered),
+                                             self.selectors))
+
+    @benchmark(number=1, repeat=1, warmup=0)
+    def bench_adult_cn2_sd_unordered(self):
+        CN2SDUnorderedLearner()(self.adult)
@@ -0,0 +1,72 @@
+from itertools import islice
+import uuid
+
+import numpy as np
+
+from Orange.data.sql.table import SqlTable
+
+from .base import Benchmark, benchmark
+
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
+
+N_ROWS = 1000000
+
+
+def _download_rows(table):
+    """Download as implemented before rows were fetched in batches;
+    kept for comparison."""
+    X, Y, metas = [], [], []
+    for row in islice(table, None):
+        X.append(row._x)
+        Y.append(row._y)
+        metas.append(row._metas)
+    return np.vstack(X), np.vstack(Y), np.vstack(metas).astype(object)
+
+
+# noinspection PyStatementEffect
+class BenchSqlDownload(Benchmark):
+    """Needs a local Postgres database, given by ORANGE_TEST_DB_URI
+    (default: postgres://localhost/test)."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from Orange.tests.sql.base import connection_params, sql_version
+        if psycopg2 is None or not sql_version:
+            cls.table_name = None
+            return
+        cls.params = connection_params()
+        cls.table_name = "bench_{}".format(uuid.uuid4().hex)
+        with psycopg2.connect(**cls.params) as conn:
+            cur = conn.cursor()
+            cur.execute("CREATE TABLE {} (a float, b float, c float, "
+                        "d float, iris varchar(20))".format(cls.table_name))
+            cur.execute(
+                "INSERT INTO {} SELECT random(), random(), random(), "
+                "random(), 'Iris-' || (i % 3) "
+                "FROM generate_series(1, %s) AS i".format(cls.table_name),
+                (N_ROWS,))
+            cur.execute("ANALYZE {}".format(cls.table_name))
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.table_name is not None:
+            with psycopg2.connect(**cls.params) as conn:
+                conn.cursor().execute("DROP TABLE {}".format(cls.table_name))
+
+    def setUp(self):
+        if self.table_name is None:
+            self.skipTest("Database is not running.")
+        self.table = SqlTable(self.params, self.table_name,
+                              inspect_values=True)
+
+    @benchmark(number=1, repeat=3, warmup=0)
+    def bench_download_rows(self):
+        _download_rows(self.table)
+
+    @benchmark(number=1, repeat=3, warmup=0)
+    def bench_download_data(self):
+        self.table.download_data()
@@ -0,0 +1,27 @@
+import numpy as np
+
+from Orange.data import Table, Domain, ContinuousVariable
+from Orange.preprocess import Normalize, Impute
+
+from .base import Benchmark, benchmark
+
+
+# noinspection PyStatementEffect
+class BenchTransform(Benchmark):
+    def setUp(self):
+        random = np.random.RandomState(0)
+        x = random.normal(size=(1000, 2000))
+        x[random.random_sample(x.shape) < 0.01] = np.nan
+        domain = Domain([ContinuousVariable("x{}".format(i))
+                         for i in range(x.shape[1])])
+        self.data = Table.from_numpy(domain, x)
+        self.normalized = Normalize()(self.data).domain
+        self.imputed = Impute()(self.data).domain
+
+    @benchmark(number=5)
+    def bench_normalize(self):
+        Table.from_table(self.normalized, self.data)
+
+    @benchmark(number=5)
+    def bench_impute(self):
+        Table.from_table(self.imputed, self.data)
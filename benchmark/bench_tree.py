@@ -0,0 +1,36 @@
+import numpy as np
+
+from Orange.classification import TreeLearner
+from Orange.data import Table, Domain, ContinuousVariable, DiscreteVariable
+
+from .base import Benchmark, benchmark
+
+
+# noinspection PyStatementEffect
+class BenchTree(Benchmark):
+    def setUp(self):
+        # wide data: 5000 instances, 500 numeric attributes
+        rng = np.random.RandomState(0)
+        x = rng.randn(5000, 500)
+        y = (x[:, :5].sum(axis=1) > 0).astype(float)
+        domain = Domain(
+            [ContinuousVariable("a{}".format(i)) for i in range(500)],
+            DiscreteVariable("y", values="01"))
+        self.wide = Table(domain, x, y)
+        self.adult = Table('adult')
+
+    @benchmark(number=3, warmup=1)
+    def bench_wide_tree(self):
+        TreeLearner()(self.wide)
+
+    @benchmark(number=3, warmup=1)
+    def bench_wide_tree_threads(self):
+        TreeLearner(n_jobs=-1)(self.wide)
+
+    @benchmark(number=3, warmup=1)
+    def bench_adult_tree(self):
+        TreeLearner()(self.adult)
+
+    @benchmark(number=3, warmup=1)
+    def bench_adult_tree_threads(self):
+        TreeLearner(n_jobs=-1)(self.adult)